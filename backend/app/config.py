@@ -7,11 +7,14 @@ class Settings(BaseSettings):
     
     # API Keys
     alpha_vantage_api_key: str
+    alpha_vantage_base_url: str = ""  # Empty = the real API; e.g. the local stand-in for load tests
+    openai_api_key: str = ""
     
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = True
+    app_mode: str = "all"  # all, api (companies/transcripts/analysis) or transcription (audio only)
     
     # CORS
     frontend_url: str = "http://localhost:5173"
@@ -19,12 +22,88 @@ class Settings(BaseSettings):
     # Rate Limiting
     alpha_vantage_rate_limit: int = 999  # requests per minute
     
+    # Response cache
+    cache_backend: str = "memory"  # memory (per process) or redis (shared by replicas)
+    cache_max_entries: int = 10000  # In-memory backend size
+    redis_url: str = "redis://localhost:6379/0"
+    cache_key_prefix: str = "earningsinsight:"
+    near_cache_ttl_seconds: float = 30.0  # In-process tier in front of redis (0 = disabled)
+    near_cache_max_entries: int = 1024
+    
+    # Metrics
+    metrics_loop_lag_interval: float = 0.5  # Seconds between event loop lag samples (0 = disabled)
+    
+    # Profiling (X-Profile: 1 header, or ?profile=1 on WebSockets)
+    profiling_enabled: bool = False  # Honor profiling requests at all
+    profiling_sample_rate: float = 0.0  # Share of requests profiled without asking (0-1)
+    profiling_interval_ms: float = 5.0  # Stack sampling interval
+    profiling_slow_ms: float = 1000.0  # Requests at least this slow are listed at /api/admin/slow-requests
+    profiling_retained: int = 100  # Profiles and slow requests kept in memory
+    profiling_dir: str = ""  # Also save profiles here as .folded files (empty = memory only)
+    
+    # Cross-quarter trends
+    trend_store_dir: str = ""  # Directory for per-ticker trend tables (empty = in memory only)
+    trend_refresh_hours: float = 12.0  # Age after which a ticker's trends are refreshed
+    
+    # Bulk export (/api/export, python -m app.services.bulk_export)
+    export_batch_rows: int = 50000  # Rows per Parquet row group / Arrow record batch
+    
+    # Boilerplate detection (safe harbor, operator scripts) in fetched transcripts
+    boilerplate_detection: bool = True
+    boilerplate_threshold: float = 0.5  # Min estimated Jaccard similarity to count as a repeat
+    boilerplate_calls_per_ticker: int = 8  # Recent transcripts per company compared against
+    boilerplate_corpus_path: str = ""  # Extra boilerplate paragraphs, separated by blank lines
+    
     # Search Filtering
     filter_us_equities_only: bool = True  # Only return US-listed company stocks
     
     # Whisper Transcription
     whisper_model_size: str = "base"  # tiny, base, small, medium, large-v2, large-v3
     whisper_chunk_duration_ms: int = 3000  # Recording chunk duration in milliseconds
+    whisper_adaptive_chunks: bool = True  # Adjust each live session's chunk duration to load
+    whisper_chunk_min_ms: int = 1000  # Shortest chunk adaptive sessions are asked for
+    whisper_chunk_max_ms: int = 10000  # Longest chunk adaptive sessions are asked for
+    whisper_chunk_latency_target_ms: int = 2500  # End-to-end latency (chunk + wait + inference) aimed for
+    whisper_device: str = "cpu"  # cpu, cuda
+    whisper_compute_type: str = "int8"  # Used until an autotune result is saved
+    whisper_tuning_file: str = "whisper_tuning.json"  # Autotune result, applied on matching hardware
+    whisper_autotune_on_startup: bool = False  # Run autotune at startup when no tuning matches
+    whisper_autotune_max_wer: float = 0.15  # Max word error rate a tuned config may have
+    whisper_fallback_models: str = "auto"  # Comma-separated smaller sizes to use under load, e.g. "base,tiny" (auto = next smaller size)
+    whisper_preload_models: bool = True  # Load and warm up models at startup
+    whisper_adaptive_models: bool = True  # Downgrade/upgrade models based on queue latency
+    whisper_latency_target_ms: int = 1500  # Queue latency that triggers a downgrade
+    whisper_max_concurrency: int = 2  # Chunks transcribed at the same time
+    transcription_cache_entries: int = 2048  # In-memory results for replayed audio (0 = disabled)
+    transcription_cache_dir: str = ""  # Optional directory for a persistent result cache
+    session_archive_dir: str = ""  # Archive live session audio and segments here (empty = disabled)
+    session_archive_flush_bytes: int = 1048576  # Buffered bytes before an archive write
+    session_archive_flush_seconds: float = 5.0  # Max age of buffered archive records
+    live_room_queue_size: int = 256  # Messages buffered per room listener before it is evicted (min 2)
+    live_room_max_listeners: int = 500  # Listeners per shared live room
+    
+    # Offline recording transcription
+    batch_whisper_model_size: str = ""  # Defaults to whisper_model_size
+    batch_transcription_workers: int = 0  # Parallel chunks (0 = half the CPU cores)
+    batch_transcription_chunk_seconds: int = 120  # Target chunk length before snapping to silence
+    batch_transcription_max_upload_mb: int = 500  # Larger uploads are rejected
+    
+    # Live analysis
+    live_analysis_backend: str = "keyword"  # Analyzer for /ws/transcribe?analysis=true
+    lexicon_path: str = ""  # Loughran-McDonald Master Dictionary CSV (empty = built-in word lists)
+    
+    # LLM transcript analysis
+    llm_base_url: str = ""  # OpenAI-compatible endpoint (empty = OpenAI), e.g. the mock server
+    llm_model: str = "gpt-4o-mini"
+    llm_chunk_tokens: int = 3000  # Token budget per transcript chunk in the map phase
+    llm_max_concurrency: int = 4  # Chunk requests in flight at the same time
+    llm_timeout_seconds: float = 120.0
+    llm_cache_entries: int = 256  # In-memory analyses and chunk results (0 = disabled)
+    llm_cache_dir: str = ""  # Optional directory for a persistent analysis cache
+    analysis_workers: int = 2  # Analysis sessions run at the same time
+    analysis_max_pending: int = 100  # Queued sessions before new requests are rejected
+    analysis_retained_sessions: int = 200  # Finished sessions kept for late subscribers
+    analysis_retention_seconds: int = 3600  # How long finished sessions are kept
     
     class Config:
         env_file = ".env"
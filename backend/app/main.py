@@ -1,9 +1,25 @@
+import asyncio
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from app.config import get_settings
+from app.services import metrics
+from app.services.profiling import ProfilingMiddleware, StackSampler, get_profile_store
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Subsystems this process serves. Each mode imports only its own modules, so
+# API-only workers never load faster-whisper and transcription-only workers never
+# load the LLM client.
+APP_MODES = ("all", "api", "transcription")
+if settings.app_mode not in APP_MODES:
+    raise ValueError(f"APP_MODE must be one of {', '.join(APP_MODES)}, not {settings.app_mode!r}")
+SERVE_API = settings.app_mode in ("all", "api")
+SERVE_TRANSCRIPTION = settings.app_mode in ("all", "transcription")
+
 # Initialize FastAPI app
 app = FastAPI(
     title="earningsInsight API",
@@ -19,6 +35,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Profile-Id"],
+)
+
+# Opt-in sampled profiling (outermost, so it times the whole request)
+app.add_middleware(
+    ProfilingMiddleware,
+    enabled=settings.profiling_enabled,
+    sample_rate=settings.profiling_sample_rate,
+    sampler=StackSampler(settings.profiling_interval_ms / 1000),
+    store=get_profile_store()
 )
 
 
@@ -28,7 +54,8 @@ async def root():
     return {
         "status": "ok",
         "message": "earningsInsight API is running",
-        "version": "0.1.0"
+        "version": "0.1.0",
+        "mode": settings.app_mode
     }
 
 
@@ -37,34 +64,127 @@ async def health():
     """Detailed health check"""
     return {
         "status": "healthy",
+        "mode": settings.app_mode,
         "alpha_vantage": "configured" if settings.alpha_vantage_api_key else "missing",
-        "transcription": "local (faster-whisper)"
+        "transcription": "local (faster-whisper)" if SERVE_TRANSCRIPTION else "disabled"
     }
 
 
-@app.get("/config/transcription")
-async def get_transcription_config():
-    """Get transcription configuration"""
-    return {
-        "whisper_model_size": settings.whisper_model_size,
-        "chunk_duration_ms": settings.whisper_chunk_duration_ms
-    }
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics (text exposition format)"""
+    return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
 
 
-# Import and register routes
-from app.routes import companies, transcripts
-from app.websockets.transcription import handle_transcription_websocket
-from fastapi import WebSocket
+@app.on_event("startup")
+async def start_metrics():
+    """Measure event loop lag for /metrics"""
+    if settings.metrics_loop_lag_interval > 0:
+        metrics.start_event_loop_monitor(settings.metrics_loop_lag_interval)
+
 
-app.include_router(companies.router)
-app.include_router(transcripts.router)
+@app.on_event("shutdown")
+async def stop_metrics():
+    await metrics.stop_event_loop_monitor()
 
 
-# WebSocket endpoint
-@app.websocket("/ws/transcribe")
-async def websocket_transcribe(websocket: WebSocket):
-    """WebSocket endpoint for real-time audio transcription"""
-    await handle_transcription_websocket(websocket)
+# Import and register routes
+from fastapi import WebSocket
+
+if settings.profiling_enabled:
+    # Profiles and slow requests show internal module, function and path names,
+    # so /api/admin only exists on deployments that turned profiling on
+    from app.routes import admin
+    app.include_router(admin.router)
+
+if SERVE_API:
+    from app.routes import companies, transcripts, analysis, export, calls
+    from app.websockets.analysis import handle_analysis_websocket
+
+    app.include_router(companies.router)
+    app.include_router(transcripts.router)
+    app.include_router(analysis.router)
+    app.include_router(export.router)
+    app.include_router(calls.router)
+
+    @app.on_event("shutdown")
+    async def close_alpha_vantage():
+        """Close the Alpha Vantage service shared by all API routes"""
+        from app.services.alpha_vantage import close_alpha_vantage_service
+        await close_alpha_vantage_service()
+
+    @app.on_event("shutdown")
+    async def close_cache():
+        from app.services.cache_backend import close_cache_backend
+        await close_cache_backend()
+
+    @app.websocket("/ws/analysis/{session_id}")
+    async def websocket_analysis(websocket: WebSocket, session_id: str):
+        """WebSocket endpoint for analysis session progress"""
+        await handle_analysis_websocket(websocket, session_id)
+
+
+if SERVE_TRANSCRIPTION:
+    from app.routes import recordings, sessions, rooms
+    from app.websockets.transcription import handle_transcription_websocket
+    from app.websockets.rooms import handle_room_websocket
+    from app.services.model_registry import get_model_registry
+
+    app.include_router(recordings.router)
+    app.include_router(sessions.router)
+    app.include_router(rooms.router)
+
+    @app.get("/config/transcription")
+    async def get_transcription_config():
+        """Get transcription configuration"""
+        registry = get_model_registry()
+        return {
+            "whisper_model_size": settings.whisper_model_size,
+            "active_model_size": registry.current_size,
+            "available_model_sizes": registry.sizes,
+            "queue_latency_ms": round(registry.queue_latency_ms, 1),
+            "chunk_duration_ms": settings.whisper_chunk_duration_ms,
+            # When true, /ws/transcribe sends "control" messages that change the chunk duration
+            "adaptive_chunks": settings.whisper_adaptive_chunks,
+            "chunk_latency_target_ms": settings.whisper_chunk_latency_target_ms
+        }
+
+    def prepare_whisper_models(loop: asyncio.AbstractEventLoop):
+        """Autotune (if enabled and no saved tuning matches) then load and warm up models"""
+        from app.services.whisper_autotune import autotune, save_tuning
+        registry = get_model_registry()
+        if settings.whisper_autotune_on_startup and not registry.tuned:
+            logger.info("No Whisper tuning for this hardware, running autotune")
+            tuning = autotune(
+                settings.whisper_model_size,
+                device=settings.whisper_device,
+                max_wer=settings.whisper_autotune_max_wer
+            )
+            save_tuning(settings.whisper_tuning_file, tuning)
+            registry.apply_tuning(tuning["config"], loop)
+        if settings.whisper_preload_models:
+            logger.info(f"Preloading Whisper models: {', '.join(registry.sizes)}")
+            registry.preload()
+
+    @app.on_event("startup")
+    async def preload_whisper_models():
+        """Load and warm up Whisper models so the first live session starts immediately"""
+        if not (settings.whisper_preload_models or settings.whisper_autotune_on_startup):
+            return
+        # Run in the background so the API starts serving while weights load
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(None, prepare_whisper_models, loop)
+
+    # WebSocket endpoint
+    @app.websocket("/ws/transcribe")
+    async def websocket_transcribe(websocket: WebSocket):
+        """WebSocket endpoint for real-time audio transcription"""
+        await handle_transcription_websocket(websocket)
+
+    @app.websocket("/ws/rooms/{room_id}")
+    async def websocket_room(websocket: WebSocket, room_id: str):
+        """WebSocket endpoint for listening to a shared live call"""
+        await handle_room_websocket(websocket, room_id)
 
 
 if __name__ == "__main__":
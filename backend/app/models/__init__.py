@@ -4,18 +4,36 @@ from .company import (
     CompanyOverview,
     EarningsCall,
     FinancialData,
-    EarningsCalendarItem
+    QuarterFinancials,
+    EarningsCalendarItem,
+    QuarterTrend,
+    CompanyTrends
 )
 from .transcript import (
     TranscriptEntry,
     TranscriptData,
     TranscriptMetadata
 )
+# Internal records for cached data (written out as the models above)
+from .records import (
+    SearchResultRecord,
+    EarningsRecord,
+    TranscriptEntryRecord,
+    TranscriptRecord
+)
+from .transcription import (
+    TranscriptionSegment,
+    TranscriptionJob,
+    TranscriptionResult
+)
 from .analysis import (
     AnalysisCategory,
     Insight,
     CategoryInsight,
     SentimentDataPoint,
+    NotableQuote,
+    CategoryAnalysis,
+    TranscriptAnalysis,
     AnalysisRequest,
     AnalysisSession,
     AnalysisStatus,
@@ -27,14 +45,27 @@ __all__ = [
     "CompanyOverview",
     "EarningsCall",
     "FinancialData",
+    "QuarterFinancials",
     "EarningsCalendarItem",
+    "QuarterTrend",
+    "CompanyTrends",
     "TranscriptEntry",
     "TranscriptData",
     "TranscriptMetadata",
+    "SearchResultRecord",
+    "EarningsRecord",
+    "TranscriptEntryRecord",
+    "TranscriptRecord",
+    "TranscriptionSegment",
+    "TranscriptionJob",
+    "TranscriptionResult",
     "AnalysisCategory",
     "Insight",
     "CategoryInsight",
     "SentimentDataPoint",
+    "NotableQuote",
+    "CategoryAnalysis",
+    "TranscriptAnalysis",
     "AnalysisRequest",
     "AnalysisSession",
     "AnalysisStatus",
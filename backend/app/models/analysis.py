@@ -38,6 +38,36 @@ class SentimentDataPoint(BaseModel):
     category_sentiments: Dict[str, float]
 
 
+class NotableQuote(BaseModel):
+    """Quote supporting a category analysis"""
+    text: str
+    speaker: Optional[str] = None
+
+
+class CategoryAnalysis(BaseModel):
+    """LLM analysis of one category (names follow the analysis prompt)"""
+    category: str
+    sentiment: float  # -1.0 to +1.0
+    key_points: List[str] = []
+    notable_quotes: List[NotableQuote] = []
+
+
+class TranscriptAnalysis(BaseModel):
+    """LLM analysis of a full earnings call transcript"""
+    ticker: str
+    quarter: str
+    year: int
+    overall_sentiment: float  # -1.0 to +1.0
+    sentiment_rationale: str = ""
+    category_insights: List[CategoryAnalysis] = []
+    key_takeaways: List[str] = []
+    investment_implications: str = ""
+    model: str
+    prompt_version: str
+    chunks: int  # transcript chunks analyzed in the map phase
+    cached: bool = False
+
+
 class AnalysisRequest(BaseModel):
     """Request to start analysis"""
     ticker: str
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -65,6 +65,14 @@ class FinancialData(BaseModel):
     guidance_vs_actual: Optional[str] = None
 
 
+class QuarterFinancials(FinancialData):
+    """Financial metrics of one quarter in a company's earnings history"""
+    quarter: str
+    year: int
+    fiscal_date_ending: str
+    report_date: str
+
+
 class EarningsCalendarItem(BaseModel):
     """Item from earnings calendar"""
     symbol: str
@@ -73,3 +81,28 @@ class EarningsCalendarItem(BaseModel):
     fiscal_date_ending: str
     estimate: Optional[str] = None
     currency: str
+
+
+class QuarterTrend(BaseModel):
+    """One quarter in a company's cross-quarter trends (changes in percent)"""
+    quarter: str
+    year: int
+    fiscal_date_ending: str
+    report_date: str
+    reported_eps: Optional[float] = None
+    estimated_eps: Optional[float] = None
+    surprise_percentage: Optional[float] = None
+    eps_qoq_change: Optional[float] = None
+    eps_yoy_change: Optional[float] = None
+    price_before: Optional[float] = None  # Close on the last trading day before the report
+    price_after: Optional[float] = None  # Close on the first trading day after the report
+    price_reaction: Optional[float] = None
+    overall_sentiment: Optional[float] = None  # Lexicon sentiment of the call transcript
+    category_sentiments: Dict[str, Optional[float]] = {}
+
+
+class CompanyTrends(BaseModel):
+    """Per-quarter trend table for a company, oldest quarter first"""
+    ticker: str
+    updated_at: datetime
+    quarters: List[QuarterTrend]
@@ -0,0 +1,152 @@
+"""
+Internal records for cached Alpha Vantage data.
+
+The API models validate their input, which is wasted work for data the service
+has just parsed itself and then caches and serves many times: a ticker's
+earnings are 20 models, a transcript one model per paragraph. These records are
+`__slots__` dataclasses with the same attribute names as the API models they
+stand for, so services use either interchangeably. Routes write them out with
+`dumps()` (orjson, no second validation on output); `to_model()` gives the
+validated API model where one is needed. See benchmarks/record_overhead.py.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass, fields
+from datetime import date, timedelta
+from operator import attrgetter
+from typing import Any, List, Optional, Type
+
+import orjson
+from pydantic import BaseModel
+
+from app.models.company import CompanySearchResult, EarningsCall
+from app.models.transcript import TranscriptData, TranscriptEntry
+
+
+class Record:
+    """Base of the record classes; see `record()`"""
+
+    __slots__ = ()
+    model: Optional[Type[BaseModel]]
+    _fields: tuple
+    _values: attrgetter
+
+    def to_row(self) -> tuple:
+        """Field values in declaration order (the compact cache form)"""
+        return self._values(self)
+
+    @classmethod
+    def from_row(cls, row) -> "Record":
+        return cls(*row)
+
+    def to_dict(self) -> dict:
+        return dict(zip(self._fields, self._values(self)))
+
+    def to_model(self) -> BaseModel:
+        if self.model is None:
+            raise TypeError(f"{type(self).__name__} has no API model")
+        return self.model.model_validate(self.to_dict())
+
+
+def record(model: Optional[Type[BaseModel]] = None):
+    """Make a class a slots dataclass record standing for `model` (None for internal-only data)"""
+    def wrap(cls):
+        cls = dataclass(slots=True)(cls)
+        cls.model = model
+        cls._fields = tuple(field.name for field in fields(cls))
+        cls._values = attrgetter(*cls._fields)
+        return cls
+    return wrap
+
+
+@record(CompanySearchResult)
+class SearchResultRecord(Record):
+    ticker: str
+    name: str
+    type: str
+    region: str
+    currency: str
+
+
+@record(EarningsCall)
+class EarningsRecord(Record):
+    id: str
+    ticker: str
+    quarter: str
+    year: int
+    date: str
+    fiscal_date_ending: Optional[str] = None
+    reported_eps: Optional[str] = None
+    estimated_eps: Optional[str] = None
+    surprise: Optional[str] = None
+    surprise_percentage: Optional[str] = None
+    status: str = "recorded"
+
+
+@record(TranscriptEntry)
+class TranscriptEntryRecord(Record):
+    id: str
+    timestamp: str
+    text: str
+    speaker: Optional[str] = None
+    confidence: Optional[float] = None
+    boilerplate: bool = False
+
+
+@record(TranscriptData)
+class TranscriptRecord(Record):
+    ticker: str
+    quarter: str
+    year: int
+    fiscal_date_ending: str
+    transcript: str
+    entries: List[TranscriptEntryRecord]
+
+    def to_row(self) -> tuple:
+        return self._values(self)[:-1] + ([entry.to_row() for entry in self.entries],)
+
+    @classmethod
+    def from_row(cls, row) -> "TranscriptRecord":
+        *values, entries = row
+        return cls(*values, [TranscriptEntryRecord(*entry) for entry in entries])
+
+    def to_dict(self) -> dict:
+        data = dict(zip(self._fields, self._values(self)))
+        data["entries"] = [entry.to_dict() for entry in self.entries]
+        return data
+
+
+@record()
+class PriceSeriesRecord(Record):
+    """
+    Daily closes of one ticker, oldest first, as fetched with `outputsize`
+    ("compact" = the last 100 trading days, "full" = all history). Dates are
+    ISO strings, which sort like the dates they name.
+    """
+    ticker: str
+    outputsize: str
+    dates: List[str]
+    closes: List[float]
+
+    def covers(self, since: Optional[date]) -> bool:
+        """Whether the series has every trading day from `since` on (None = recent days only)"""
+        if not self.dates:
+            return False
+        if self.outputsize == "full" or since is None:
+            return True
+        return self.dates[0] <= since.isoformat()
+
+    def close_near(self, day: date, max_days: int = 7) -> Optional[float]:
+        """Close on `day`, else the nearest trading day up to `max_days` away (later days first)"""
+        for offset in range(max_days + 1):
+            for sign in (0, 1, -1) if offset else (0,):
+                key = (day + timedelta(days=offset * sign)).isoformat()
+                i = bisect_left(self.dates, key)
+                if i < len(self.dates) and self.dates[i] == key:
+                    return self.closes[i]
+        return None
+
+
+def dumps(value: Any) -> bytes:
+    """JSON body for records or lists of them (orjson writes slots dataclasses natively)"""
+    return orjson.dumps(value)
@@ -9,6 +9,7 @@ class TranscriptEntry(BaseModel):
     text: str
     speaker: Optional[str] = None
     confidence: Optional[float] = None
+    boilerplate: bool = False  # Repeated text (safe harbor, operator script) skipped by analysis
 
 
 class TranscriptData(BaseModel):
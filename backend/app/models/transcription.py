@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+
+class TranscriptionSegment(BaseModel):
+    """Transcribed segment of an audio recording"""
+    start: float  # seconds from start of recording
+    end: float
+    text: str
+
+
+class TranscriptionJob(BaseModel):
+    """Status of an offline recording transcription job"""
+    job_id: str
+    filename: Optional[str] = None
+    status: str  # pending, processing, completed, error
+    created_at: datetime
+    duration_seconds: Optional[float] = None
+    chunks_total: int = 0
+    chunks_completed: int = 0
+    segment_count: int = 0
+    progress: float = 0.0
+    elapsed_seconds: Optional[float] = None
+    message: Optional[str] = None
+
+
+class TranscriptionResult(BaseModel):
+    """Completed transcription of a recording"""
+    job_id: str
+    status: str
+    segments: List[TranscriptionSegment] = []
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.services.profiling import get_profile_store
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.get("/slow-requests")
+async def list_slow_requests():
+    """
+    Recent HTTP requests slower than PROFILING_SLOW_MS, slowest first.
+    `profile_id` is set when the request was also profiled.
+
+    Example: `/api/admin/slow-requests`
+    """
+    return get_profile_store().list_slow_requests()
+
+
+@router.get("/profiles")
+async def list_profiles():
+    """
+    Recent request profiles, newest first
+
+    Example: `/api/admin/profiles`
+    """
+    return get_profile_store().list_profiles()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str):
+    """
+    One profile in collapsed-stack format, for flamegraph.pl, speedscope or inferno
+
+    Example: `/api/admin/profiles/{profile_id} > profile.folded && flamegraph.pl profile.folded > profile.svg`
+    """
+    profile = get_profile_store().get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return PlainTextResponse(
+        profile.collapsed(),
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'}
+    )
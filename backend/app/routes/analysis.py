@@ -0,0 +1,111 @@
+from fastapi import APIRouter, HTTPException, Path
+from typing import List
+from app.models import AnalysisRequest, AnalysisSession, AnalysisStatus, TranscriptAnalysis
+from app.routes.transcripts import get_service
+from app.services.analysis_sessions import get_analysis_session_manager, shutdown_analysis_session_manager
+from app.services.llm_analysis import get_llm_pipeline
+
+router = APIRouter(prefix="/api/analysis", tags=["analysis"])
+
+
+def _get_job_or_404(session_id: str):
+    job = get_analysis_session_manager().get_job(session_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Analysis session {session_id} not found")
+    return job
+
+
+@router.post("/sessions", response_model=AnalysisSession, status_code=202)
+async def start_analysis(request: AnalysisRequest):
+    """
+    Start (or join) an analysis session for an earnings call
+
+    Requests for a call that is already queued, running or recently completed
+    return the existing session. Follow progress on `/ws/analysis/{session_id}`
+    or poll `/api/analysis/sessions/{session_id}`.
+
+    Example: `POST /api/analysis/sessions {"ticker": "AAPL", "quarter": "Q4", "year": 2024}`
+    """
+    try:
+        get_llm_pipeline()
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    try:
+        return get_analysis_session_manager().submit(request).to_session()
+    except RuntimeError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+
+@router.get("/sessions", response_model=List[AnalysisSession])
+async def list_analysis_sessions():
+    """
+    List queued, running and retained analysis sessions, most recent first
+
+    Example: `/api/analysis/sessions`
+    """
+    return [job.to_session() for job in get_analysis_session_manager().list_jobs()]
+
+
+@router.get("/sessions/{session_id}", response_model=AnalysisStatus)
+async def get_analysis_status(session_id: str):
+    """
+    Get status and progress of an analysis session
+
+    Example: `/api/analysis/sessions/{session_id}`
+    """
+    return _get_job_or_404(session_id).to_status()
+
+
+@router.get("/sessions/{session_id}/result", response_model=TranscriptAnalysis)
+async def get_analysis_result(session_id: str):
+    """
+    Get the analysis of a completed session
+
+    Example: `/api/analysis/sessions/{session_id}/result`
+    """
+    job = _get_job_or_404(session_id)
+    if job.status == "error":
+        raise HTTPException(status_code=502, detail=f"LLM analysis failed: {job.message}")
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Analysis session is {job.status}")
+    return job.result
+
+
+@router.get("/{ticker}/{quarter}/{year}", response_model=TranscriptAnalysis)
+async def get_transcript_analysis(
+    ticker: str = Path(..., description="Company ticker symbol (e.g., AAPL)"),
+    quarter: str = Path(..., description="Quarter (e.g., Q4)"),
+    year: int = Path(..., description="Year (e.g., 2024)")
+):
+    """
+    Get the LLM analysis of an earnings call transcript
+    
+    Runs the chunked map-reduce analysis on first request; later requests for
+    the same transcript and prompt version are served from the cache.
+    
+    Example: `/api/analysis/AAPL/Q4/2024`
+    """
+    try:
+        pipeline = get_llm_pipeline()
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    try:
+        transcript = await get_service().get_earnings_call_transcript(
+            ticker.upper(),
+            quarter,
+            year
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+    try:
+        return await pipeline.analyze(transcript)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"LLM analysis failed: {str(e)}")
+
+
+@router.on_event("shutdown")
+async def shutdown_event():
+    """Stop analysis workers on shutdown"""
+    await shutdown_analysis_session_manager()
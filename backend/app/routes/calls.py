@@ -0,0 +1,105 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi.responses import StreamingResponse
+from app.services.alpha_vantage import AlphaVantageService, get_alpha_vantage_service
+from app.models.records import dumps
+
+router = APIRouter(prefix="/api/calls", tags=["calls"])
+
+CALL_PARTS = ("overview", "earnings", "transcript", "financials")
+
+
+def get_service() -> AlphaVantageService:
+    """Get the Alpha Vantage service shared by all routes (one rate limit per process)"""
+    return get_alpha_vantage_service()
+
+
+def _event(name: str, data) -> str:
+    return f"event: {name}\ndata: {dumps(data).decode()}\n\n"
+
+
+@router.get("/{ticker}/{quarter}/{year}")
+async def get_call(
+    ticker: str = Path(..., description="Company ticker symbol (e.g., AAPL)"),
+    quarter: str = Path(..., description="Quarter (e.g., Q4)"),
+    year: int = Path(..., description="Year (e.g., 2024)"),
+    parts: str = Query(None, description="Comma-separated parts to send (default: all)")
+):
+    """
+    Everything the UI needs to open an earnings call, in one request
+
+    Fetches the overview, earnings history, the quarter's financials and the
+    transcript concurrently and streams each as a Server-Sent Event as soon as
+    it is ready: `overview`, `earnings`, `financials`, `transcript` (same bodies
+    as the individual routes). A part that fails sends an `error` event
+    (`{"part", "status", "detail"}`) instead; the stream ends with `complete`.
+    With `parts`, only those parts are fetched and sent.
+
+    Example: `curl -N /api/calls/AAPL/Q4/2024?parts=financials,transcript`
+    """
+    requested = [part.strip() for part in parts.split(",") if part.strip()] if parts else list(CALL_PARTS)
+    unknown = [part for part in requested if part not in CALL_PARTS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown parts {', '.join(unknown)}; expected some of {', '.join(CALL_PARTS)}"
+        )
+    if not requested:
+        raise HTTPException(status_code=400, detail="No parts given")
+    ticker = ticker.upper()
+    service = get_service()
+
+    async def overview():
+        return (await service.get_company_overview(ticker)).model_dump(by_alias=False)
+
+    async def financials():
+        # Reuses the overview and earnings fetched alongside it, if requested,
+        # instead of racing them upstream; income statement and prices are fetched here
+        await asyncio.gather(
+            *[tasks[name] for name in ("overview", "earnings") if name in tasks], return_exceptions=True
+        )
+        return (await service.get_financials(ticker, quarter, year)).model_dump(by_alias=False)
+
+    fetchers = {
+        "overview": overview,
+        "earnings": lambda: service.get_earnings(ticker),
+        "transcript": lambda: service.get_earnings_call_transcript(ticker, quarter, year),
+        "financials": financials,
+    }
+    tasks = {}
+
+    async def event_stream():
+        # Started once the response is sent, so a request that never gets
+        # that far leaves nothing running
+        tasks.update({name: asyncio.create_task(fetchers[name]()) for name in CALL_PARTS if name in requested})
+        names = {task: name for name, task in tasks.items()}
+        sent, failed = [], []
+        pending = set(tasks.values())
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = names[task]
+                    try:
+                        data = task.result()
+                    except ValueError as e:
+                        failed.append(name)
+                        yield _event("error", {"part": name, "status": 404, "detail": str(e)})
+                        continue
+                    except Exception as e:
+                        failed.append(name)
+                        yield _event("error", {"part": name, "status": 500, "detail": f"Internal error: {str(e)}"})
+                        continue
+                    sent.append(name)
+                    yield _event(name, data)
+            yield _event("complete", {"parts": sent, "failed": failed})
+        finally:
+            # Client went away: stop fetching parts nobody will receive
+            for task in pending:
+                task.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
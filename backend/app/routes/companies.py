@@ -1,30 +1,27 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
 from typing import List
-from app.services.alpha_vantage import AlphaVantageService
+from app.services.alpha_vantage import AlphaVantageService, get_alpha_vantage_service
+from app.services.trend_store import get_trend_store
 from app.models import (
     CompanySearchResult,
     CompanyOverview,
     EarningsCall,
     FinancialData,
-    EarningsCalendarItem
+    QuarterFinancials,
+    EarningsCalendarItem,
+    CompanyTrends
 )
+from app.models.records import dumps
 from app.config import get_settings
 
 router = APIRouter(prefix="/api/companies", tags=["companies"])
 settings = get_settings()
 
-# Create service instance (should be dependency injected in production)
-_service: AlphaVantageService | None = None
 
 def get_service() -> AlphaVantageService:
-    """Get or create Alpha Vantage service instance"""
-    global _service
-    if _service is None:
-        _service = AlphaVantageService(
-            api_key=settings.alpha_vantage_api_key,
-            rate_limit=settings.alpha_vantage_rate_limit
-        )
-    return _service
+    """Get the Alpha Vantage service shared by all routes (one rate limit per process)"""
+    return get_alpha_vantage_service()
 
 
 @router.get("/search")
@@ -54,11 +51,11 @@ async def search_companies(
                     result.region == "United States" and
                     '.' not in result.ticker and
                     '-' not in result.ticker):
-                    filtered_results.append(result.model_dump(by_alias=False))
-            return filtered_results
+                    filtered_results.append(result)
+            return Response(content=dumps(filtered_results), media_type="application/json")
         else:
             # Return all results without filtering
-            return [result.model_dump(by_alias=False) for result in results]
+            return Response(content=dumps(results), media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -92,7 +89,8 @@ async def get_company_earnings(ticker: str):
     try:
         service = get_service()
         earnings = await service.get_earnings(ticker.upper())
-        return earnings
+        # Records are written out directly; response_model documents the shape
+        return Response(content=dumps(earnings), media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -128,6 +126,51 @@ async def get_company_financials(
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
 
+@router.get("/{ticker}/financials/history", response_model=List[QuarterFinancials])
+async def get_company_financials_history(ticker: str):
+    """
+    Get financial metrics for every quarter in a company's earnings history, newest first
+    
+    Same metrics as `/financials` for each quarter, computed in one pass and cached
+    together, so a chart of the whole history is one request instead of one per quarter.
+    
+    Example: `/api/companies/AAPL/financials/history`
+    
+    Returns 404 if no earnings history available for the ticker.
+    """
+    try:
+        service = get_service()
+        return await service.get_financials_history(ticker.upper())
+    except ValueError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Financial history not available for {ticker.upper()}: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+
+@router.get("/{ticker}/trends", response_model=CompanyTrends)
+async def get_company_trends(
+    ticker: str,
+    refresh: bool = Query(False, description="Check for new quarters even if the table is fresh")
+):
+    """
+    Get per-quarter trends: EPS, surprise, QoQ/YoY change, price reaction and
+    transcript sentiment per category, oldest quarter first
+    
+    Served from a precomputed table; new quarters are added incrementally.
+    
+    Example: `/api/companies/AAPL/trends`
+    """
+    try:
+        return await get_trend_store().get_trends(ticker.upper(), get_service(), refresh=refresh)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+
 @router.get("/calendar/upcoming", response_model=List[EarningsCalendarItem])
 async def get_earnings_calendar(
     horizon: str = Query("3month", description="Time horizon: 3month, 6month, or 12month")
@@ -145,12 +188,3 @@ async def get_earnings_calendar(
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
-
-
-@router.on_event("shutdown")
-async def shutdown_event():
-    """Clean up service on shutdown"""
-    global _service
-    if _service:
-        await _service.close()
-        _service = None
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.services.bulk_export import DATASETS, FORMATS, get_bulk_exporter, parse_tickers, schema
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+
+@router.get("/{dataset}")
+async def export_dataset(
+    dataset: str,
+    tickers: str = Query(..., description="Comma-separated tickers (e.g., 'AAPL,MSFT')"),
+    format: str = Query("parquet", description="parquet or arrow (IPC stream)")
+):
+    """
+    Stream one dataset for a ticker universe as Parquet or an Arrow IPC stream
+    
+    Datasets: transcripts (one row per entry), earnings, prices (daily closes), trends.
+    Reads only cached data and stored trend tables; uncached tickers are skipped.
+    
+    Example: `/api/export/earnings?tickers=AAPL,MSFT,NVDA&format=parquet > earnings.parquet`
+    """
+    if dataset not in DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset {dataset}; expected one of {', '.join(DATASETS)}")
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format {format}; expected one of {', '.join(FORMATS)}")
+    universe = parse_tickers([tickers])
+    if not universe:
+        raise HTTPException(status_code=400, detail="No tickers given")
+    try:
+        schema(dataset)  # Fails here, before streaming starts, if pyarrow is missing
+        exporter = get_bulk_exporter()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+    media_type, suffix = FORMATS[format]
+    return StreamingResponse(
+        exporter.stream(dataset, universe, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{dataset}{suffix}"'}
+    )
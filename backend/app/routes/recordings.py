@@ -0,0 +1,125 @@
+import tempfile
+import asyncio
+from pathlib import Path
+from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi.responses import StreamingResponse
+from app.models import TranscriptionJob, TranscriptionResult
+from app.services.batch_transcription import get_batch_transcription_service
+from app.config import get_settings
+
+router = APIRouter(prefix="/api/recordings", tags=["recordings"])
+settings = get_settings()
+
+
+def _save_upload(file: UploadFile, max_bytes: int) -> str:
+    """
+    Copy an uploaded file to a temporary path, keeping its extension for the decoder
+
+    Raises:
+        ValueError: If the file is larger than max_bytes (nothing is kept)
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise ValueError(f"Recording exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+    suffix = Path(file.filename or "").suffix or ".audio"
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp_file:
+        try:
+            written = 0
+            while chunk := file.file.read(1024 * 1024):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise ValueError(f"Recording exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+                tmp_file.write(chunk)
+        except BaseException:
+            tmp_file.close()
+            Path(tmp_file.name).unlink(missing_ok=True)
+            raise
+        return tmp_file.name
+
+
+def _get_job_or_404(job_id: str):
+    job = get_batch_transcription_service().get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Transcription job {job_id} not found")
+    return job
+
+
+@router.post("/transcribe", response_model=TranscriptionJob, status_code=202)
+async def transcribe_recording(file: UploadFile = File(..., description="Audio recording (wav, mp3, m4a, webm, ...)")):
+    """
+    Upload an archived call recording for offline transcription
+
+    The recording is split at silences and the pieces are transcribed in parallel.
+    Poll `/api/recordings/{job_id}` for status or follow `/api/recordings/{job_id}/stream`.
+    Files over BATCH_TRANSCRIPTION_MAX_UPLOAD_MB are rejected with 413.
+
+    Example: `curl -F file=@call.mp3 /api/recordings/transcribe`
+    """
+    try:
+        audio_path = await asyncio.to_thread(
+            _save_upload, file, settings.batch_transcription_max_upload_mb * 1024 * 1024
+        )
+        job = get_batch_transcription_service().submit(audio_path, file.filename)
+        return job.to_model()
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+
+@router.get("/{job_id}", response_model=TranscriptionJob)
+async def get_transcription_job(job_id: str):
+    """
+    Get status and progress of a recording transcription job
+
+    Example: `/api/recordings/{job_id}`
+    """
+    return _get_job_or_404(job_id).to_model()
+
+
+@router.get("/{job_id}/segments", response_model=TranscriptionResult)
+async def get_transcription_segments(job_id: str):
+    """
+    Get the segments transcribed so far, in timeline order
+
+    Example: `/api/recordings/{job_id}/segments`
+    """
+    job = _get_job_or_404(job_id)
+    return TranscriptionResult(job_id=job.job_id, status=job.status, segments=job.segments)
+
+
+@router.get("/{job_id}/stream")
+async def stream_transcription(job_id: str):
+    """
+    Stream segments as Server-Sent Events while the job runs
+
+    Events: `segment` (one per segment, in timeline order), `status` (progress),
+    and a final `complete` or `error`.
+
+    Example: `curl -N /api/recordings/{job_id}/stream`
+    """
+    job = _get_job_or_404(job_id)
+
+    async def event_stream():
+        sent = 0
+        while True:
+            updated = job.updated
+            for segment in job.segments[sent:]:
+                yield f"event: segment\ndata: {segment.model_dump_json()}\n\n"
+            sent = len(job.segments)
+            status = job.to_model()
+            if job.done and sent == len(job.segments):
+                event = "complete" if job.status == "completed" else "error"
+                yield f"event: {event}\ndata: {status.model_dump_json()}\n\n"
+                return
+            yield f"event: status\ndata: {status.model_dump_json()}\n\n"
+            try:
+                await asyncio.wait_for(updated.wait(), timeout=15)
+            except asyncio.TimeoutError:
+                # Keep idle connections alive through proxies
+                yield ": keepalive\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
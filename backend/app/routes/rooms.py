@@ -0,0 +1,27 @@
+from fastapi import APIRouter, HTTPException
+from app.services.live_rooms import get_live_room_registry
+
+router = APIRouter(prefix="/api/rooms", tags=["rooms"])
+
+
+@router.get("")
+async def list_rooms():
+    """
+    List shared live-call rooms and their audience
+
+    Example: `/api/rooms`
+    """
+    return get_live_room_registry().list_rooms()
+
+
+@router.get("/{room_id}")
+async def get_room(room_id: str):
+    """
+    Get one live room, including everything transcribed so far
+
+    Example: `/api/rooms/{room_id}`
+    """
+    room = get_live_room_registry().get(room_id)
+    if room is None:
+        raise HTTPException(status_code=404, detail=f"Room {room_id} not found")
+    return {**room.to_dict(), "transcript": room.segments}
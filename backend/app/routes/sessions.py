@@ -0,0 +1,141 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response
+from typing import Callable, Optional, TypeVar
+from app.services.session_archive import (
+    KIND_AUDIO,
+    SessionArchive,
+    SessionArchiveReader,
+    get_session_archive
+)
+
+router = APIRouter(prefix="/api/sessions", tags=["sessions"])
+
+AUDIO_MEDIA_TYPES = {
+    "webm": "audio/webm",
+    "pcm16": "audio/L16;rate=16000;channels=1"
+}
+
+
+def _get_archive() -> SessionArchive:
+    archive = get_session_archive()
+    if archive is None:
+        raise HTTPException(status_code=404, detail="Session archiving is disabled (set SESSION_ARCHIVE_DIR)")
+    return archive
+
+
+def _open_reader(session_id: str):
+    try:
+        return _get_archive().open_reader(session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+T = TypeVar("T")
+
+
+def _read(session_id: str, read: Callable[[SessionArchiveReader], T]) -> T:
+    """Open a session, read from it and close it (blocking: mmap and numpy work)"""
+    reader = _open_reader(session_id)
+    try:
+        return read(reader)
+    finally:
+        reader.close()
+
+
+def _format_timestamp(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+
+@router.get("")
+async def list_sessions():
+    """
+    List archived live transcription sessions, most recent first
+
+    Example: `/api/sessions`
+    """
+    # Opens every session's index
+    return await asyncio.to_thread(_get_archive().list_sessions)
+
+
+@router.get("/{session_id}/segments")
+async def get_session_segments(
+    session_id: str,
+    start: Optional[float] = Query(None, description="Start offset in seconds"),
+    end: Optional[float] = Query(None, description="End offset in seconds (exclusive)")
+):
+    """
+    Get archived segments, optionally for a time range
+
+    Example: `/api/sessions/{session_id}/segments?start=60&end=120`
+    """
+    return await asyncio.to_thread(_read, session_id, lambda reader: reader.segments(start, end))
+
+
+@router.get("/{session_id}/chunks")
+async def list_session_chunks(
+    session_id: str,
+    start: Optional[float] = Query(None, description="Start offset in seconds"),
+    end: Optional[float] = Query(None, description="End offset in seconds (exclusive)")
+):
+    """
+    List archived audio chunks, optionally for a time range
+
+    Example: `/api/sessions/{session_id}/chunks?start=60&end=120`
+    """
+    return await asyncio.to_thread(_read, session_id, lambda reader: [
+        {
+            "index": record.index,
+            "time_offset": record.time_offset,
+            "format": record.audio_format,
+            "size": len(record.data)
+        }
+        for record in reader.records(KIND_AUDIO, start, end)
+    ])
+
+
+@router.get("/{session_id}/chunks/{index}")
+async def get_session_chunk(session_id: str, index: int):
+    """
+    Get the raw bytes of one archived audio chunk, for replay
+
+    Example: `/api/sessions/{session_id}/chunks/0`
+    """
+    def read_chunk(reader: SessionArchiveReader):
+        if not 0 <= index < len(reader):
+            raise HTTPException(status_code=404, detail=f"Chunk {index} not found")
+        record = reader.record(index)
+        if record.kind != KIND_AUDIO:
+            raise HTTPException(status_code=404, detail=f"Record {index} is not an audio chunk")
+        return record
+
+    record = await asyncio.to_thread(_read, session_id, read_chunk)
+    return Response(
+        content=record.data,
+        media_type=AUDIO_MEDIA_TYPES[record.audio_format],
+        headers={"X-Time-Offset": str(record.time_offset)}
+    )
+
+
+@router.get("/{session_id}/export")
+async def export_session(
+    session_id: str,
+    format: str = Query("txt", description="Export format: txt or json")
+):
+    """
+    Export the session transcript
+
+    Example: `/api/sessions/{session_id}/export?format=txt`
+    """
+    if format not in ("txt", "json"):
+        raise HTTPException(status_code=400, detail="Format must be 'txt' or 'json'")
+    segments = await asyncio.to_thread(_read, session_id, lambda reader: reader.segments())
+
+    if format == "json":
+        return {"session_id": session_id, "segments": segments}
+    lines = [f"[{_format_timestamp(s['start'])}] {s['text']}" for s in segments]
+    return PlainTextResponse(
+        "\n".join(lines) + "\n",
+        headers={"Content-Disposition": f'attachment; filename="{session_id}.txt"'}
+    )
@@ -1,23 +1,17 @@
+from typing import List
 from fastapi import APIRouter, HTTPException, Path, Query
-from app.services.alpha_vantage import AlphaVantageService
-from app.models import TranscriptData
-from app.config import get_settings
+from fastapi.responses import Response
+from app.services.alpha_vantage import AlphaVantageService, get_alpha_vantage_service
+from app.services.lexicon_sentiment import get_lexicon
+from app.models import TranscriptData, SentimentDataPoint
+from app.models.records import dumps
 
 router = APIRouter(prefix="/api/transcript", tags=["transcripts"])
-settings = get_settings()
 
-# Create service instance (should be dependency injected in production)
-_service: AlphaVantageService | None = None
 
 def get_service() -> AlphaVantageService:
-    """Get or create Alpha Vantage service instance"""
-    global _service
-    if _service is None:
-        _service = AlphaVantageService(
-            api_key=settings.alpha_vantage_api_key,
-            rate_limit=settings.alpha_vantage_rate_limit
-        )
-    return _service
+    """Get the Alpha Vantage service shared by all routes (one rate limit per process)"""
+    return get_alpha_vantage_service()
 
 
 @router.get("/{ticker}/{quarter}", response_model=TranscriptData)
@@ -50,7 +44,8 @@ async def get_transcript(
             quarter_part,
             year
         )
-        return transcript
+        # Records are written out directly; response_model documents the shape
+        return Response(content=dumps(transcript), media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -75,17 +70,35 @@ async def get_transcript_with_year(
             quarter,
             year
         )
-        return transcript
+        # Records are written out directly; response_model documents the shape
+        return Response(content=dumps(transcript), media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
 
-@router.on_event("shutdown")
-async def shutdown_event():
-    """Clean up service on shutdown"""
-    global _service
-    if _service:
-        await _service.close()
-        _service = None
+@router.get("/{ticker}/{quarter}/{year}/sentiment", response_model=List[SentimentDataPoint])
+async def get_transcript_sentiment(
+    ticker: str = Path(..., description="Company ticker symbol (e.g., AAPL)"),
+    quarter: str = Path(..., description="Quarter (e.g., Q4)"),
+    year: int = Path(..., description="Year (e.g., 2024)"),
+    bucket_seconds: int = Query(60, ge=1, description="Seconds of call time per data point")
+):
+    """
+    Get a lexicon-based sentiment time series for an earnings call transcript
+    
+    Example: `/api/transcript/AAPL/Q4/2024/sentiment?bucket_seconds=60`
+    """
+    try:
+        service = get_service()
+        transcript = await service.get_earnings_call_transcript(
+            ticker.upper(),
+            quarter,
+            year
+        )
+        return get_lexicon().sentiment_series(transcript.entries, bucket_seconds)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
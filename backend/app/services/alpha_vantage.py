@@ -1,18 +1,51 @@
 import httpx
 import asyncio
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+import time
+import numpy as np
+from typing import List, Optional, Any
+from datetime import date, datetime, timedelta
 from app.models.company import (
-    CompanySearchResult,
     CompanyOverview,
-    EarningsCall,
     FinancialData,
+    QuarterFinancials,
     EarningsCalendarItem
 )
-from app.models.transcript import TranscriptData, TranscriptEntry, TranscriptMetadata
+from app.models.records import (
+    EarningsRecord,
+    PriceSeriesRecord,
+    SearchResultRecord,
+    TranscriptEntryRecord,
+    TranscriptRecord
+)
+from app.services.boilerplate import get_boilerplate_detector
+from app.services.cache_backend import CacheBackend, InMemoryCache, get_cache_backend
+from app.services.price_series import DailyCloseParser, plan_outputsize
+from app.services.metrics import REGISTRY
+from app.config import get_settings
 import uuid
 import re
 
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "alpha_vantage_request_seconds",
+    "Alpha Vantage request latency, excluding rate limiter waits",
+    ["function"]
+)
+UPSTREAM_ERRORS = REGISTRY.counter(
+    "alpha_vantage_request_errors_total",
+    "Alpha Vantage requests that failed or returned an error message",
+    ["function"]
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "alpha_vantage_cache_lookups_total",
+    "Alpha Vantage response cache lookups by key namespace and result (hit/miss)",
+    ["namespace", "result"]
+)
+RATE_LIMIT_WAIT = REGISTRY.histogram(
+    "alpha_vantage_rate_limit_wait_seconds",
+    "Time spent waiting for the Alpha Vantage rate limiter",
+    buckets=(0.001, 0.01, 0.1, 1.0, 5.0, 15.0, 30.0, 60.0)
+)
+
 
 class RateLimiter:
     """Simple rate limiter for API calls"""
@@ -26,7 +59,8 @@ class RateLimiter:
         # If rate limit is 0, skip rate limiting entirely
         if self.calls_per_minute == 0:
             return
-            
+        
+        started = time.perf_counter()
         async with self.lock:
             now = datetime.now()
             # Remove calls older than 1 minute
@@ -46,6 +80,36 @@ class RateLimiter:
             
             # Record this call
             self.calls.append(datetime.now())
+        RATE_LIMIT_WAIT.observe(time.perf_counter() - started)
+
+
+def _to_float(value: Optional[str]) -> float:
+    """Alpha Vantage numeric string to float (NaN for missing or "None")"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _signed_pct(value: float) -> Optional[str]:
+    """Percent change as shown by get_financials, e.g. "+18.3%" (None for NaN)"""
+    if not np.isfinite(value):
+        return None
+    return f"{'+' if value > 0 else ''}{value:.1f}%"
+
+
+def _fiscal_period(call) -> int:
+    """Fiscal period key (year * 4 + quarter index): consecutive quarters differ by 1"""
+    return call.year * 4 + int(call.quarter[1:]) - 1
+
+
+def _quarterly_revenues(income_stmt: Any) -> dict:
+    """fiscalDateEnding -> totalRevenue of an INCOME_STATEMENT response (empty if it failed)"""
+    revenues = {}
+    if isinstance(income_stmt, dict):
+        for report in income_stmt.get("quarterlyReports", []):
+            revenues.setdefault(report.get("fiscalDateEnding", ""), report.get("totalRevenue"))
+    return revenues
 
 
 class AlphaVantageService:
@@ -53,49 +117,67 @@ class AlphaVantageService:
     
     BASE_URL = "https://www.alphavantage.co/query"
     
-    def __init__(self, api_key: str, rate_limit: int = 5):
+    def __init__(
+        self,
+        api_key: str,
+        rate_limit: int = 5,
+        base_url: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[CacheBackend] = None
+    ):
+        """
+        Args:
+            base_url: Query endpoint, e.g. the local stand-in in app.services.mock_alpha_vantage
+            transport: httpx transport, e.g. to serve the stand-in in-process
+            cache: Response cache, e.g. the shared backend from get_cache_backend()
+                (defaults to a private in-memory cache)
+        """
         self.api_key = api_key
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.base_url = base_url or self.BASE_URL
+        self.client = httpx.AsyncClient(timeout=30.0, transport=transport)
         self.rate_limiter = RateLimiter(rate_limit)
-        self.cache: Dict[str, tuple[Any, datetime]] = {}
+        self.cache = cache if cache is not None else InMemoryCache()
         self.cache_ttl = timedelta(hours=1)  # Cache for 1 hour
     
     async def _get_cached(self, key: str) -> Optional[Any]:
         """Get cached data if not expired"""
-        if key in self.cache:
-            data, timestamp = self.cache[key]
-            if datetime.now() - timestamp < self.cache_ttl:
-                return data
-            else:
-                del self.cache[key]
-        return None
+        namespace = key.split(":", 1)[0]
+        data = await self.cache.get(key)
+        CACHE_LOOKUPS.labels(namespace, "miss" if data is None else "hit").inc()
+        return data
     
-    def _set_cache(self, key: str, data: Any):
+    async def _set_cache(self, key: str, data: Any):
         """Store data in cache"""
-        self.cache[key] = (data, datetime.now())
+        await self.cache.set(key, data, self.cache_ttl.total_seconds())
     
     async def _make_request(self, params: dict) -> dict:
         """Make API request with rate limiting and error handling"""
         await self.rate_limiter.acquire()
         
         params["apikey"] = self.api_key
+        function = params.get("function", "")
         
+        started = time.perf_counter()
         try:
-            response = await self.client.get(self.BASE_URL, params=params)
+            response = await self.client.get(self.base_url, params=params)
             response.raise_for_status()
             data = response.json()
+            UPSTREAM_LATENCY.labels(function).observe(time.perf_counter() - started)
             
             # Check for API error messages
             if "Error Message" in data:
+                UPSTREAM_ERRORS.labels(function).inc()
                 raise ValueError(f"Alpha Vantage API error: {data['Error Message']}")
             if "Note" in data:
+                UPSTREAM_ERRORS.labels(function).inc()
                 raise ValueError(f"Alpha Vantage rate limit: {data['Note']}")
             
             return data
         except httpx.HTTPError as e:
+            UPSTREAM_ERRORS.labels(function).inc()
             raise ValueError(f"HTTP error calling Alpha Vantage: {str(e)}")
     
-    async def search_ticker(self, keywords: str) -> List[CompanySearchResult]:
+    async def search_ticker(self, keywords: str) -> List[SearchResultRecord]:
         """Search for companies by keywords"""
         cache_key = f"search:{keywords}"
         cached = await self._get_cached(cache_key)
@@ -113,11 +195,17 @@ class AlphaVantageService:
             return []
         
         results = [
-            CompanySearchResult(**match)
+            SearchResultRecord(
+                ticker=match["1. symbol"],
+                name=match["2. name"],
+                type=match["3. type"],
+                region=match["4. region"],
+                currency=match["8. currency"]
+            )
             for match in data["bestMatches"]
         ]
         
-        self._set_cache(cache_key, results)
+        await self._set_cache(cache_key, results)
         return results
     
     async def get_company_overview(self, ticker: str) -> CompanyOverview:
@@ -138,10 +226,10 @@ class AlphaVantageService:
             raise ValueError(f"No data found for ticker {ticker}")
         
         overview = CompanyOverview(**data)
-        self._set_cache(cache_key, overview)
+        await self._set_cache(cache_key, overview)
         return overview
     
-    async def get_earnings(self, ticker: str) -> List[EarningsCall]:
+    async def get_earnings(self, ticker: str) -> List[EarningsRecord]:
         """Get earnings history for a company"""
         cache_key = f"earnings:{ticker}"
         cached = await self._get_cached(cache_key)
@@ -171,7 +259,7 @@ class AlphaVantageService:
             else:
                 continue
             
-            call = EarningsCall(
+            call = EarningsRecord(
                 id=f"{ticker}-{quarter}-{year}",
                 ticker=ticker,
                 quarter=quarter,
@@ -186,7 +274,7 @@ class AlphaVantageService:
             )
             earnings_calls.append(call)
         
-        self._set_cache(cache_key, earnings_calls)
+        await self._set_cache(cache_key, earnings_calls)
         return earnings_calls
     
     async def get_earnings_calendar(self, horizon: str = "3month") -> List[EarningsCalendarItem]:
@@ -202,7 +290,7 @@ class AlphaVantageService:
         }
         
         # Note: This returns CSV format, need to parse
-        response = await self.client.get(self.BASE_URL, params={**params, "apikey": self.api_key})
+        response = await self.client.get(self.base_url, params={**params, "apikey": self.api_key})
         response.raise_for_status()
         
         # Parse CSV
@@ -226,7 +314,7 @@ class AlphaVantageService:
                 )
                 calendar_items.append(item)
         
-        self._set_cache(cache_key, calendar_items)
+        await self._set_cache(cache_key, calendar_items)
         return calendar_items
     
     async def get_earnings_call_transcript(
@@ -234,7 +322,7 @@ class AlphaVantageService:
         ticker: str, 
         quarter: str,
         year: int
-    ) -> TranscriptData:
+    ) -> TranscriptRecord:
         """Get earnings call transcript"""
         cache_key = f"transcript:{ticker}:{quarter}:{year}"
         cached = await self._get_cached(cache_key)
@@ -279,7 +367,7 @@ class AlphaVantageService:
         # Parse transcript into entries (simple splitting by speaker)
         entries = self._parse_transcript(transcript_text)
         
-        transcript_data = TranscriptData(
+        transcript_data = TranscriptRecord(
             ticker=ticker,
             quarter=quarter,
             year=year,
@@ -288,10 +376,14 @@ class AlphaVantageService:
             entries=entries
         )
         
-        self._set_cache(cache_key, transcript_data)
+        # Flag safe-harbor / operator paragraphs before the transcript is cached and shared
+        if get_settings().boilerplate_detection:
+            get_boilerplate_detector().mark(transcript_data)
+        
+        await self._set_cache(cache_key, transcript_data)
         return transcript_data
     
-    def _parse_transcript(self, transcript_text: str) -> List[TranscriptEntry]:
+    def _parse_transcript(self, transcript_text: str) -> List[TranscriptEntryRecord]:
         """Parse transcript text into structured entries"""
         entries = []
         
@@ -315,7 +407,7 @@ class AlphaVantageService:
                 text = para[speaker_match.end():].strip()
             
             if text:
-                entry = TranscriptEntry(
+                entry = TranscriptEntryRecord(
                     id=str(uuid.uuid4()),
                     timestamp=f"{current_time // 60:02d}:{current_time % 60:02d}",
                     text=text,
@@ -343,25 +435,60 @@ class AlphaVantageService:
         }
         
         data = await self._make_request(params)
-        self._set_cache(cache_key, data)
+        await self._set_cache(cache_key, data)
         return data
     
-    async def get_daily_prices(self, ticker: str, outputsize: str = "full") -> dict:
-        """Get daily price history"""
-        cache_key = f"daily_prices:{ticker}:{outputsize}"
+    async def get_price_series(self, ticker: str, since: Optional[date] = None) -> PriceSeriesRecord:
+        """
+        Daily closes reaching back to `since` (None = recent days only).
+        
+        Fetches the compact series when it covers `since` and full history only
+        when older days are needed; a cached compact series is replaced by the
+        full one in place, so later callers get the upgrade too.
+        """
+        cache_key = f"price_series:{ticker}"
         cached = await self._get_cached(cache_key)
-        if cached:
+        if cached and cached.covers(since):
             return cached
         
+        outputsize = plan_outputsize(since)
+        series = await self._fetch_price_series(ticker, outputsize)
+        if outputsize == "compact" and not series.covers(since):
+            # Fewer trading days than planned for (e.g. a recent listing or long closure)
+            series = await self._fetch_price_series(ticker, "full")
+        if series.dates:
+            # An empty series would otherwise be served until it expires
+            await self._set_cache(cache_key, series)
+        return series
+    
+    async def _fetch_price_series(self, ticker: str, outputsize: str) -> PriceSeriesRecord:
+        """Stream TIME_SERIES_DAILY and keep only each day's close"""
+        await self.rate_limiter.acquire()
+        
         params = {
             "function": "TIME_SERIES_DAILY",
             "symbol": ticker,
-            "outputsize": outputsize  # "compact" = 100 days, "full" = 20+ years
+            "outputsize": outputsize,  # "compact" = 100 days, "full" = 20+ years
+            "apikey": self.api_key
         }
         
-        data = await self._make_request(params)
-        self._set_cache(cache_key, data)
-        return data
+        parser = DailyCloseParser()
+        started = time.perf_counter()
+        try:
+            async with self.client.stream("GET", self.base_url, params=params) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    parser.feed(chunk)
+            dates, closes = parser.finish()
+            UPSTREAM_LATENCY.labels("TIME_SERIES_DAILY").observe(time.perf_counter() - started)
+        except httpx.HTTPError as e:
+            UPSTREAM_ERRORS.labels("TIME_SERIES_DAILY").inc()
+            raise ValueError(f"HTTP error calling Alpha Vantage: {str(e)}")
+        except ValueError:
+            UPSTREAM_ERRORS.labels("TIME_SERIES_DAILY").inc()
+            raise
+        
+        return PriceSeriesRecord(ticker=ticker, outputsize=outputsize, dates=dates, closes=closes)
     
     async def get_financials(self, ticker: str, quarter: str = None, year: int = None) -> FinancialData:
         """Get financial data combining overview and earnings for a specific quarter or latest"""
@@ -382,9 +509,11 @@ class AlphaVantageService:
         if not target_call:
             raise ValueError(f"No earnings data found for {ticker} {quarter} {year}")
         
-        # Find previous quarter for comparison
-        call_index = earnings_list.index(target_call)
-        previous_call = earnings_list[call_index + 1] if call_index + 1 < len(earnings_list) else None
+        # Previous fiscal quarter for comparison, matched by period so a gap in the history is not bridged
+        previous_call = next(
+            (e for e in earnings_list if _fiscal_period(e) == _fiscal_period(target_call) - 1),
+            None
+        )
         
         # Calculate changes
         revenue_change = None
@@ -426,75 +555,63 @@ class AlphaVantageService:
             except ValueError:
                 pass
         
-        # Try to get quarterly revenue from income statement
-        revenue = overview.revenue_ttm
-        try:
-            income_stmt = await self.get_income_statement(ticker)
-            if "quarterlyReports" in income_stmt:
-                # Match quarter by fiscal date
-                for report in income_stmt["quarterlyReports"]:
-                    report_date = report.get("fiscalDateEnding", "")
-                    if target_call.fiscal_date_ending and report_date == target_call.fiscal_date_ending:
-                        revenue = report.get("totalRevenue", revenue)
-                        break
-        except Exception as e:
-            # Fallback to TTM revenue if quarterly data not available
-            pass
+        # Income statement and prices are independent: fetch them concurrently
+        async def prices_near_call():
+            # Stock price around the earnings call date (within a week);
+            # recent calls only need the compact series
+            earnings_date = datetime.strptime(target_call.date, "%Y-%m-%d").date()
+            prices = await self.get_price_series(ticker, since=earnings_date - timedelta(days=7))
+            return prices.close_near(earnings_date, max_days=7)
+        
+        income_stmt, close_price = await asyncio.gather(
+            self.get_income_statement(ticker), prices_near_call(), return_exceptions=True
+        )
+        
+        # Quarterly revenue from the income statement, matched by fiscal date;
+        # fall back to TTM revenue if quarterly data is not available
+        quarterly_revenues = _quarterly_revenues(income_stmt)
+        revenue = quarterly_revenues.get(target_call.fiscal_date_ending or "", overview.revenue_ttm)
+        
+        # QoQ revenue change, only between two quarterly reports (never against TTM)
+        if previous_call:
+            current_revenue = _to_float(quarterly_revenues.get(target_call.fiscal_date_ending or ""))
+            previous_revenue = _to_float(quarterly_revenues.get(previous_call.fiscal_date_ending or ""))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                revenue_change = _signed_pct(
+                    np.float64(current_revenue - previous_revenue) / abs(previous_revenue) * 100
+                )
         
         # Get historical stock price for market cap and P/E calculation
         historical_pe = None
         historical_market_cap = None
         
         try:
-            # Get stock price around the earnings call date
-            daily_prices = await self.get_daily_prices(ticker, outputsize="full")
-            time_series = daily_prices.get("Time Series (Daily)", {})
+            if isinstance(close_price, Exception):
+                raise close_price
             
-            # Try to find price within 7 days of earnings date
-            from datetime import datetime, timedelta
-            earnings_date = datetime.strptime(target_call.date, "%Y-%m-%d")
-            
-            # Search for price within a week of earnings date
-            for days_offset in range(0, 8):
-                for direction in [0, 1, -1]:  # same day, after, before
-                    check_date = earnings_date + timedelta(days=days_offset * direction)
-                    date_str = check_date.strftime("%Y-%m-%d")
-                    
-                    if date_str in time_series:
-                        price_data = time_series[date_str]
-                        close_price = float(price_data.get("4. close", 0))
-                        
-                        if close_price > 0:
-                            # Calculate historical P/E ratio
-                            if target_call.reported_eps:
-                                try:
-                                    eps_value = float(target_call.reported_eps)
-                                    if eps_value > 0:
-                                        historical_pe = close_price / eps_value
-                                except (ValueError, ZeroDivisionError):
-                                    pass
-                            
-                            # Calculate historical market cap
-                            # Use current shares outstanding (approximation)
-                            if overview.market_cap:
-                                try:
-                                    current_market_cap = float(overview.market_cap)
-                                    current_price = float(overview.fifty_two_week_high) if overview.fifty_two_week_high else None
-                                    
-                                    if current_price and current_price > 0:
-                                        # Estimate shares outstanding
-                                        shares_outstanding = current_market_cap / current_price
-                                        historical_market_cap = str(int(close_price * shares_outstanding))
-                                except (ValueError, ZeroDivisionError, TypeError):
-                                    pass
-                            
-                            break
-                    
-                    if historical_pe or historical_market_cap:
-                        break
+            if close_price and close_price > 0:
+                # Calculate historical P/E ratio
+                if target_call.reported_eps:
+                    try:
+                        eps_value = float(target_call.reported_eps)
+                        if eps_value > 0:
+                            historical_pe = close_price / eps_value
+                    except (ValueError, ZeroDivisionError):
+                        pass
                 
-                if historical_pe or historical_market_cap:
-                    break
+                # Calculate historical market cap
+                # Use current shares outstanding (approximation)
+                if overview.market_cap:
+                    try:
+                        current_market_cap = float(overview.market_cap)
+                        current_price = float(overview.fifty_two_week_high) if overview.fifty_two_week_high else None
+                        
+                        if current_price and current_price > 0:
+                            # Estimate shares outstanding
+                            shares_outstanding = current_market_cap / current_price
+                            historical_market_cap = str(int(close_price * shares_outstanding))
+                    except (ValueError, ZeroDivisionError, TypeError):
+                        pass
         except Exception as e:
             # Fallback to current values if historical data not available
             pass
@@ -511,6 +628,147 @@ class AlphaVantageService:
             guidance_vs_actual=guidance_vs_actual
         )
     
+    async def get_financials_history(self, ticker: str) -> List[QuarterFinancials]:
+        """
+        Financial data for every quarter in the earnings history, newest first.
+        
+        Computed in one pass over arrays: QoQ and YoY changes join each quarter
+        to the one 1 and 4 fiscal periods earlier, revenue joins the income
+        statement on fiscal date, and historical P/E takes the close nearest
+        each report date from one price series lookup. Revenue change is
+        computed between quarterly reports only, as in get_financials. Cached as
+        a whole, unless the income statement or prices could not be fetched.
+        """
+        cache_key = f"financials_history:{ticker}"
+        cached = await self._get_cached(cache_key)
+        if cached:
+            return cached
+        
+        overview, earnings_list = await asyncio.gather(
+            self.get_company_overview(ticker), self.get_earnings(ticker)
+        )
+        if not earnings_list:
+            raise ValueError(f"No earnings data found for {ticker}")
+        
+        report_dates = np.array([e.date or e.fiscal_date_ending or "NaT" for e in earnings_list], dtype="datetime64[D]")
+        known_dates = report_dates[~np.isnat(report_dates)]
+        since = known_dates.min().astype(date) - timedelta(days=7) if len(known_dates) else None
+        income_stmt, prices = await asyncio.gather(
+            self.get_income_statement(ticker),
+            self.get_price_series(ticker, since=since),
+            return_exceptions=True
+        )
+        
+        # Fiscal period keys (year * 4 + quarter index) joined by binary search
+        periods = np.array([_fiscal_period(e) for e in earnings_list])
+        order = np.argsort(periods)
+        
+        def join(offset: int) -> np.ndarray:
+            """Row of the quarter `offset` periods earlier, or -1"""
+            wanted = periods - offset
+            pos = np.clip(np.searchsorted(periods[order], wanted), 0, len(periods) - 1)
+            return np.where(periods[order][pos] == wanted, order[pos], -1)
+        
+        def pct_change(values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+            previous = np.where(rows >= 0, values[rows], np.nan)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                change = (values - previous) / np.abs(previous) * 100
+            return np.where(np.isfinite(change), change, np.nan)
+        
+        eps = np.array([_to_float(e.reported_eps) for e in earnings_list])
+        prev_quarter, prev_year = join(1), join(4)
+        eps_change = pct_change(eps, prev_quarter)
+        yoy_growth = pct_change(eps, prev_year)
+        surprise = np.array([_to_float(e.surprise_percentage) for e in earnings_list])
+        
+        # Revenue: quarterly report with the same fiscal date, else TTM. The
+        # change uses quarterly revenue only (NaN where the TTM fallback is shown)
+        revenue_by_date = _quarterly_revenues(income_stmt)
+        revenues = [revenue_by_date.get(e.fiscal_date_ending or "", overview.revenue_ttm) for e in earnings_list]
+        quarterly = np.array([_to_float(revenue_by_date.get(e.fiscal_date_ending or "")) for e in earnings_list])
+        revenue_change = pct_change(quarterly, prev_quarter)
+        
+        # Close on the report date or the nearest trading day within a week (later day on ties)
+        closes = np.full(len(earnings_list), np.nan)
+        if isinstance(prices, PriceSeriesRecord) and prices.dates:
+            dates = np.array(prices.dates, dtype="datetime64[D]")
+            values = np.array(prices.closes, dtype=np.float64)
+            after = np.searchsorted(dates, report_dates, side="left")
+            before = after - 1
+            after_days = np.where(after < len(dates), (dates[np.minimum(after, len(dates) - 1)] - report_dates).astype(int), 10**6)
+            before_days = np.where(before >= 0, (report_dates - dates[np.maximum(before, 0)]).astype(int), 10**6)
+            nearest = np.where(after_days <= before_days, after, before)
+            in_window = (np.minimum(after_days, before_days) <= 7) & ~np.isnat(report_dates)
+            closes = np.where(in_window, values[np.clip(nearest, 0, len(dates) - 1)], np.nan)
+            closes = np.where(closes > 0, closes, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            historical_pe = np.where(eps > 0, closes / eps, np.nan)
+        
+        # Market cap at the report: current shares outstanding (approximated as in get_financials) times the close
+        shares = np.nan
+        try:
+            if overview.market_cap and overview.fifty_two_week_high and float(overview.fifty_two_week_high) > 0:
+                shares = float(overview.market_cap) / float(overview.fifty_two_week_high)
+        except ValueError:
+            pass
+        market_caps = closes * shares
+        
+        current_pe = _to_float(overview.pe_ratio)
+        history = [
+            QuarterFinancials(
+                ticker=ticker,
+                quarter=call.quarter,
+                year=call.year,
+                fiscal_date_ending=call.fiscal_date_ending or "",
+                report_date=call.date,
+                revenue=revenues[i],
+                revenue_change=_signed_pct(revenue_change[i]),
+                eps=call.reported_eps or overview.eps,
+                eps_change=_signed_pct(eps_change[i]),
+                pe_ratio=float(historical_pe[i]) if np.isfinite(historical_pe[i]) else (
+                    current_pe if np.isfinite(current_pe) else None
+                ),
+                market_cap=str(int(market_caps[i])) if np.isfinite(market_caps[i]) else overview.market_cap,
+                yoy_growth=_signed_pct(yoy_growth[i]) or overview.profit_margin,
+                guidance_vs_actual=_signed_pct(surprise[i])
+            )
+            for i, call in enumerate(earnings_list)
+        ]
+        # A failed fetch leaves TTM revenue or current P/E in place; don't keep that for the cache TTL
+        if not isinstance(income_stmt, Exception) and not isinstance(prices, Exception):
+            await self._set_cache(cache_key, history)
+        return history
+    
     async def close(self):
         """Close HTTP client"""
         await self.client.aclose()
+
+
+# Global instance
+_alpha_vantage_service: Optional[AlphaVantageService] = None
+
+
+def get_alpha_vantage_service() -> AlphaVantageService:
+    """
+    Get or create the service shared by all routes and background jobs. Each
+    instance has its own rate limiter, so sharing one keeps the process within
+    ALPHA_VANTAGE_RATE_LIMIT.
+    """
+    global _alpha_vantage_service
+    if _alpha_vantage_service is None:
+        settings = get_settings()
+        _alpha_vantage_service = AlphaVantageService(
+            api_key=settings.alpha_vantage_api_key,
+            rate_limit=settings.alpha_vantage_rate_limit,
+            base_url=settings.alpha_vantage_base_url or None,
+            cache=get_cache_backend()
+        )
+    return _alpha_vantage_service
+
+
+async def close_alpha_vantage_service():
+    """Close the shared service, if it was ever created"""
+    global _alpha_vantage_service
+    if _alpha_vantage_service is not None:
+        await _alpha_vantage_service.close()
+        _alpha_vantage_service = None
@@ -0,0 +1,259 @@
+"""Job queue for transcript analysis sessions with de-duplication and progress streaming."""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+
+from app.config import get_settings
+from app.models.analysis import (
+    AnalysisRequest,
+    AnalysisSession,
+    AnalysisStatus,
+    TranscriptAnalysis,
+    WSMessage
+)
+from app.services.alpha_vantage import AlphaVantageService, get_alpha_vantage_service
+from app.services.llm_analysis import LLMAnalysisPipeline, get_llm_pipeline
+
+logger = logging.getLogger(__name__)
+
+# Share of progress spent fetching the transcript; the pipeline reports the rest
+FETCH_PROGRESS = 0.05
+
+
+class AnalysisJob:
+    """One analysis session, shared by every client that requested the same call"""
+
+    def __init__(self, request: AnalysisRequest, key: tuple):
+        self.session_id = str(uuid.uuid4())
+        self.request = request
+        self.key = key
+        self.status = "pending"
+        self.progress = 0.0
+        self.message: Optional[str] = None
+        self.result: Optional[TranscriptAnalysis] = None
+        self.created_at = datetime.now()
+        self.finished_at: Optional[float] = None  # monotonic, for retention
+        self.subscribers: Set[asyncio.Queue] = set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "error")
+
+    def to_session(self) -> AnalysisSession:
+        return AnalysisSession(
+            session_id=self.session_id,
+            ticker=self.request.ticker,
+            quarter=self.request.quarter,
+            year=self.request.year,
+            status=self.status,
+            created_at=self.created_at,
+            progress=round(self.progress, 3)
+        )
+
+    def to_status(self) -> AnalysisStatus:
+        return AnalysisStatus(
+            session_id=self.session_id,
+            status=self.status,
+            progress=round(self.progress, 3),
+            message=self.message
+        )
+
+    def status_message(self) -> WSMessage:
+        return _message("analysis_status", self.to_status().model_dump())
+
+    def final_message(self) -> Optional[WSMessage]:
+        if self.status == "completed":
+            return _message("analysis_complete", {
+                "session_id": self.session_id,
+                "analysis": self.result.model_dump()
+            })
+        if self.status == "error":
+            return _message("error", {"session_id": self.session_id, "message": self.message})
+        return None
+
+
+def _message(message_type: str, payload: dict) -> WSMessage:
+    return WSMessage(type=message_type, payload=payload, timestamp=int(time.time() * 1000))
+
+
+class AnalysisSessionManager:
+    """
+    Runs analysis jobs on a fixed number of worker tasks.
+
+    Requests for a call that is already pending, running or completed join the
+    existing session instead of starting a new one. Subscribers get WSMessage
+    updates on bounded queues; when a slow subscriber's queue is full the oldest
+    update is dropped, since each status update supersedes the previous one.
+    Finished sessions are kept for `retention_seconds`, at most `max_retained`.
+    """
+
+    def __init__(
+        self,
+        alpha_vantage: AlphaVantageService,
+        pipeline_factory: Callable[[], LLMAnalysisPipeline],
+        workers: int = 2,
+        max_pending: int = 100,
+        max_retained: int = 200,
+        retention_seconds: float = 3600.0,
+        subscriber_queue_size: int = 32
+    ):
+        self.alpha_vantage = alpha_vantage
+        self.pipeline_factory = pipeline_factory
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_retained = max_retained
+        self.retention_seconds = retention_seconds
+        self.subscriber_queue_size = subscriber_queue_size
+
+        self.jobs: Dict[str, AnalysisJob] = {}
+        self._by_key: Dict[tuple, AnalysisJob] = {}
+        self._finished: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @staticmethod
+    def request_key(request: AnalysisRequest) -> tuple:
+        return (request.ticker.upper(), request.quarter.upper(), request.year)
+
+    def _start(self):
+        """Start the worker tasks on first use (needs a running event loop)"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def submit(self, request: AnalysisRequest) -> AnalysisJob:
+        """Queue an analysis, or return the session already covering this call"""
+        self._evict()
+        key = self.request_key(request)
+        existing = self._by_key.get(key)
+        if existing is not None and existing.status != "error":
+            return existing
+
+        self._start()
+        if self._queue.qsize() >= self.max_pending:
+            raise RuntimeError(f"Analysis queue is full ({self.max_pending} pending)")
+        job = AnalysisJob(request, key)
+        self.jobs[job.session_id] = job
+        self._by_key[key] = job
+        self._queue.put_nowait(job)
+        logger.info(f"Queued analysis {job.session_id} for {key[0]} {key[1]} {key[2]}")
+        return job
+
+    def get_job(self, session_id: str) -> Optional[AnalysisJob]:
+        self._evict()
+        return self.jobs.get(session_id)
+
+    def list_jobs(self) -> List[AnalysisJob]:
+        self._evict()
+        return sorted(self.jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def subscribe(self, job: AnalysisJob) -> asyncio.Queue:
+        """Queue of WSMessage updates for a job, starting with its current status"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        queue.put_nowait(job.status_message())
+        if job.finished:
+            queue.put_nowait(job.final_message())
+        else:
+            job.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, job: AnalysisJob, queue: asyncio.Queue):
+        job.subscribers.discard(queue)
+
+    def _publish(self, job: AnalysisJob, message: WSMessage):
+        for queue in job.subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    def _set_progress(self, job: AnalysisJob, progress: float):
+        job.progress = progress
+        self._publish(job, job.status_message())
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: AnalysisJob):
+        job.status = "processing"
+        job.message = "Fetching transcript"
+        self._set_progress(job, 0.0)
+        try:
+            ticker, quarter, year = job.key
+            transcript = await self.alpha_vantage.get_earnings_call_transcript(ticker, quarter, year)
+            job.message = "Analyzing transcript"
+            self._set_progress(job, FETCH_PROGRESS)
+            job.result = await self.pipeline_factory().analyze(
+                transcript,
+                progress=lambda p: self._set_progress(job, FETCH_PROGRESS + (1 - FETCH_PROGRESS) * p)
+            )
+            job.status = "completed"
+            job.message = None
+            job.progress = 1.0
+        except Exception as e:
+            logger.error(f"Analysis {job.session_id} failed: {e}")
+            job.status = "error"
+            job.message = str(e)
+
+        job.finished_at = time.monotonic()
+        self._finished[job.session_id] = job
+        self._publish(job, job.status_message())
+        self._publish(job, job.final_message())
+        job.subscribers.clear()
+
+    def _evict(self):
+        """Drop finished sessions past retention, and the oldest beyond max_retained"""
+        now = time.monotonic()
+        while self._finished:
+            session_id, job = next(iter(self._finished.items()))
+            if len(self._finished) <= self.max_retained and now - job.finished_at < self.retention_seconds:
+                break
+            del self._finished[session_id]
+            del self.jobs[session_id]
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+
+    async def shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+
+# Global instance
+_analysis_session_manager: Optional[AnalysisSessionManager] = None
+
+
+def get_analysis_session_manager() -> AnalysisSessionManager:
+    """Get or create the global analysis session manager from settings"""
+    global _analysis_session_manager
+    if _analysis_session_manager is None:
+        settings = get_settings()
+        _analysis_session_manager = AnalysisSessionManager(
+            # Shared with the routes so all requests draw on one rate limit
+            alpha_vantage=get_alpha_vantage_service(),
+            pipeline_factory=get_llm_pipeline,
+            workers=settings.analysis_workers,
+            max_pending=settings.analysis_max_pending,
+            max_retained=settings.analysis_retained_sessions,
+            retention_seconds=settings.analysis_retention_seconds
+        )
+    return _analysis_session_manager
+
+
+async def shutdown_analysis_session_manager():
+    """Stop the global manager's workers, if it was ever started"""
+    global _analysis_session_manager
+    if _analysis_session_manager is not None:
+        await _analysis_session_manager.shutdown()
+        _analysis_session_manager = None
@@ -0,0 +1,236 @@
+"""Offline transcription of long recordings, split at silences and processed in parallel."""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from app.config import get_settings
+from app.models.transcription import TranscriptionJob, TranscriptionSegment
+from app.services.local_whisper import LocalWhisperService
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+
+def find_split_points(
+    samples: np.ndarray,
+    target_seconds: float = 120.0,
+    search_seconds: float = 10.0,
+    sample_rate: int = SAMPLE_RATE
+) -> List[int]:
+    """
+    Choose sample indices to split a recording at, near every `target_seconds`.
+
+    Each split lands on the quietest point (smoothed RMS energy over 30 ms frames)
+    within `search_seconds` of the target, so cuts fall in pauses, not mid-word.
+
+    Returns:
+        Boundaries including 0 and len(samples); piece i is samples[b[i]:b[i+1]]
+    """
+    frame = int(sample_rate * 0.03)
+    n_frames = len(samples) // frame
+    target = int(target_seconds / 0.03)
+    if n_frames <= target + target // 4:
+        return [0, len(samples)]
+
+    frames = samples[:n_frames * frame].reshape(n_frames, frame)
+    energy = np.sqrt(np.mean(frames ** 2, axis=1))
+    # Smooth over ~300 ms so a pause wins over a single quiet frame
+    energy = np.convolve(energy, np.ones(10) / 10, mode="same")
+
+    search = int(search_seconds / 0.03)
+    splits = [0]
+    position = target
+    while position < n_frames - target // 4:
+        lo = max(splits[-1] + 1, position - search)
+        hi = min(n_frames, position + search)
+        split = lo + int(np.argmin(energy[lo:hi]))
+        splits.append(split)
+        position = split + target
+
+    return [s * frame for s in splits] + [len(samples)]
+
+
+class BatchTranscriptionJob:
+    """In-memory state of one recording transcription job"""
+
+    def __init__(self, job_id: str, filename: Optional[str]):
+        self.job_id = job_id
+        self.filename = filename
+        self.status = "pending"
+        self.created_at = datetime.now()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.duration_seconds: Optional[float] = None
+        self.chunks_total = 0
+        self.chunks_completed = 0
+        self.message: Optional[str] = None
+        # Segments in timeline order; only chunks whose predecessors are done are released
+        self.segments: List[TranscriptionSegment] = []
+        self.updated = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "error")
+
+    def notify(self):
+        """Wake up stream readers waiting for new segments or status changes"""
+        self.updated.set()
+        self.updated = asyncio.Event()
+
+    def to_model(self) -> TranscriptionJob:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.monotonic()) - self.started_at, 2)
+        return TranscriptionJob(
+            job_id=self.job_id,
+            filename=self.filename,
+            status=self.status,
+            created_at=self.created_at,
+            duration_seconds=self.duration_seconds,
+            chunks_total=self.chunks_total,
+            chunks_completed=self.chunks_completed,
+            segment_count=len(self.segments),
+            progress=self.chunks_completed / self.chunks_total if self.chunks_total else 0.0,
+            elapsed_seconds=elapsed,
+            message=self.message
+        )
+
+
+class BatchTranscriptionService:
+    """Runs recording transcription jobs on a pool of parallel Whisper workers"""
+
+    def __init__(
+        self,
+        model_size: str = "base",
+        workers: int = 0,
+        chunk_seconds: float = 120.0,
+        retention: timedelta = timedelta(hours=1)
+    ):
+        """
+        Args:
+            model_size: Whisper model size used for recordings
+            workers: Chunks transcribed in parallel (0 = half the CPU cores)
+            chunk_seconds: Target chunk length before snapping to a silence
+            retention: How long finished jobs stay available for polling
+        """
+        cores = os.cpu_count() or 1
+        self.workers = workers or max(1, cores // 2)
+        self.chunk_seconds = chunk_seconds
+        self.retention = retention
+        # One model with a worker per thread; CTranslate2 releases the GIL while decoding
+        self.whisper = LocalWhisperService(
+            model_size=model_size,
+            cpu_threads=max(1, cores // self.workers),
+            num_workers=self.workers
+        )
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch-whisper")
+        self.jobs: Dict[str, BatchTranscriptionJob] = {}
+        # The event loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+
+    def get_job(self, job_id: str) -> Optional[BatchTranscriptionJob]:
+        return self.jobs.get(job_id)
+
+    def submit(self, audio_path: str, filename: Optional[str] = None) -> BatchTranscriptionJob:
+        """Start transcribing an uploaded file; the file is deleted once decoded"""
+        self._evict_finished()
+        job = BatchTranscriptionJob(str(uuid.uuid4()), filename)
+        self.jobs[job.job_id] = job
+        task = asyncio.create_task(self._run(job, audio_path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def _evict_finished(self):
+        cutoff = datetime.now() - self.retention
+        for job_id in [j.job_id for j in self.jobs.values() if j.done and j.created_at < cutoff]:
+            del self.jobs[job_id]
+
+    def _transcribe_chunk(self, samples: np.ndarray, offset: float) -> List[TranscriptionSegment]:
+        return [
+            TranscriptionSegment(**segment)
+            for segment in self.whisper.transcribe_file(samples, language="en", time_offset=offset)
+        ]
+
+    async def _run(self, job: BatchTranscriptionJob, audio_path: str):
+        loop = asyncio.get_running_loop()
+        futures = []
+        job.status = "processing"
+        job.started_at = time.monotonic()
+        job.notify()
+
+        try:
+            from faster_whisper import decode_audio
+            try:
+                samples = await asyncio.to_thread(decode_audio, audio_path, SAMPLE_RATE)
+            finally:
+                Path(audio_path).unlink(missing_ok=True)
+
+            job.duration_seconds = round(len(samples) / SAMPLE_RATE, 2)
+            # Keep at least one chunk per worker so short files still use every core
+            target = min(self.chunk_seconds, max(30.0, job.duration_seconds / self.workers))
+            bounds = await asyncio.to_thread(find_split_points, samples, target)
+            job.chunks_total = len(bounds) - 1
+            logger.info(
+                f"Job {job.job_id}: {job.duration_seconds}s of audio in "
+                f"{job.chunks_total} chunks on {self.workers} workers"
+            )
+            job.notify()
+
+            futures = [
+                loop.run_in_executor(
+                    self.executor,
+                    self._transcribe_chunk,
+                    samples[start:end],
+                    start / SAMPLE_RATE
+                )
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ]
+
+            # Release chunks in timeline order so streamed segments are monotonic
+            for future in futures:
+                job.segments.extend(await future)
+                job.chunks_completed += 1
+                job.notify()
+
+            job.status = "completed"
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {e}")
+            job.status = "error"
+            job.message = str(e)
+        finally:
+            job.finished_at = time.monotonic()
+            job.notify()
+            # After a failed chunk, drop the queued ones and wait out those
+            # already running so their results and errors are not orphaned
+            for future in futures:
+                future.cancel()
+            if futures:
+                await asyncio.gather(*futures, return_exceptions=True)
+
+
+# Global instance
+_batch_service: Optional[BatchTranscriptionService] = None
+
+
+def get_batch_transcription_service() -> BatchTranscriptionService:
+    """Get or create the global batch transcription service"""
+    global _batch_service
+    if _batch_service is None:
+        settings = get_settings()
+        _batch_service = BatchTranscriptionService(
+            model_size=settings.batch_whisper_model_size or settings.whisper_model_size,
+            workers=settings.batch_transcription_workers,
+            chunk_seconds=settings.batch_transcription_chunk_seconds
+        )
+    return _batch_service
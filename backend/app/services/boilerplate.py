@@ -0,0 +1,244 @@
+"""
+Near-duplicate detection of boilerplate transcript paragraphs.
+
+Much of every earnings call repeats quarter after quarter: safe-harbor
+statements, operator scripts, introductions. Paragraphs are compared, using
+MinHash signatures of word shingles, against the same company's earlier
+transcripts and a global corpus of common boilerplate; matches are flagged
+(`TranscriptEntryRecord.boilerplate`) so analysis and sentiment scoring skip them.
+
+Hashing is vectorized: all paragraphs of a transcript are shingled and
+MinHashed in a few array operations, and candidates are found with LSH banding
+before their signature similarity is checked.
+"""
+
+import hashlib
+import logging
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set
+
+import numpy as np
+
+from app.config import get_settings
+from app.models.records import TranscriptRecord
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 3  # words per shingle
+NUM_PERM = 64  # MinHash signature length
+BANDS = 16  # LSH bands of NUM_PERM // BANDS rows: pairs above ~0.5 similarity become candidates
+
+# Numbers are words too: results paragraphs differ from quarter to quarter mostly in them
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+
+# Paragraphs that open, steer and close most calls, regardless of company
+BOILERPLATE_CORPUS = [
+    "Good day, and welcome to the fourth quarter earnings conference call. At this time, all participants "
+    "are in a listen-only mode. After the speakers' presentation, there will be a question-and-answer "
+    "session. To ask a question during the session, you will need to press star one one on your telephone.",
+    "Please be advised that today's conference is being recorded. I would now like to hand the conference "
+    "over to your speaker today, head of investor relations. Please go ahead.",
+    "Before we begin, I'd like to remind you that today's discussion will include forward-looking statements "
+    "within the meaning of the Private Securities Litigation Reform Act of 1995. These statements are subject "
+    "to risks and uncertainties that could cause actual results to differ materially from those expressed or "
+    "implied. Please refer to our most recent annual report on Form 10-K and quarterly reports on Form 10-Q "
+    "for a discussion of these risks. We undertake no obligation to update any forward-looking statement.",
+    "We will also discuss certain non-GAAP financial measures. A reconciliation of these measures to the most "
+    "directly comparable GAAP measures is included in our earnings press release, which is available on the "
+    "investor relations section of our website.",
+    "With that, I'll turn the call over to our Chief Executive Officer.",
+    "Thank you. We will now begin the question-and-answer session. Our first question comes from the line of",
+    "Thank you. Our next question comes from the line of",
+    "Thanks for taking my question.",
+    "There are no further questions at this time. I would now like to turn the call back over to management "
+    "for closing remarks.",
+    "This concludes today's conference call. Thank you for participating. You may now disconnect.",
+]
+
+# Fixed seeds so signatures are comparable across runs and processes
+_rng = np.random.default_rng(20240229)
+_PERM_A = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+_SHINGLE_MULTIPLIERS = _rng.integers(1, 2**63, SHINGLE_SIZE, dtype=np.uint64) | np.uint64(1)
+_BAND_MULTIPLIERS = _rng.integers(1, 2**63, NUM_PERM // BANDS, dtype=np.uint64) | np.uint64(1)
+_EMPTY = np.uint64(np.iinfo(np.uint64).max)
+
+_token_hashes: Dict[str, int] = {}
+
+
+def _token_hash(token: str) -> int:
+    value = _token_hashes.get(token)
+    if value is None:
+        value = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+        _token_hashes[token] = value
+    return value
+
+
+def minhash_signatures(texts: Sequence[str]) -> np.ndarray:
+    """
+    (len(texts), NUM_PERM) MinHash signatures of word shingles. Every paragraph
+    is padded so one too short for a full shingle still gets a signature;
+    paragraphs without words get an all-max signature that matches nothing.
+    """
+    token_lists = [TOKEN_PATTERN.findall(text.lower()) for text in texts]
+    lengths = np.array([len(tokens) for tokens in token_lists], dtype=np.int64)
+    signatures = np.full((len(texts), NUM_PERM), _EMPTY, dtype=np.uint64)
+    if not lengths.sum():
+        return signatures
+
+    # One flat token array; each paragraph followed by SHINGLE_SIZE - 1 padding zeros
+    padded = lengths + SHINGLE_SIZE - 1
+    tokens = np.zeros(padded.sum(), dtype=np.uint64)
+    starts = np.concatenate(([0], np.cumsum(padded)[:-1]))
+    for start, words in zip(starts, token_lists):
+        tokens[start:start + len(words)] = [_token_hash(word) for word in words]
+
+    # Shingle hash at every real token position (arithmetic wraps mod 2^64)
+    positions = np.concatenate([np.arange(start, start + n) for start, n in zip(starts, lengths) if n])
+    shingles = np.zeros(len(positions), dtype=np.uint64)
+    for offset in range(SHINGLE_SIZE):
+        shingles += tokens[positions + offset] * _SHINGLE_MULTIPLIERS[offset]
+
+    # Multiply-shift hash per permutation, then the minimum over each paragraph's shingles
+    hashed = (shingles[:, None] * _PERM_A + _PERM_B) >> np.uint64(32)
+    nonempty = lengths > 0
+    shingle_starts = np.concatenate(([0], np.cumsum(lengths[nonempty])[:-1]))
+    signatures[nonempty] = np.minimum.reduceat(hashed, shingle_starts, axis=0)
+    return signatures
+
+
+def _band_keys(signatures: np.ndarray) -> np.ndarray:
+    rows = NUM_PERM // BANDS
+    banded = signatures.reshape(len(signatures), BANDS, rows)
+    return (banded * _BAND_MULTIPLIERS).sum(axis=2)
+
+
+class MinHashIndex:
+    """Signatures with LSH band tables, each tagged with the document it came from"""
+
+    def __init__(self):
+        self.signatures = np.empty((0, NUM_PERM), dtype=np.uint64)
+        self.owners: List[str] = []
+        self._bands: List[Dict[int, List[int]]] = [{} for _ in range(BANDS)]
+
+    def __len__(self) -> int:
+        return len(self.owners)
+
+    def add(self, signatures: np.ndarray, owner: str):
+        keep = signatures[:, 0] != _EMPTY
+        signatures = signatures[keep]
+        first = len(self.owners)
+        for band, keys in enumerate(_band_keys(signatures).T.tolist()):
+            table = self._bands[band]
+            for row, key in enumerate(keys, start=first):
+                table.setdefault(key, []).append(row)
+        self.signatures = np.concatenate((self.signatures, signatures))
+        self.owners.extend([owner] * len(signatures))
+
+    def similarity(self, signatures: np.ndarray, owners: Optional[Set[str]] = None) -> np.ndarray:
+        """Highest estimated Jaccard similarity of each signature to an indexed one (of `owners`, if given)"""
+        best = np.zeros(len(signatures))
+        if not self.owners:
+            return best
+        band_keys = _band_keys(signatures).tolist()
+        for i, keys in enumerate(band_keys):
+            if signatures[i, 0] == _EMPTY:
+                continue
+            candidates = {row for band, key in enumerate(keys) for row in self._bands[band].get(key, ())}
+            if owners is not None:
+                candidates = [row for row in candidates if self.owners[row] in owners]
+            if candidates:
+                best[i] = (self.signatures[candidates] == signatures[i]).mean(axis=1).max()
+        return best
+
+
+class BoilerplateDetector:
+    """
+    Flags transcript entries that near-duplicate the global corpus or an earlier
+    (by fiscal year and quarter) transcript of the same company, so a statement
+    is never flagged the first time it is made. Only calls already seen can
+    match: flags depend on fetch history, and a call marked before its
+    predecessors were fetched is not re-marked once they are. Each company's
+    index holds the paragraphs of its `calls_per_ticker` most recently seen
+    transcripts.
+    """
+
+    def __init__(self, threshold: float = 0.5, calls_per_ticker: int = 8, corpus: Optional[List[str]] = None):
+        self.threshold = threshold
+        self.calls_per_ticker = calls_per_ticker
+        self.corpus = MinHashIndex()
+        self.corpus.add(minhash_signatures(corpus if corpus is not None else BOILERPLATE_CORPUS), "corpus")
+        self._calls: Dict[str, "OrderedDict[str, np.ndarray]"] = {}
+        self._indexes: Dict[str, MinHashIndex] = {}
+
+    @staticmethod
+    def call_key(transcript: TranscriptRecord) -> str:
+        return f"{transcript.quarter.upper()}-{transcript.year}"
+
+    @staticmethod
+    def _period(key: str) -> int:
+        quarter, year = key.split("-")
+        return int(year) * 4 + int(quarter[1:])
+
+    def _remember(self, ticker: str, key: str, signatures: np.ndarray):
+        calls = self._calls.setdefault(ticker, OrderedDict())
+        if key in calls:
+            calls.move_to_end(key)
+            return
+        calls[key] = signatures
+        if len(calls) > self.calls_per_ticker:
+            # Rebuilding is cheap next to fetching a transcript and keeps the index simple
+            calls.popitem(last=False)
+            self._indexes[ticker] = MinHashIndex()
+            for call, call_signatures in calls.items():
+                self._indexes[ticker].add(call_signatures, call)
+        else:
+            self._indexes.setdefault(ticker, MinHashIndex()).add(signatures, key)
+
+    def mark(self, transcript: TranscriptRecord) -> int:
+        """Set `boilerplate` on matching entries, then index the transcript; returns entries flagged"""
+        if not transcript.entries:
+            return 0
+        ticker, key = transcript.ticker.upper(), self.call_key(transcript)
+        signatures = minhash_signatures([entry.text for entry in transcript.entries])
+        similarity = self.corpus.similarity(signatures)
+        index = self._indexes.get(ticker)
+        earlier = {call for call in self._calls.get(ticker, ()) if self._period(call) < self._period(key)}
+        if index is not None and earlier:
+            similarity = np.maximum(similarity, index.similarity(signatures, owners=earlier))
+
+        flagged = similarity >= self.threshold
+        for entry, is_boilerplate in zip(transcript.entries, flagged.tolist()):
+            entry.boilerplate = is_boilerplate
+        self._remember(ticker, key, signatures)
+        count = int(flagged.sum())
+        logger.info(f"Flagged {count}/{len(flagged)} boilerplate entries in {ticker} {key}")
+        return count
+
+
+def load_corpus(path: str) -> List[str]:
+    """Extra corpus paragraphs from a text file, separated by blank lines"""
+    text = Path(path).read_text(encoding="utf-8")
+    return [paragraph.strip() for paragraph in re.split(r"\n\s*\n", text) if paragraph.strip()]
+
+
+# Global instance
+_boilerplate_detector: Optional[BoilerplateDetector] = None
+
+
+def get_boilerplate_detector() -> BoilerplateDetector:
+    """Get or create the global detector from settings"""
+    global _boilerplate_detector
+    if _boilerplate_detector is None:
+        settings = get_settings()
+        corpus = list(BOILERPLATE_CORPUS)
+        if settings.boilerplate_corpus_path:
+            corpus += load_corpus(settings.boilerplate_corpus_path)
+        _boilerplate_detector = BoilerplateDetector(
+            threshold=settings.boilerplate_threshold,
+            calls_per_ticker=settings.boilerplate_calls_per_ticker,
+            corpus=corpus
+        )
+    return _boilerplate_detector
@@ -0,0 +1,337 @@
+"""
+Columnar bulk export of cached data for a ticker universe.
+
+Writes one dataset for many tickers as Parquet (one row group per batch) or an
+Arrow IPC stream, for loading into pandas, polars, DuckDB or Spark:
+- transcripts: one row per transcript entry (paragraph)
+- earnings: one row per reported quarter
+- prices: one row per trading day (daily close)
+- trends: the per-ticker trend tables (one row per quarter)
+
+Only local data is read: the response cache (the shared tier when
+CACHE_BACKEND=redis) and the trend store. Nothing is fetched upstream, so an
+export never spends Alpha Vantage quota; tickers or quarters not cached are
+skipped and counted. Tickers are read one at a time and rows are written out
+every `batch_rows`, so memory stays bounded by the batch size and the largest
+single cached value, whatever the universe size.
+
+Requires pyarrow (optional dependency).
+
+Run:
+    python -m app.services.bulk_export --tickers AAPL MSFT --datasets earnings prices --out exports/
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import date
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.cache_backend import CacheBackend, NearCache, get_cache_backend
+from app.services.trend_store import COLUMNS as TREND_COLUMNS, TrendStore, get_trend_store
+
+logger = logging.getLogger(__name__)
+
+DATASETS = ("transcripts", "earnings", "prices", "trends")
+
+# Format -> (media type, file suffix)
+FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", ".arrows"),
+}
+
+Columns = Dict[str, list]
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Bulk export requires the pyarrow package (pip install pyarrow)")
+    return pa, pq
+
+
+def schema(dataset: str):
+    """Arrow schema of a dataset"""
+    pa, _ = _pyarrow()
+    if dataset == "transcripts":
+        return pa.schema([
+            ("ticker", pa.string()),
+            ("year", pa.int16()),
+            ("quarter", pa.string()),
+            ("fiscal_date_ending", pa.date32()),
+            ("entry_index", pa.int32()),
+            ("entry_id", pa.string()),
+            ("timestamp", pa.string()),
+            ("speaker", pa.string()),
+            ("text", pa.string()),
+            ("confidence", pa.float32()),
+            ("boilerplate", pa.bool_()),
+        ])
+    if dataset == "earnings":
+        return pa.schema([
+            ("ticker", pa.string()),
+            ("year", pa.int16()),
+            ("quarter", pa.string()),
+            ("fiscal_date_ending", pa.date32()),
+            ("report_date", pa.date32()),
+            ("reported_eps", pa.float64()),
+            ("estimated_eps", pa.float64()),
+            ("surprise", pa.float64()),
+            ("surprise_percentage", pa.float64()),
+            ("status", pa.string()),
+        ])
+    if dataset == "prices":
+        return pa.schema([("ticker", pa.string()), ("date", pa.date32()), ("close", pa.float64())])
+    if dataset == "trends":
+        return pa.schema([("ticker", pa.string())] + [
+            (name, pa.date32() if np.dtype(dtype).kind == "M" else pa.from_numpy_dtype(np.dtype(dtype)))
+            for name, dtype in TREND_COLUMNS.items()
+        ])
+    raise ValueError(f"Unknown dataset {dataset!r}; expected one of {', '.join(DATASETS)}")
+
+
+def _date(value: Optional[str]) -> Optional[date]:
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class _Chunks:
+    """Write-only file object collecting the bytes a pyarrow writer emits"""
+
+    closed = False
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _open_writer(format: str, sink, schema):
+    pa, pq = _pyarrow()
+    if format == "parquet":
+        return pq.ParquetWriter(sink, schema, compression="zstd")
+    if format == "arrow":
+        return pa.ipc.new_stream(sink, schema)
+    raise ValueError(f"Unknown format {format!r}; expected one of {', '.join(FORMATS)}")
+
+
+class BulkExporter:
+    """Reads cached data ticker by ticker and writes it out in fixed-size batches"""
+
+    def __init__(self, cache: CacheBackend, trend_store: TrendStore, batch_rows: int = 50000):
+        # Read the shared tier directly: a scan would only churn the near-cache
+        self.cache = cache.shared if isinstance(cache, NearCache) else cache
+        self.trend_store = trend_store
+        self.batch_rows = max(1, batch_rows)
+        self.rows = 0
+        self.missing = 0  # Tickers or quarters with nothing cached
+
+    async def _earnings(self, ticker: str) -> list:
+        earnings = await self.cache.get(f"earnings:{ticker}")
+        if not earnings:
+            self.missing += 1
+            return []
+        return earnings
+
+    async def _read_transcripts(self, tickers: Iterable[str]) -> AsyncIterator[Columns]:
+        for ticker in tickers:
+            for call in await self._earnings(ticker):
+                transcript = await self.cache.get(f"transcript:{ticker}:{call.quarter}:{call.year}")
+                if not transcript:
+                    self.missing += 1
+                    continue
+                entries = transcript.entries
+                yield {
+                    "ticker": [ticker] * len(entries),
+                    "year": [transcript.year] * len(entries),
+                    "quarter": [transcript.quarter] * len(entries),
+                    "fiscal_date_ending": [_date(transcript.fiscal_date_ending)] * len(entries),
+                    "entry_index": list(range(len(entries))),
+                    "entry_id": [entry.id for entry in entries],
+                    "timestamp": [entry.timestamp for entry in entries],
+                    "speaker": [entry.speaker for entry in entries],
+                    "text": [entry.text for entry in entries],
+                    "confidence": [entry.confidence for entry in entries],
+                    "boilerplate": [entry.boilerplate for entry in entries],
+                }
+
+    async def _read_earnings(self, tickers: Iterable[str]) -> AsyncIterator[Columns]:
+        for ticker in tickers:
+            earnings = await self._earnings(ticker)
+            if earnings:
+                yield {
+                    "ticker": [ticker] * len(earnings),
+                    "year": [call.year for call in earnings],
+                    "quarter": [call.quarter for call in earnings],
+                    "fiscal_date_ending": [_date(call.fiscal_date_ending) for call in earnings],
+                    "report_date": [_date(call.date) for call in earnings],
+                    "reported_eps": [_float(call.reported_eps) for call in earnings],
+                    "estimated_eps": [_float(call.estimated_eps) for call in earnings],
+                    "surprise": [_float(call.surprise) for call in earnings],
+                    "surprise_percentage": [_float(call.surprise_percentage) for call in earnings],
+                    "status": [call.status for call in earnings],
+                }
+
+    async def _read_prices(self, tickers: Iterable[str]) -> AsyncIterator[Columns]:
+        for ticker in tickers:
+            series = await self.cache.get(f"price_series:{ticker}")
+            if not series or not series.dates:
+                self.missing += 1
+                continue
+            yield {
+                "ticker": [ticker] * len(series.dates),
+                "date": np.array(series.dates, dtype="datetime64[D]").tolist(),
+                "close": series.closes,
+            }
+
+    async def _read_trends(self, tickers: Iterable[str]) -> AsyncIterator[Columns]:
+        for ticker in tickers:
+            # A table not in memory is an np.load from disk
+            table = await asyncio.to_thread(self.trend_store.peek, ticker)
+            if table is None or not len(table["fiscal_date"]):
+                self.missing += 1
+                continue
+            yield {"ticker": [ticker] * len(table["fiscal_date"]), **{name: table[name].tolist() for name in TREND_COLUMNS}}
+
+    async def batches(self, dataset: str, tickers: Iterable[str]):
+        """Record batches of exactly `batch_rows` rows (the last one may be shorter)"""
+        pa, _ = _pyarrow()
+        batch_schema = schema(dataset)
+        readers = {
+            "transcripts": self._read_transcripts,
+            "earnings": self._read_earnings,
+            "prices": self._read_prices,
+            "trends": self._read_trends,
+        }
+
+        def to_batch(columns: Columns):
+            # from_pandas: NaN (missing numbers in the trend tables) becomes null
+            arrays = [pa.array(columns[field.name], type=field.type, from_pandas=True) for field in batch_schema]
+            return pa.RecordBatch.from_arrays(arrays, schema=batch_schema)
+
+        pending: Columns = {name: [] for name in batch_schema.names}
+        async for columns in readers[dataset](tickers):
+            for name in batch_schema.names:
+                pending[name].extend(columns[name])
+            while len(pending["ticker"]) >= self.batch_rows:
+                batch = to_batch({name: values[:self.batch_rows] for name, values in pending.items()})
+                pending = {name: values[self.batch_rows:] for name, values in pending.items()}
+                self.rows += batch.num_rows
+                yield batch
+        if pending["ticker"]:
+            batch = to_batch(pending)
+            self.rows += batch.num_rows
+            yield batch
+
+    async def stream(self, dataset: str, tickers: List[str], format: str = "parquet") -> AsyncIterator[bytes]:
+        """Export as response body chunks, one per batch (plus the Parquet footer)"""
+        sink = _Chunks()
+        writer = _open_writer(format, sink, schema(dataset))
+        try:
+            async for batch in self.batches(dataset, tickers):
+                await asyncio.to_thread(writer.write_batch, batch)
+                data = sink.take()
+                if data:
+                    yield data
+        finally:
+            writer.close()
+        yield sink.take()
+        logger.info(f"Exported {self.rows} {dataset} rows for {len(tickers)} tickers ({self.missing} not cached)")
+
+    async def export_file(self, dataset: str, tickers: List[str], path: Path, format: str = "parquet") -> int:
+        """Export to a file (written then renamed, so readers never see a partial file); returns rows"""
+        tmp_path = path.with_name(path.name + ".tmp")
+        writer = _open_writer(format, str(tmp_path), schema(dataset))
+        try:
+            async for batch in self.batches(dataset, tickers):
+                await asyncio.to_thread(writer.write_batch, batch)
+        finally:
+            writer.close()
+        tmp_path.replace(path)
+        logger.info(f"Exported {self.rows} {dataset} rows for {len(tickers)} tickers to {path} ({self.missing} not cached)")
+        return self.rows
+
+
+def get_bulk_exporter() -> BulkExporter:
+    """A new exporter (it keeps per-export counts) over the global cache and trend store"""
+    return BulkExporter(get_cache_backend(), get_trend_store(), get_settings().export_batch_rows)
+
+
+def parse_tickers(tickers: Iterable[str]) -> List[str]:
+    """Upper-cased tickers from comma- or space-separated values, deduplicated in order"""
+    parsed = []
+    for value in tickers:
+        for ticker in value.replace(",", " ").split():
+            if ticker.upper() not in parsed:
+                parsed.append(ticker.upper())
+    return parsed
+
+
+async def export(tickers: List[str], datasets: List[str], out: str, format: str):
+    out_dir = Path(out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        for dataset in datasets:
+            exporter = get_bulk_exporter()
+            path = out_dir / f"{dataset}{FORMATS[format][1]}"
+            rows = await exporter.export_file(dataset, tickers, path, format)
+            print(f"{path}: {rows} rows ({exporter.missing} not cached)")
+    finally:
+        from app.services.cache_backend import close_cache_backend
+        await close_cache_backend()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export cached transcripts, earnings, prices and trends")
+    parser.add_argument("--tickers", nargs="*", default=[], help="Tickers (space- or comma-separated)")
+    parser.add_argument("--tickers-file", help="File with one ticker per line (or comma-separated)")
+    parser.add_argument("--datasets", nargs="+", default=list(DATASETS), choices=DATASETS)
+    parser.add_argument("--format", default="parquet", choices=list(FORMATS))
+    parser.add_argument("--out", default="exports", help="Output directory (one file per dataset)")
+    args = parser.parse_args(argv)
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        tickers.extend(Path(args.tickers_file).read_text().splitlines())
+    tickers = parse_tickers(tickers)
+    if not tickers:
+        parser.error("no tickers given (--tickers or --tickers-file)")
+    settings = get_settings()
+    if settings.cache_backend == "memory" and any(d != "trends" for d in args.datasets):
+        print("Warning: CACHE_BACKEND=memory has no data outside the server process; "
+              "only trends (TREND_STORE_DIR) can be exported from here", file=sys.stderr)
+    asyncio.run(export(tickers, args.datasets, args.out, args.format))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
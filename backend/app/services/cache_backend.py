@@ -0,0 +1,320 @@
+"""
+Pluggable cache for upstream responses (Alpha Vantage models and raw JSON).
+
+Values are API models, internal records (app.models.records) or plain JSON data.
+
+Backends:
+- InMemoryCache: per-process LRU with expiry; values are kept as objects.
+- RedisCache: shared by every replica through any Redis-protocol server;
+  values are stored in a compact binary envelope (see `encode`).
+- NearCache: a small, short-lived InMemoryCache in front of a shared tier, so
+  hot keys are served without a network round trip while replicas still
+  share misses. Staleness across replicas is bounded by the near-cache TTL.
+
+CACHE_BACKEND=memory (default) or redis selects the backend; see get_cache_backend().
+A local stand-in server for development and tests is in app.services.mock_redis.
+"""
+
+import json
+import logging
+import struct
+import time
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+
+from app.config import get_settings
+from app.models.company import (
+    CompanyOverview,
+    CompanySearchResult,
+    EarningsCalendarItem,
+    EarningsCall,
+    FinancialData,
+    QuarterFinancials
+)
+from app.models.records import (
+    EarningsRecord,
+    PriceSeriesRecord,
+    Record,
+    SearchResultRecord,
+    TranscriptRecord
+)
+from app.models.transcript import TranscriptData
+from app.services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+TIER_LOOKUPS = REGISTRY.counter(
+    "cache_tier_lookups_total",
+    "Cache lookups by tier (near/shared) and result (hit/miss)",
+    ["tier", "result"]
+)
+BACKEND_ERRORS = REGISTRY.counter(
+    "cache_backend_errors_total",
+    "Shared cache operations that failed and were treated as misses",
+    ["operation"]
+)
+
+# Envelope: version, model code, flags; then the (optionally zlib-compressed) JSON payload
+FORMAT_VERSION = 1
+HEADER = struct.Struct(">BBB")
+FLAG_LIST = 0x01
+FLAG_COMPRESSED = 0x02
+COMPRESS_MIN_BYTES = 512
+
+# Codes are part of the stored format and shared by models and records:
+# append new ones, never renumber
+MODEL_CODES = {
+    1: CompanySearchResult,
+    2: CompanyOverview,
+    3: EarningsCall,
+    4: EarningsCalendarItem,
+    5: TranscriptData,
+    6: FinancialData,
+    11: QuarterFinancials,
+}
+_CODE_BY_MODEL = {model: code for code, model in MODEL_CODES.items()}
+# Records are stored as rows (values without field names)
+RECORD_CODES = {
+    7: SearchResultRecord,
+    8: EarningsRecord,
+    9: TranscriptRecord,
+    10: PriceSeriesRecord,
+}
+_CODE_BY_RECORD = {record: code for code, record in RECORD_CODES.items()}
+
+
+@lru_cache(maxsize=None)
+def _adapter(code: int, is_list: bool) -> TypeAdapter:
+    model = MODEL_CODES[code]
+    return TypeAdapter(List[model] if is_list else model)
+
+
+def encode(value: Any) -> bytes:
+    """
+    Serialize a cached value: a registered model or record, a list of one
+    registered type, or plain JSON data (code 0). Models are dumped by
+    pydantic-core, records as rows, and payloads over COMPRESS_MIN_BYTES are
+    deflated, so a transcript or a full daily price history takes a fraction of
+    its JSON size.
+    """
+    is_list = isinstance(value, list)
+    sample = value[0] if is_list and value else value
+    if isinstance(sample, Record):
+        code = _CODE_BY_RECORD[type(sample)]
+        rows = [item.to_row() for item in value] if is_list else value.to_row()
+        payload = orjson.dumps(rows)
+    elif isinstance(sample, BaseModel) and type(sample) in _CODE_BY_MODEL:
+        code = _CODE_BY_MODEL[type(sample)]
+        payload = _adapter(code, is_list).dump_json(value)
+    else:
+        code = 0
+        payload = json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    flags = FLAG_LIST if is_list else 0
+    if len(payload) >= COMPRESS_MIN_BYTES:
+        payload = zlib.compress(payload, 1)
+        flags |= FLAG_COMPRESSED
+    return HEADER.pack(FORMAT_VERSION, code, flags) + payload
+
+
+def decode(data: bytes) -> Any:
+    """Inverse of encode(); raises ValueError on an unknown format"""
+    if len(data) < HEADER.size:
+        raise ValueError("Truncated cache entry")
+    version, code, flags = HEADER.unpack_from(data)
+    if version != FORMAT_VERSION or (code and code not in MODEL_CODES and code not in RECORD_CODES):
+        raise ValueError(f"Unsupported cache entry format {version}/{code}")
+    payload = data[HEADER.size:]
+    if flags & FLAG_COMPRESSED:
+        payload = zlib.decompress(payload)
+    if code in RECORD_CODES:
+        record = RECORD_CODES[code]
+        rows = orjson.loads(payload)
+        return [record.from_row(row) for row in rows] if flags & FLAG_LIST else record.from_row(rows)
+    if code:
+        return _adapter(code, bool(flags & FLAG_LIST)).validate_json(payload)
+    return json.loads(payload)
+
+
+class CacheBackend:
+    """Async key-value cache with per-entry TTL; misses return None"""
+
+    name = "base"
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: float):
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class InMemoryCache(CacheBackend):
+    """Per-process LRU; stores the objects themselves (no serialization)"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+
+    def get_local(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set_local(self, key: str, value: Any, ttl: float):
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.get_local(key)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self.set_local(key, value, ttl)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """
+    Shared tier on a Redis-protocol server. Connection or decode failures are
+    logged and count as misses, so an unavailable cache slows requests down
+    instead of failing them.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "earningsinsight:", timeout: float = 1.0):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package (pip install redis)")
+        self.prefix = prefix
+        self.client = redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            data = await self.client.get(self.prefix + key)
+        except Exception as e:
+            BACKEND_ERRORS.labels("get").inc()
+            logger.warning(f"Shared cache get failed for {key}: {e}")
+            return None
+        if data is None:
+            return None
+        try:
+            return decode(data)
+        except Exception as e:
+            BACKEND_ERRORS.labels("decode").inc()
+            logger.warning(f"Ignoring undecodable shared cache entry {key}: {e}")
+            return None
+
+    async def set(self, key: str, value: Any, ttl: float):
+        try:
+            await self.client.set(self.prefix + key, encode(value), px=max(1, int(ttl * 1000)))
+        except Exception as e:
+            BACKEND_ERRORS.labels("set").inc()
+            logger.warning(f"Shared cache set failed for {key}: {e}")
+
+    async def delete(self, key: str):
+        try:
+            await self.client.delete(self.prefix + key)
+        except Exception as e:
+            BACKEND_ERRORS.labels("delete").inc()
+            logger.warning(f"Shared cache delete failed for {key}: {e}")
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class NearCache(CacheBackend):
+    """In-process tier (short TTL) in front of a shared backend"""
+
+    def __init__(self, shared: CacheBackend, ttl: float = 30.0, max_entries: int = 1024):
+        self.shared = shared
+        self.ttl = ttl
+        self.near = InMemoryCache(max_entries)
+        self.name = f"near+{shared.name}"
+        self._near_hit = TIER_LOOKUPS.labels("near", "hit")
+        self._near_miss = TIER_LOOKUPS.labels("near", "miss")
+        self._shared_hit = TIER_LOOKUPS.labels("shared", "hit")
+        self._shared_miss = TIER_LOOKUPS.labels("shared", "miss")
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.near.get_local(key)
+        if value is not None:
+            self._near_hit.inc()
+            return value
+        self._near_miss.inc()
+        value = await self.shared.get(key)
+        if value is None:
+            self._shared_miss.inc()
+            return None
+        self._shared_hit.inc()
+        self.near.set_local(key, value, self.ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self.near.set_local(key, value, min(ttl, self.ttl))
+        await self.shared.set(key, value, ttl)
+
+    async def delete(self, key: str):
+        await self.near.delete(key)
+        await self.shared.delete(key)
+
+    async def close(self):
+        await self.shared.close()
+
+
+# Global instance, shared by every AlphaVantageService in the process
+_cache_backend: Optional[CacheBackend] = None
+
+
+def get_cache_backend() -> CacheBackend:
+    """Get or create the global cache backend from settings"""
+    global _cache_backend
+    if _cache_backend is None:
+        settings = get_settings()
+        if settings.cache_backend == "memory":
+            _cache_backend = InMemoryCache(settings.cache_max_entries)
+        elif settings.cache_backend == "redis":
+            _cache_backend = RedisCache(settings.redis_url, prefix=settings.cache_key_prefix)
+            if settings.near_cache_ttl_seconds > 0:
+                _cache_backend = NearCache(
+                    _cache_backend,
+                    ttl=settings.near_cache_ttl_seconds,
+                    max_entries=settings.near_cache_max_entries
+                )
+        else:
+            raise ValueError(f"CACHE_BACKEND must be memory or redis, not {settings.cache_backend!r}")
+        logger.info(f"Using {_cache_backend.name} cache backend")
+    return _cache_backend
+
+
+async def close_cache_backend():
+    global _cache_backend
+    if _cache_backend is not None:
+        await _cache_backend.close()
+        _cache_backend = None
@@ -0,0 +1,152 @@
+"""
+Per-session adaptive recording chunk duration for live transcription.
+
+A live client records audio in chunks and sends each when it ends, so the
+first words of a chunk reach the transcript after roughly
+
+    chunk duration + queue wait + inference time
+
+Shorter chunks cut that latency, but every Whisper call has a fixed overhead
+(model setup, padding to 30 s windows), so the share of time spent on overhead
+grows as chunks shrink. Once inference plus queue wait take longer than the
+audio they transcribe, the session falls behind and latency grows without
+bound.
+
+ChunkDurationController fits the session's inference time as
+`overhead + rtf * duration` (recent chunks weigh more) and tracks its
+queue wait, then picks:
+- the longest duration whose expected latency meets the target, so an idle
+  server gets short chunks;
+- but never shorter than the session can sustain (inference + wait within
+  MAX_UTILIZATION of the chunk), so an overloaded server gets longer chunks
+  that amortize the per-call overhead.
+
+Changes are limited per step and need a few chunks of evidence, and they are
+rounded, so the client is not told to change on every chunk.
+"""
+
+import logging
+from typing import Optional
+
+from app.services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+DURATION_CHANGES = REGISTRY.counter(
+    "transcription_chunk_duration_changes_total",
+    "Chunk duration changes sent to live transcription clients",
+    ["direction"]
+)
+
+# Share of real time a session may spend waiting and transcribing
+MAX_UTILIZATION = 0.8
+# Weight of older chunks in the inference fit and the queue wait average
+DECAY = 0.8
+# Chunks observed before the first change, and between changes
+MIN_CHUNKS = 3
+# Largest change per step, as a factor of the current duration
+MAX_STEP = 1.5
+# Smallest change worth sending, as a share of the current duration
+MIN_CHANGE = 0.1
+ROUND_MS = 250
+
+
+class ChunkDurationController:
+    """Chooses one session's chunk duration from its observed latencies"""
+
+    def __init__(
+        self,
+        initial_ms: int = 3000,
+        min_ms: int = 1000,
+        max_ms: int = 10000,
+        latency_target_ms: int = 2500
+    ):
+        self.min_ms = min_ms
+        self.max_ms = max(min_ms, max_ms)
+        self.duration_ms = self._clamp(initial_ms)
+        self.latency_target = latency_target_ms / 1000
+        self.queue_wait = 0.0
+        self._since_change = 0
+        # Exponentially weighted sums for the inference fit
+        self._weight = 0.0
+        self._sum_d = 0.0
+        self._sum_i = 0.0
+        self._sum_dd = 0.0
+        self._sum_di = 0.0
+
+    def _clamp(self, duration_ms: float) -> int:
+        rounded = int(round(duration_ms / ROUND_MS) * ROUND_MS)
+        return max(self.min_ms, min(self.max_ms, rounded))
+
+    def inference_model(self) -> tuple:
+        """(overhead seconds, real-time factor) fitted to recent chunks"""
+        if self._weight == 0:
+            return 0.0, 0.0
+        mean_d = self._sum_d / self._weight
+        mean_i = self._sum_i / self._weight
+        variance = self._sum_dd / self._weight - mean_d ** 2
+        # The overhead is only identifiable once durations have varied; until
+        # then attribute everything to the real-time factor
+        if mean_d > 0 and variance > (0.05 * mean_d) ** 2:
+            rtf = (self._sum_di / self._weight - mean_d * mean_i) / variance
+            if rtf > 0:
+                overhead = mean_i - rtf * mean_d
+                if overhead >= 0:
+                    return overhead, rtf
+        return 0.0, mean_i / mean_d if mean_d > 0 else 0.0
+
+    def expected_latency(self, duration_seconds: float) -> float:
+        """Seconds from the start of a chunk of this duration to its segments"""
+        overhead, rtf = self.inference_model()
+        return duration_seconds + self.queue_wait + overhead + rtf * duration_seconds
+
+    def observe(self, audio_seconds: float, queue_wait: float, inference_seconds: float) -> Optional[int]:
+        """
+        Record one transcribed chunk; returns the new duration in ms when the
+        client should change it, else None
+        """
+        if audio_seconds <= 0:
+            return None
+        self._weight = DECAY * self._weight + 1
+        self._sum_d = DECAY * self._sum_d + audio_seconds
+        self._sum_i = DECAY * self._sum_i + inference_seconds
+        self._sum_dd = DECAY * self._sum_dd + audio_seconds ** 2
+        self._sum_di = DECAY * self._sum_di + audio_seconds * inference_seconds
+        first = self._weight == 1
+        self.queue_wait = queue_wait if first else DECAY * self.queue_wait + (1 - DECAY) * queue_wait
+        self._since_change += 1
+        if self._since_change < MIN_CHUNKS:
+            return None
+
+        overhead, rtf = self.inference_model()
+        # Longest chunk meeting the latency target
+        within_target = (self.latency_target - self.queue_wait - overhead) / (1 + rtf)
+        # Shortest chunk the session keeps up with
+        if rtf < MAX_UTILIZATION:
+            sustainable = (self.queue_wait + overhead) / (MAX_UTILIZATION - rtf)
+        else:
+            sustainable = float("inf")
+        target_ms = max(within_target, sustainable) * 1000
+
+        current = self.duration_ms
+        target_ms = min(max(target_ms, current / MAX_STEP), current * MAX_STEP)
+        new_ms = self._clamp(target_ms)
+        if abs(new_ms - current) < max(ROUND_MS, MIN_CHANGE * current):
+            return None
+
+        self.duration_ms = new_ms
+        self._since_change = 0
+        DURATION_CHANGES.labels("up" if new_ms > current else "down").inc()
+        logger.info(
+            f"Chunk duration {current}ms -> {new_ms}ms (overhead {overhead * 1000:.0f}ms, "
+            f"RTF {rtf:.2f}, queue wait {self.queue_wait * 1000:.0f}ms)"
+        )
+        return new_ms
+
+    def control_message(self) -> dict:
+        """JSON message telling the client its chunk duration"""
+        return {
+            "type": "control",
+            "chunk_duration_ms": self.duration_ms,
+            "expected_latency_ms": round(self.expected_latency(self.duration_ms / 1000) * 1000)
+        }
@@ -0,0 +1,319 @@
+"""
+Vectorized finance-lexicon sentiment scoring for transcripts.
+
+Loughran-McDonald style: words are looked up in positive / negative / uncertainty
+lists, and a positive word preceded by a negation within three words counts as
+negative. Each transcript is tokenized once into an integer array; everything
+after that (negation windows, per-entry counts, time buckets, category weights)
+is NumPy array arithmetic, so thousands of transcripts score in minutes.
+
+The built-in word lists are a compact subset. For the full Loughran-McDonald
+Master Dictionary, point LEXICON_PATH at its CSV (columns Word, Negative,
+Positive, Uncertainty; a non-zero value marks membership).
+"""
+
+import csv
+import logging
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.config import get_settings
+from app.models.analysis import AnalysisCategory, SentimentDataPoint
+from app.models.records import TranscriptEntryRecord, TranscriptRecord
+from app.services.live_analysis import (
+    AnalyzerBackend,
+    CategorySignal,
+    KeywordAnalyzer,
+    SegmentAnalysis
+)
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+POSITIVE_WORDS = """
+achieve achieved achievement advance advances advancing advantage advantages attractive
+beat beneficial benefit benefited benefits best better boost boosted breakthrough
+confident creative delight delighted despite efficiency efficient enable enhance enhanced
+enhancement enjoy excellent exceed exceeded exceeding exceptional excited exciting favorable
+gain gained gains good great greater greatest grow growing growth highest improve improved
+improvement improvements improving increase increased innovation innovative leadership
+momentum opportunities opportunity optimistic outperform outperformed positive profitable
+progress progressing record robust solid strength strengthen strengths strong stronger
+strongest succeed success successful superior surpass surpassed tremendous upturn win winning
+""".split()
+
+NEGATIVE_WORDS = """
+adverse adversely against bad challenge challenged challenges challenging closure concern
+concerns critical cut cuts damage decline declined declines declining decrease decreased
+decreases deficit delay delayed delays deteriorate deteriorated deteriorating deterioration
+difficult difficulties difficulty disappoint disappointed disappointing disruption
+disruptions downturn drop dropped failure fell headwind headwinds impairment impairments
+inability ineffective lawsuit layoffs litigation lose losing loss losses lower miss missed
+negative negatively obstacle penalty poor problem problems recession restructuring shortage
+shortfall slow slowdown slowed slower slowing soft softer softness terminate turmoil
+unable unfavorable unfortunately volatile volatility weak weaken weakened weaker weakness worse
+""".split()
+
+UNCERTAINTY_WORDS = """
+almost anticipate appear appears approximately assume assumption believe believes cautious
+could depend depends doubt estimate estimated expect fluctuate fluctuation indefinite
+likely may maybe might possible possibly predict preliminary probably risk risks roughly
+seem somewhat suggest tentative uncertain uncertainties uncertainty unclear unknown
+unpredictable variable volatility
+""".split()
+
+NEGATIONS = ["not", "no", "never", "none", "neither", "nor", "nobody", "without",
+             "isn't", "wasn't", "aren't", "weren't", "don't", "doesn't", "didn't", "cannot", "can't"]
+
+NEGATION_WINDOW = 3
+
+CATEGORIES = list(AnalysisCategory)
+
+
+def _category_keywords() -> Dict[AnalysisCategory, List[str]]:
+    """Single-word category keywords shared with the live KeywordAnalyzer"""
+    return {
+        category: [keyword for keyword in keywords if " " not in keyword]
+        for category, keywords in KeywordAnalyzer.CATEGORY_KEYWORDS.items()
+    }
+
+
+def parse_timestamp(timestamp: str) -> int:
+    """'mm:ss' or 'hh:mm:ss' to seconds (minutes may exceed 59)"""
+    seconds = 0
+    for part in timestamp.split(":"):
+        seconds = seconds * 60 + int(part or 0)
+    return seconds
+
+
+class Lexicon:
+    """
+    Word lists compiled to lookup arrays indexed by token id. Id 0 is every word
+    outside the lexicon, so unknown tokens cost one dict miss and nothing else.
+    """
+
+    def __init__(
+        self,
+        positive: Sequence[str] = POSITIVE_WORDS,
+        negative: Sequence[str] = NEGATIVE_WORDS,
+        uncertainty: Sequence[str] = UNCERTAINTY_WORDS
+    ):
+        categories = _category_keywords()
+        words = sorted(set(positive) | set(negative) | set(uncertainty) | set(NEGATIONS)
+                       | {w for keywords in categories.values() for w in keywords})
+        self.vocab: Dict[str, int] = {word: i + 1 for i, word in enumerate(words)}
+        size = len(words) + 1
+
+        self.positive = np.zeros(size, dtype=bool)
+        self.negative = np.zeros(size, dtype=bool)
+        self.uncertainty = np.zeros(size, dtype=bool)
+        self.negation = np.zeros(size, dtype=bool)
+        self.positive[[self.vocab[w] for w in positive]] = True
+        self.negative[[self.vocab[w] for w in negative]] = True
+        self.uncertainty[[self.vocab[w] for w in uncertainty]] = True
+        self.negation[[self.vocab[w] for w in NEGATIONS]] = True
+        # Token id -> category membership matrix
+        self.category = np.zeros((size, len(CATEGORIES)), dtype=np.float32)
+        for column, category in enumerate(CATEGORIES):
+            self.category[[self.vocab[w] for w in categories.get(category, [])], column] = 1.0
+
+    @classmethod
+    def from_csv(cls, path: str) -> "Lexicon":
+        """
+        Load the Loughran-McDonald Master Dictionary CSV. A category column holds
+        the year the word was added, 0 if it is not in the category, or the
+        negated year if it was removed again.
+        """
+        def member(value: Optional[str]) -> bool:
+            try:
+                return int(value) > 0
+            except (TypeError, ValueError):
+                return False
+
+        positive, negative, uncertainty = [], [], []
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                word = row["Word"].lower()
+                if member(row.get("Positive")):
+                    positive.append(word)
+                if member(row.get("Negative")):
+                    negative.append(word)
+                if member(row.get("Uncertainty")):
+                    uncertainty.append(word)
+        return cls(positive, negative, uncertainty)
+
+    def tokenize(self, texts: Sequence[str]) -> tuple:
+        """
+        Tokenize texts once into (token ids, text index per token). This is the
+        only per-token Python work; scoring is array arithmetic on the result.
+        """
+        vocab_get = self.vocab.get
+        ids: List[int] = []
+        lengths = np.empty(len(texts), dtype=np.int64)
+        for i, text in enumerate(texts):
+            tokens = TOKEN_PATTERN.findall(text.lower())
+            ids.extend(vocab_get(token, 0) for token in tokens)
+            lengths[i] = len(tokens)
+        return np.array(ids, dtype=np.int32), np.repeat(np.arange(len(texts)), lengths), lengths
+
+    def score_texts(self, texts: Sequence[str]) -> dict:
+        """
+        Score many texts at once.
+
+        Returns arrays (one value per text): positive, negative, uncertainty,
+        token counts, sentiment in (-1, 1), and category relevance counts (texts x 6).
+        """
+        ids, owner, lengths = self.tokenize(texts)
+        n = len(texts)
+        if len(ids) == 0:
+            zeros = np.zeros(n)
+            return {"positive": zeros, "negative": zeros, "uncertainty": zeros, "tokens": lengths,
+                    "sentiment": zeros, "categories": np.zeros((n, len(CATEGORIES)))}
+
+        # Negations in the previous NEGATION_WINDOW tokens of the same text,
+        # via a prefix sum: count(i-w..i-1) = cum[i] - cum[max(i-w, text_start)]
+        negation_cum = np.concatenate(([0], np.cumsum(self.negation[ids])))
+        position = np.arange(len(ids))
+        text_start = np.concatenate(([0], np.cumsum(lengths)[:-1]))[owner]
+        window_start = np.maximum(position - NEGATION_WINDOW, text_start)
+        negated = (negation_cum[position] - negation_cum[window_start]) > 0
+
+        is_positive = self.positive[ids]
+        flipped = is_positive & negated
+        positive = np.bincount(owner, weights=is_positive & ~flipped, minlength=n)
+        negative = np.bincount(owner, weights=self.negative[ids] | flipped, minlength=n)
+        uncertainty = np.bincount(owner, weights=self.uncertainty[ids], minlength=n)
+
+        categories = np.zeros((n, len(CATEGORIES)))
+        np.add.at(categories, owner, self.category[ids])
+
+        return {
+            "positive": positive,
+            "negative": negative,
+            "uncertainty": uncertainty,
+            "tokens": lengths,
+            # +1 smoothing keeps single-word texts from scoring a full +/-1
+            "sentiment": (positive - negative) / (positive + negative + 1),
+            "categories": categories
+        }
+
+    def sentiment_series(
+        self,
+        entries: Sequence[TranscriptEntryRecord],
+        bucket_seconds: int = 60
+    ) -> List[SentimentDataPoint]:
+        """
+        Sentiment time series for one transcript, one point per bucket of call time.
+        Category sentiment weights each entry by how many category keywords it has.
+        Entries flagged as boilerplate are skipped.
+        """
+        entries = [entry for entry in entries if not entry.boilerplate]
+        return self._series(
+            [parse_timestamp(entry.timestamp) for entry in entries],
+            [entry.text for entry in entries],
+            bucket_seconds
+        )
+
+    def transcript_sentiment(self, entries: Sequence[TranscriptEntryRecord]) -> Optional[SentimentDataPoint]:
+        """Sentiment of a whole transcript as a single data point (timestamp 0)"""
+        entries = [entry for entry in entries if not entry.boilerplate]
+        series = self._series([0] * len(entries), [entry.text for entry in entries], 1)
+        return series[0] if series else None
+
+    def _series(self, timestamps: Sequence[int], texts: Sequence[str], bucket_seconds: int) -> List[SentimentDataPoint]:
+        if not texts:
+            return []
+        scores = self.score_texts(texts)
+        times = np.asarray(timestamps)
+        bucket = times // bucket_seconds
+        buckets, bucket_index = np.unique(bucket, return_inverse=True)
+
+        # Overall: opinion-word weighted, so entries without sentiment words don't dilute
+        opinion = scores["positive"] + scores["negative"]
+        net = scores["positive"] - scores["negative"]
+        overall = np.bincount(bucket_index, weights=net, minlength=len(buckets)) / (
+            np.bincount(bucket_index, weights=opinion, minlength=len(buckets)) + 1
+        )
+
+        weights = scores["categories"]
+        category_sum = np.zeros((len(buckets), len(CATEGORIES)))
+        category_weight = np.zeros((len(buckets), len(CATEGORIES)))
+        np.add.at(category_sum, bucket_index, weights * scores["sentiment"][:, None])
+        np.add.at(category_weight, bucket_index, weights)
+        category = np.divide(category_sum, category_weight,
+                             out=np.zeros_like(category_sum), where=category_weight > 0)
+
+        return [
+            SentimentDataPoint(
+                timestamp=int(b * bucket_seconds),
+                overall_sentiment=round(float(overall[i]), 3),
+                category_sentiments={
+                    c.value: round(float(category[i, j]), 3) for j, c in enumerate(CATEGORIES)
+                }
+            )
+            for i, b in enumerate(buckets)
+        ]
+
+
+class LexiconAnalyzer(AnalyzerBackend):
+    """Live analysis backend that scores each batch of segments with the lexicon"""
+
+    def __init__(self, lexicon: Optional[Lexicon] = None, min_keywords: int = 1):
+        self.lexicon = lexicon or get_lexicon()
+        self.min_keywords = min_keywords
+
+    async def analyze(self, segments: List[dict]) -> List[SegmentAnalysis]:
+        scores = self.lexicon.score_texts([segment["text"] for segment in segments])
+        results = []
+        for i in range(len(segments)):
+            sentiment = float(scores["sentiment"][i])
+            signals = [
+                CategorySignal(category, min(1.0, float(count) / 2), sentiment)
+                for category, count in zip(CATEGORIES, scores["categories"][i])
+                if count >= self.min_keywords
+            ]
+            results.append(SegmentAnalysis(sentiment, signals))
+        return results
+
+
+# Global instance
+_lexicon: Optional[Lexicon] = None
+
+
+def get_lexicon() -> Lexicon:
+    """Get the lexicon, loading LEXICON_PATH if configured"""
+    global _lexicon
+    if _lexicon is None:
+        path = get_settings().lexicon_path
+        _lexicon = Lexicon.from_csv(path) if path else Lexicon()
+    return _lexicon
+
+
+def _score_batch(batch: List[tuple], bucket_seconds: int) -> List[List[SentimentDataPoint]]:
+    lexicon = get_lexicon()
+    return [lexicon._series(timestamps, texts, bucket_seconds) for timestamps, texts in batch]
+
+
+def score_transcripts(
+    transcripts: Sequence[TranscriptRecord],
+    bucket_seconds: int = 60,
+    workers: int = 1,
+    batch_size: int = 200
+) -> List[List[SentimentDataPoint]]:
+    """Sentiment series for many transcripts, optionally across worker processes"""
+    # Workers get plain (timestamps, texts) tuples; pickling whole transcripts costs more than scoring
+    plain = [
+        ([parse_timestamp(e.timestamp) for e in entries], [e.text for e in entries])
+        for entries in ([e for e in t.entries if not e.boilerplate] for t in transcripts)
+    ]
+    batches = [plain[i:i + batch_size] for i in range(0, len(plain), batch_size)]
+    if workers <= 1:
+        results = [_score_batch(batch, bucket_seconds) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_score_batch, batches, [bucket_seconds] * len(batches)))
+    return [series for batch in results for series in batch]
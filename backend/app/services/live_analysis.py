@@ -0,0 +1,297 @@
+"""Incremental analysis of live transcription segments into insights and sentiment."""
+
+import importlib
+import logging
+import re
+import time
+import uuid
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+from app.models.analysis import (
+    AnalysisCategory,
+    CategoryInsight,
+    Insight,
+    SentimentDataPoint,
+    WSMessage
+)
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_ICONS = {
+    AnalysisCategory.KEY_STATEMENTS: "quote",
+    AnalysisCategory.FINANCIAL_PERFORMANCE: "trending-up",
+    AnalysisCategory.FORWARD_GUIDANCE: "compass",
+    AnalysisCategory.MARKET_POSITION: "target",
+    AnalysisCategory.RISK_FACTORS: "alert-triangle",
+    AnalysisCategory.ANALYST_QA: "message-circle",
+}
+
+
+class CategorySignal(NamedTuple):
+    """How strongly a segment relates to a category, and its tone there"""
+    category: AnalysisCategory
+    relevance: float  # 0.0 to 1.0
+    sentiment: float  # -1.0 to +1.0
+
+
+class SegmentAnalysis(NamedTuple):
+    """Analyzer output for one segment"""
+    sentiment: float  # -1.0 to +1.0
+    signals: List[CategorySignal]
+
+
+class AnalyzerBackend:
+    """
+    Scores transcription segments. Backends only see the new segments; the engine
+    keeps all running state, so analysis cost is linear in transcript length.
+    """
+
+    async def analyze(self, segments: List[dict]) -> List[SegmentAnalysis]:
+        """Return one SegmentAnalysis per segment, in order"""
+        raise NotImplementedError
+
+
+class KeywordAnalyzer(AnalyzerBackend):
+    """
+    Deterministic keyword analyzer. Cheap enough to run on every live segment
+    and fully reproducible, so it also serves as the stand-in backend in tests.
+    """
+
+    CATEGORY_KEYWORDS = {
+        AnalysisCategory.FINANCIAL_PERFORMANCE: [
+            "revenue", "sales", "margin", "margins", "earnings", "eps", "profit", "income",
+            "cash flow", "billion", "million", "percent", "year over year", "quarter"
+        ],
+        AnalysisCategory.FORWARD_GUIDANCE: [
+            "guidance", "outlook", "expect", "expects", "forecast", "anticipate", "next quarter",
+            "full year", "fiscal year", "going forward", "target", "plan to"
+        ],
+        AnalysisCategory.MARKET_POSITION: [
+            "market share", "competitor", "competitors", "competition", "customers", "demand",
+            "leadership", "pricing", "product", "products", "platform", "share gains"
+        ],
+        AnalysisCategory.RISK_FACTORS: [
+            "risk", "risks", "headwind", "headwinds", "uncertainty", "pressure", "decline",
+            "challenge", "challenges", "supply chain", "inflation", "regulatory", "macro"
+        ],
+        AnalysisCategory.ANALYST_QA: [
+            "question", "questions", "analyst", "operator", "next caller", "your line",
+            "taking my question", "follow up"
+        ],
+        AnalysisCategory.KEY_STATEMENTS: [
+            "record", "milestone", "announce", "announcing", "proud", "significant",
+            "strongest", "historic", "first time"
+        ],
+    }
+
+    POSITIVE = {
+        "growth", "grew", "strong", "stronger", "strongest", "record", "increase", "increased",
+        "improve", "improved", "improvement", "exceeded", "beat", "momentum", "confident",
+        "robust", "expand", "expanded", "gains", "positive", "healthy", "outperform", "raise", "raised"
+    }
+    NEGATIVE = {
+        "decline", "declined", "decrease", "decreased", "weak", "weaker", "loss", "losses",
+        "headwind", "headwinds", "challenge", "challenging", "pressure", "miss", "missed",
+        "uncertain", "uncertainty", "risk", "slowdown", "soft", "negative", "lower", "cut", "down"
+    }
+    NEGATIONS = {"not", "no", "never", "without", "didn't", "don't", "isn't", "wasn't", "aren't"}
+
+    def __init__(self):
+        self._patterns = {
+            category: [re.compile(rf"\b{re.escape(keyword)}\b") for keyword in keywords]
+            for category, keywords in self.CATEGORY_KEYWORDS.items()
+        }
+
+    def score(self, text: str) -> SegmentAnalysis:
+        lowered = text.lower()
+        tokens = re.findall(r"[a-z']+", lowered)
+
+        score = 0
+        for i, token in enumerate(tokens):
+            polarity = (token in self.POSITIVE) - (token in self.NEGATIVE)
+            if polarity and self.NEGATIONS.intersection(tokens[max(0, i - 3):i]):
+                polarity = -polarity
+            score += polarity
+        sentiment = max(-1.0, min(1.0, score / 3))
+
+        signals = []
+        for category, patterns in self._patterns.items():
+            hits = sum(1 for pattern in patterns if pattern.search(lowered))
+            if hits:
+                signals.append(CategorySignal(category, min(1.0, hits / 2), sentiment))
+        return SegmentAnalysis(sentiment, signals)
+
+    async def analyze(self, segments: List[dict]) -> List[SegmentAnalysis]:
+        return [self.score(segment["text"]) for segment in segments]
+
+
+# Backends by name, as "module:Class" so heavier ones are only imported when selected
+ANALYZER_BACKENDS: Dict[str, str] = {
+    "keyword": "app.services.live_analysis:KeywordAnalyzer",
+    "lexicon": "app.services.lexicon_sentiment:LexiconAnalyzer",
+}
+
+
+def get_analyzer(name: str) -> AnalyzerBackend:
+    """Create an analyzer backend by name"""
+    if name not in ANALYZER_BACKENDS:
+        raise ValueError(f"Unknown analyzer backend: {name} (available: {', '.join(ANALYZER_BACKENDS)})")
+    module_name, class_name = ANALYZER_BACKENDS[name].split(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def _format_timestamp(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+
+class _CategoryState:
+    """Running totals for one category"""
+
+    def __init__(self, category: AnalysisCategory):
+        self.category = category
+        self.id = str(uuid.uuid4())
+        self.weighted_sentiment = 0.0
+        self.weight = 0.0
+        self.insights: List[Insight] = []
+
+    @property
+    def sentiment(self) -> float:
+        return self.weighted_sentiment / self.weight if self.weight else 0.0
+
+    def to_model(self) -> CategoryInsight:
+        return CategoryInsight(
+            id=self.id,
+            category=self.category,
+            sentiment=round(self.sentiment, 3),
+            insights=self.insights,
+            icon=CATEGORY_ICONS[self.category]
+        )
+
+
+class LiveAnalysisEngine:
+    """
+    Consumes segments as they arrive and keeps per-category insights and a rolling
+    sentiment series up to date using only the new text.
+
+    Category sentiment is a relevance-weighted running mean over the whole call.
+    The sentiment series is a mean over the last `window_seconds`, maintained with
+    running sums so each segment costs O(1) regardless of call length; a point is
+    emitted every `sentiment_interval` seconds of call time.
+    """
+
+    def __init__(
+        self,
+        analyzer: Optional[AnalyzerBackend] = None,
+        window_seconds: float = 60.0,
+        sentiment_interval: float = 10.0,
+        min_relevance: float = 0.5,
+        max_insights_per_category: int = 25
+    ):
+        self.analyzer = analyzer or KeywordAnalyzer()
+        self.window_seconds = window_seconds
+        self.sentiment_interval = sentiment_interval
+        self.min_relevance = min_relevance
+        self.max_insights_per_category = max_insights_per_category
+
+        self.categories = {category: _CategoryState(category) for category in AnalysisCategory}
+        self.sentiment_series: List[SentimentDataPoint] = []
+        # (end time, overall sentiment, {category: (weighted sentiment, weight)})
+        self._window: Deque[tuple] = deque()
+        self._window_sum = 0.0
+        self._window_category: Dict[AnalysisCategory, List[float]] = {
+            category: [0.0, 0.0] for category in AnalysisCategory
+        }
+        self._next_point = sentiment_interval
+
+    @staticmethod
+    def _message(message_type: str, payload: dict) -> WSMessage:
+        return WSMessage(type=message_type, payload=payload, timestamp=int(time.time() * 1000))
+
+    def _add_to_window(self, end: float, analysis: SegmentAnalysis):
+        contributions = {s.category: (s.sentiment * s.relevance, s.relevance) for s in analysis.signals}
+        self._window.append((end, analysis.sentiment, contributions))
+        self._window_sum += analysis.sentiment
+        for category, (weighted, weight) in contributions.items():
+            self._window_category[category][0] += weighted
+            self._window_category[category][1] += weight
+
+        while self._window and self._window[0][0] < end - self.window_seconds:
+            _, sentiment, old = self._window.popleft()
+            self._window_sum -= sentiment
+            for category, (weighted, weight) in old.items():
+                self._window_category[category][0] -= weighted
+                self._window_category[category][1] -= weight
+
+    def _sentiment_point(self, timestamp: float) -> SentimentDataPoint:
+        overall = self._window_sum / len(self._window) if self._window else 0.0
+        return SentimentDataPoint(
+            timestamp=int(timestamp),
+            overall_sentiment=round(overall, 3),
+            category_sentiments={
+                category.value: round(weighted / weight, 3) if weight > 1e-9 else 0.0
+                for category, (weighted, weight) in self._window_category.items()
+            }
+        )
+
+    async def consume(self, segments: List[dict]) -> List[WSMessage]:
+        """
+        Analyze new segments and return the resulting insight_update and
+        sentiment_update deltas (payloads match the frontend WS types).
+        """
+        if not segments:
+            return []
+
+        analyses = await self.analyzer.analyze(segments)
+        messages = []
+        for segment, analysis in zip(segments, analyses):
+            for signal in analysis.signals:
+                state = self.categories[signal.category]
+                state.weighted_sentiment += signal.sentiment * signal.relevance
+                state.weight += signal.relevance
+                if signal.relevance < self.min_relevance:
+                    continue
+
+                insight = Insight(
+                    id=str(uuid.uuid4()),
+                    timestamp=_format_timestamp(segment["start"]),
+                    text=segment["text"],
+                    relevance=round(signal.relevance, 3)
+                )
+                state.insights.append(insight)
+                if len(state.insights) > self.max_insights_per_category:
+                    # Drop the least relevant (oldest among equals), keeping call order
+                    weakest = min(range(len(state.insights)), key=lambda i: state.insights[i].relevance)
+                    state.insights.pop(weakest)
+                messages.append(self._message("insight_update", {
+                    "category": signal.category.value,
+                    "insight": insight.model_dump(),
+                    "sentiment": round(state.sentiment, 3)
+                }))
+
+            self._add_to_window(segment["end"], analysis)
+            skipped = (segment["end"] - self._next_point) // self.sentiment_interval
+            if skipped * self.sentiment_interval > self.window_seconds:
+                # Don't emit a run of points for a long stretch without segments
+                self._next_point += skipped * self.sentiment_interval
+            while segment["end"] >= self._next_point:
+                point = self._sentiment_point(self._next_point)
+                self.sentiment_series.append(point)
+                messages.append(self._message("sentiment_update", {
+                    "dataPoint": {
+                        "timestamp": point.timestamp,
+                        "overallSentiment": point.overall_sentiment,
+                        "categorySentiments": point.category_sentiments
+                    }
+                }))
+                self._next_point += self.sentiment_interval
+
+        return messages
+
+    def snapshot(self) -> dict:
+        """Full current state, e.g. for a client that joins mid-call"""
+        return {
+            "categories": [state.to_model() for state in self.categories.values()],
+            "sentiment": self.sentiment_series
+        }
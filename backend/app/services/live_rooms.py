@@ -0,0 +1,179 @@
+"""Shared live-call rooms: one producer's transcription fanned out to many listeners."""
+
+import asyncio
+import json
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.config import get_settings
+from app.services.live_analysis import LiveAnalysisEngine
+
+logger = logging.getLogger(__name__)
+
+ROOM_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# WebSocket close code for listeners evicted for falling behind
+CLOSE_SLOW_CONSUMER = 4008
+
+
+class RoomSubscriber:
+    """
+    One listener's bounded send queue. Messages are pre-serialized JSON strings;
+    None in the queue tells the sender to close with `close_code` / `close_reason`.
+    """
+
+    def __init__(self, queue_size: int):
+        # Always room for close()'s final message and end marker
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(2, queue_size))
+        self.close_code = 1000
+        self.close_reason = ""
+
+    def offer(self, message: str) -> bool:
+        """Queue a message; False if the listener has fallen too far behind"""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def close(self, code: int, reason: str, final: Optional[str] = None):
+        """
+        Make the sender close after what is already queued (and `final`), dropping
+        the backlog only if there is no room left for them
+        """
+        self.close_code = code
+        self.close_reason = reason
+        pending = [final, None] if final is not None else [None]
+        if self.queue.maxsize - self.queue.qsize() < len(pending):
+            while not self.queue.empty():
+                self.queue.get_nowait()
+        for message in pending:
+            self.queue.put_nowait(message)
+
+
+class LiveRoom:
+    """
+    A live call with one producer and any number of listeners.
+
+    The producer's segments and analysis updates are serialized once and queued
+    for every listener, so transcription and encoding cost per call do not grow
+    with the audience. Listeners whose queue fills up are evicted rather than
+    slowing the room down. Late joiners first get a snapshot of the call so far.
+    """
+
+    def __init__(self, room_id: str, queue_size: int = 256, max_listeners: int = 500):
+        self.room_id = room_id
+        self.queue_size = queue_size
+        self.max_listeners = max_listeners
+        self.created_at = datetime.now()
+        self.segments: List[dict] = []
+        self.analysis_engine: Optional[LiveAnalysisEngine] = None
+        self.subscribers: List[RoomSubscriber] = []
+        self.evicted = 0
+
+    def snapshot(self) -> dict:
+        snapshot = {"type": "snapshot", "room_id": self.room_id, "segments": self.segments}
+        if self.analysis_engine is not None:
+            state = self.analysis_engine.snapshot()
+            snapshot["analysis"] = {
+                "categories": [c.model_dump() for c in state["categories"]],
+                "sentiment": [p.model_dump() for p in state["sentiment"]]
+            }
+        return snapshot
+
+    def join(self) -> RoomSubscriber:
+        """Add a listener; its queue starts with the catch-up snapshot"""
+        if len(self.subscribers) >= self.max_listeners:
+            raise RuntimeError(f"Room {self.room_id} is full ({self.max_listeners} listeners)")
+        subscriber = RoomSubscriber(self.queue_size)
+        subscriber.offer(json.dumps(self.snapshot()))
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    def leave(self, subscriber: RoomSubscriber):
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+
+    def _broadcast(self, message: dict):
+        text = json.dumps(message)
+        for subscriber in list(self.subscribers):
+            if not subscriber.offer(text):
+                logger.warning(f"Evicting slow listener from room {self.room_id}")
+                self.evicted += 1
+                subscriber.close(CLOSE_SLOW_CONSUMER, "Slow consumer")
+                self.subscribers.remove(subscriber)
+
+    def publish_segments(self, segments: List[dict]):
+        for segment in segments:
+            segment = {"type": "segment", "start": segment["start"], "end": segment["end"], "text": segment["text"]}
+            self.segments.append(segment)
+            self._broadcast(segment)
+
+    def publish(self, message: dict):
+        """Broadcast any other JSON message, e.g. analysis WSMessages"""
+        self._broadcast(message)
+
+    def close(self, reason: str = "Call ended"):
+        final = json.dumps({"type": "room_closed", "room_id": self.room_id, "reason": reason})
+        for subscriber in self.subscribers:
+            subscriber.close(1000, reason, final)
+        self.subscribers = []
+
+    def to_dict(self) -> dict:
+        return {
+            "room_id": self.room_id,
+            "created_at": self.created_at.isoformat(),
+            "listeners": len(self.subscribers),
+            "segments": len(self.segments),
+            "evicted_listeners": self.evicted,
+            "analysis": self.analysis_engine is not None
+        }
+
+
+class LiveRoomRegistry:
+    """Open rooms by id; a room exists while its producer is connected"""
+
+    def __init__(self, queue_size: int = 256, max_listeners: int = 500):
+        self.queue_size = queue_size
+        self.max_listeners = max_listeners
+        self.rooms: Dict[str, LiveRoom] = {}
+
+    def open(self, room_id: str) -> LiveRoom:
+        if not ROOM_ID_PATTERN.match(room_id):
+            raise ValueError("Room id must be 1-64 letters, digits, '-' or '_'")
+        if room_id in self.rooms:
+            raise ValueError(f"Room {room_id} already has a producer")
+        room = LiveRoom(room_id, self.queue_size, self.max_listeners)
+        self.rooms[room_id] = room
+        logger.info(f"Opened live room {room_id}")
+        return room
+
+    def get(self, room_id: str) -> Optional[LiveRoom]:
+        return self.rooms.get(room_id)
+
+    def close(self, room_id: str):
+        room = self.rooms.pop(room_id, None)
+        if room is not None:
+            room.close()
+            logger.info(f"Closed live room {room_id} ({len(room.segments)} segments)")
+
+    def list_rooms(self) -> List[dict]:
+        return [room.to_dict() for room in self.rooms.values()]
+
+
+# Global instance
+_live_room_registry: Optional[LiveRoomRegistry] = None
+
+
+def get_live_room_registry() -> LiveRoomRegistry:
+    """Get or create the global live room registry"""
+    global _live_room_registry
+    if _live_room_registry is None:
+        settings = get_settings()
+        _live_room_registry = LiveRoomRegistry(
+            queue_size=settings.live_room_queue_size,
+            max_listeners=settings.live_room_max_listeners
+        )
+    return _live_room_registry
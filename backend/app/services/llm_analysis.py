@@ -0,0 +1,335 @@
+"""
+Map-reduce LLM analysis of earnings call transcripts.
+
+A full transcript can be slow to analyze in one request and may not fit the
+model's context, so the pipeline:
+
+1. Splits the transcript into chunks of at most `chunk_tokens`, cutting only at
+   speaker turns and never across the prepared remarks / Q&A boundary (a single
+   oversized turn is split at entry, then sentence, boundaries).
+2. Map: analyzes every chunk concurrently, at most `max_concurrency` at a time.
+3. Reduce: merges the chunk analyses into one, in rounds if they don't fit one request.
+
+Chunk and final results are cached by content hash plus prompt version, so
+re-opening a call (or re-analyzing a transcript where only some chunks changed)
+never pays for the same analysis twice. Editing the prompt changes the version.
+Identical requests that are already in flight are shared rather than repeated.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Optional
+
+from app.config import get_settings
+from app.models.analysis import TranscriptAnalysis
+from app.models.records import TranscriptEntryRecord, TranscriptRecord
+from app.services.result_cache import ResultCache
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+PROMPT_PATH = Path(__file__).resolve().parent.parent / "prompts" / "earnings_analysis_prompt.md"
+
+MAP_INSTRUCTIONS = """
+## Excerpt Mode
+
+The user message is part {part} of {parts} of one earnings call ({section}).
+Analyze only this excerpt and return the JSON object described above. Omit
+categories the excerpt does not discuss; quote only text from the excerpt.
+"""
+
+REDUCE_INSTRUCTIONS = """
+## Merge Mode
+
+The user message is a JSON array of analyses of consecutive excerpts of one
+earnings call, in call order. Merge them into a single analysis of the whole
+call in the JSON format described above: combine and de-duplicate key points,
+keep the most notable quotes, and weigh sentiment by how much each excerpt
+discusses the category. Return only the JSON object.
+"""
+
+# Rough size of the JSON each map call returns, used to size reduce batches
+ANALYSIS_TOKENS_ESTIMATE = 600
+
+QA_MARKERS = re.compile(r"question[- ]and[- ]answer|first question|open (?:up )?the (?:call|line)s? (?:up )?(?:for|to) questions", re.I)
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (~4 characters per token for English)"""
+    return len(text) // 4 + 1
+
+
+class TranscriptChunk(NamedTuple):
+    """Consecutive transcript entries analyzed in one map request"""
+    section: str  # "prepared remarks" or "Q&A"
+    text: str
+    tokens: int
+
+
+def _format_entry(entry: TranscriptEntryRecord) -> str:
+    return f"{entry.speaker}: {entry.text}" if entry.speaker else entry.text
+
+
+def _is_qa_start(entry: TranscriptEntryRecord) -> bool:
+    return bool(QA_MARKERS.search(entry.text)) and (entry.speaker or "").lower() in ("operator", "")
+
+
+def _split_long(text: str, max_tokens: int) -> List[str]:
+    """Split one oversized entry at sentence boundaries (hard-cut sentences that are still too long)"""
+    pieces, current = [], ""
+    for sentence in SENTENCE_END.split(text):
+        while estimate_tokens(sentence) > max_tokens:
+            cut = max_tokens * 4
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:]
+        candidate = f"{current} {sentence}".strip()
+        if current and estimate_tokens(candidate) > max_tokens:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_transcript(entries: List[TranscriptEntryRecord], max_tokens: int) -> List[TranscriptChunk]:
+    """
+    Pack whole speaker turns into chunks of at most max_tokens, starting a new
+    chunk at the Q&A boundary. Turns larger than the budget are split.
+    """
+    # Group consecutive entries into (section, speaker turn)
+    turns: List[tuple] = []
+    section = "prepared remarks"
+    for entry in entries:
+        if section != "Q&A" and _is_qa_start(entry):
+            section = "Q&A"
+        if turns and turns[-1][0] == section and turns[-1][1] == entry.speaker:
+            turns[-1][2].append(_format_entry(entry))
+        else:
+            turns.append((section, entry.speaker, [_format_entry(entry)]))
+
+    chunks: List[TranscriptChunk] = []
+    current: List[str] = []
+    current_tokens = 0
+    current_section = None
+
+    def emit():
+        nonlocal current, current_tokens
+        if current:
+            chunks.append(TranscriptChunk(current_section, "\n\n".join(current), current_tokens))
+        current, current_tokens = [], 0
+
+    for turn_section, _, paragraphs in turns:
+        if turn_section != current_section:
+            emit()
+            current_section = turn_section
+        turn_text = "\n\n".join(paragraphs)
+        turn_tokens = estimate_tokens(turn_text)
+        if current_tokens + turn_tokens <= max_tokens:
+            current.append(turn_text)
+            current_tokens += turn_tokens
+            continue
+
+        emit()
+        if turn_tokens <= max_tokens:
+            current, current_tokens = [turn_text], turn_tokens
+            continue
+        # Oversized turn: pack its paragraphs, splitting any that are too long on their own
+        for paragraph in paragraphs:
+            for piece in (_split_long(paragraph, max_tokens) if estimate_tokens(paragraph) > max_tokens else [paragraph]):
+                tokens = estimate_tokens(piece)
+                if current_tokens + tokens > max_tokens:
+                    emit()
+                current.append(piece)
+                current_tokens += tokens
+    emit()
+    return chunks
+
+
+def _parse_json(content: Optional[str]) -> dict:
+    """Parse a JSON object from a completion, tolerating a ```json fence"""
+    text = (content or "").strip()
+    if text.startswith("```"):
+        text = text.strip("`").removeprefix("json").strip()
+    result = json.loads(text)
+    if not isinstance(result, dict):
+        raise ValueError("LLM response is not a JSON object")
+    return result
+
+
+class LLMAnalysisPipeline:
+    """Chunked, concurrent, cached transcript analysis against an OpenAI-compatible API"""
+
+    def __init__(
+        self,
+        client: "AsyncOpenAI",
+        model: str,
+        chunk_tokens: int = 3000,
+        max_concurrency: int = 4,
+        cache: Optional[ResultCache] = None,
+        prompt: Optional[str] = None
+    ):
+        self.client = client
+        self.model = model
+        self.chunk_tokens = chunk_tokens
+        self.cache = cache
+        self.prompt = prompt if prompt is not None else PROMPT_PATH.read_text()
+        self.prompt_version = hashlib.sha256(
+            (self.prompt + MAP_INSTRUCTIONS + REDUCE_INSTRUCTIONS).encode("utf-8")
+        ).hexdigest()[:12]
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Completions in flight by cache key
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def _cache_key(self, content: str, stage: str) -> str:
+        return ResultCache.make_key(
+            content.encode("utf-8"),
+            stage=stage,
+            model=self.model,
+            prompt_version=self.prompt_version
+        )
+
+    async def _complete(self, system: str, user: str, cache_key: str) -> dict:
+        """One JSON completion, cached by key, under the concurrency limit"""
+        if self.cache:
+            cached = await self.cache.get_async(cache_key)
+            if cached is not None:
+                return cached
+        # Identical requests (same transcript opened twice) wait for the same completion
+        pending = self._in_flight.get(cache_key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._request(system, user, cache_key))
+            self._in_flight[cache_key] = pending
+            pending.add_done_callback(lambda _: self._in_flight.pop(cache_key, None))
+        # One caller giving up does not cancel the request for the others
+        return await asyncio.shield(pending)
+
+    async def _request(self, system: str, user: str, cache_key: str) -> dict:
+        async with self._semaphore:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+                response_format={"type": "json_object"},
+                temperature=0
+            )
+        result = _parse_json(response.choices[0].message.content)
+        if self.cache:
+            await self.cache.set_async(cache_key, result)
+        return result
+
+    async def _merge(self, batch: List[dict]) -> dict:
+        if len(batch) == 1:
+            return batch[0]
+        return await self._complete(
+            self.prompt + REDUCE_INSTRUCTIONS,
+            json.dumps(batch),
+            self._cache_key(json.dumps(batch, sort_keys=True), "reduce")
+        )
+
+    async def _reduce(self, analyses: List[dict]) -> dict:
+        """Merge analyses, in rounds of batches that fit the chunk token budget"""
+        batch_size = max(2, self.chunk_tokens // ANALYSIS_TOKENS_ESTIMATE)
+        while len(analyses) > 1:
+            batches = [analyses[i:i + batch_size] for i in range(0, len(analyses), batch_size)]
+            analyses = await asyncio.gather(*[self._merge(batch) for batch in batches])
+        return analyses[0]
+
+    async def analyze(
+        self,
+        transcript: TranscriptRecord,
+        progress: Optional[Callable[[float], None]] = None
+    ) -> TranscriptAnalysis:
+        """
+        Analyze a transcript. `progress` is called with 0.0-1.0 as chunks finish
+        (the reduce phase counts as the last step).
+        """
+        # Boilerplate (safe harbor, operator script) costs tokens without telling the model anything
+        entries = [entry for entry in transcript.entries if not entry.boilerplate] or transcript.entries
+        entries = entries or [TranscriptEntryRecord(id="0", timestamp="00:00", text=transcript.transcript)]
+        content = "\n\n".join(_format_entry(entry) for entry in entries)
+        final_key = self._cache_key(content, "analysis")
+        metadata = {"ticker": transcript.ticker, "quarter": transcript.quarter, "year": transcript.year}
+
+        if self.cache:
+            cached = await self.cache.get_async(final_key)
+            if cached is not None:
+                if progress:
+                    progress(1.0)
+                return TranscriptAnalysis(**cached, **metadata, cached=True)
+
+        chunks = chunk_transcript(entries, self.chunk_tokens)
+        steps = len(chunks) + 1
+        done = 0
+        logger.info(f"Analyzing {transcript.ticker} {transcript.quarter} {transcript.year}: {len(chunks)} chunks")
+
+        async def map_chunk(index: int, chunk: TranscriptChunk) -> dict:
+            nonlocal done
+            system = self.prompt + MAP_INSTRUCTIONS.format(part=index + 1, parts=len(chunks), section=chunk.section)
+            result = await self._complete(system, chunk.text, self._cache_key(f"{chunk.section}\n{chunk.text}", "map"))
+            done += 1
+            if progress:
+                progress(done / steps)
+            return result
+
+        analyses = await asyncio.gather(*[map_chunk(i, chunk) for i, chunk in enumerate(chunks)])
+        merged = await self._reduce(list(analyses))
+
+        result = {
+            "overall_sentiment": float(merged.get("overall_sentiment", 0.0)),
+            "sentiment_rationale": merged.get("sentiment_rationale", ""),
+            "category_insights": merged.get("category_insights", []),
+            "key_takeaways": merged.get("key_takeaways", []),
+            "investment_implications": merged.get("investment_implications", ""),
+            "model": self.model,
+            "prompt_version": self.prompt_version,
+            "chunks": len(chunks)
+        }
+        # Validate before caching so a malformed response is never stored
+        analysis = TranscriptAnalysis(**result, **metadata)
+        if self.cache:
+            await self.cache.set_async(final_key, result)
+        if progress:
+            progress(1.0)
+        return analysis
+
+
+# Global instance
+_llm_pipeline: Optional[LLMAnalysisPipeline] = None
+
+
+def get_llm_pipeline() -> LLMAnalysisPipeline:
+    """Get or create the global analysis pipeline from settings"""
+    global _llm_pipeline
+    if _llm_pipeline is None:
+        # The OpenAI SDK is slow to import; only load it once analysis is used
+        from openai import AsyncOpenAI
+        settings = get_settings()
+        if not settings.openai_api_key and not settings.llm_base_url:
+            raise ValueError("LLM analysis is not configured (set OPENAI_API_KEY or LLM_BASE_URL)")
+        cache = None
+        if settings.llm_cache_entries > 0:
+            cache = ResultCache(
+                max_entries=settings.llm_cache_entries,
+                cache_dir=settings.llm_cache_dir or None
+            )
+        _llm_pipeline = LLMAnalysisPipeline(
+            client=AsyncOpenAI(
+                # Local OpenAI-compatible servers accept any key
+                api_key=settings.openai_api_key or "unused",
+                base_url=settings.llm_base_url or None,
+                timeout=settings.llm_timeout_seconds
+            ),
+            model=settings.llm_model,
+            chunk_tokens=settings.llm_chunk_tokens,
+            max_concurrency=settings.llm_max_concurrency,
+            cache=cache
+        )
+    return _llm_pipeline
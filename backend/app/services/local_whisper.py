@@ -2,17 +2,49 @@
 
 import logging
 from pathlib import Path
-from typing import Optional, Iterator
-from faster_whisper import WhisperModel
+from typing import TYPE_CHECKING, Optional, Iterator, List, Union
+import numpy as np
 import tempfile
+import threading
+import time
+from app.services.metrics import REGISTRY
+from app.services.transcription_cache import TranscriptionCache, offset_segments
+
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
 
 logger = logging.getLogger(__name__)
 
+CHUNK_LATENCY = REGISTRY.histogram(
+    "whisper_chunk_seconds",
+    "Wall time to decode and transcribe one audio chunk",
+    ["model"]
+)
+CHUNK_RTF = REGISTRY.histogram(
+    "whisper_chunk_rtf",
+    "Real-time factor per chunk (processing time / audio duration)",
+    ["model"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+)
+CHUNK_AUDIO = REGISTRY.counter(
+    "whisper_audio_seconds_total",
+    "Seconds of audio transcribed",
+    ["model"]
+)
+
 
 class LocalWhisperService:
     """Service for local audio transcription using faster-whisper."""
 
-    def __init__(self, model_size: str = "base", device: str = "cpu", compute_type: str = "int8"):
+    def __init__(
+        self,
+        model_size: str = "base",
+        device: str = "cpu",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        result_cache: Optional[TranscriptionCache] = None
+    ):
         """
         Initialize the Whisper model.
         
@@ -20,28 +52,64 @@ class LocalWhisperService:
             model_size: Model size (tiny, base, small, medium, large-v2, large-v3)
             device: Device to run on (cpu, cuda)
             compute_type: Computation type (int8, int16, float16, float32)
+            cpu_threads: Threads per transcription (0 = CTranslate2 default)
+            num_workers: Transcriptions that can run in parallel from different threads
+            result_cache: Cache of transcribe_stream results keyed by audio content
         """
         self.model_size = model_size
         self.device = device
         self.compute_type = compute_type
-        self._model: Optional[WhisperModel] = None
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.result_cache = result_cache
+        self._model: Optional["WhisperModel"] = None
+        self._load_lock = threading.Lock()
         logger.info(f"LocalWhisperService initialized with model={model_size}, device={device}")
 
-    def _ensure_model_loaded(self) -> WhisperModel:
+    def _ensure_model_loaded(self) -> "WhisperModel":
         """Lazy load the model on first use."""
         if self._model is None:
-            logger.info(f"Loading Whisper model: {self.model_size}")
-            self._model = WhisperModel(
-                self.model_size,
-                device=self.device,
-                compute_type=self.compute_type
-            )
-            logger.info("Whisper model loaded successfully")
+            # Imported here: faster-whisper pulls in CTranslate2 and onnxruntime,
+            # which processes that never transcribe should not pay for
+            from faster_whisper import WhisperModel
+            # Startup warmup runs on a worker thread; don't load the weights twice
+            with self._load_lock:
+                if self._model is None:
+                    logger.info(f"Loading Whisper model: {self.model_size}")
+                    self._model = WhisperModel(
+                        self.model_size,
+                        device=self.device,
+                        compute_type=self.compute_type,
+                        cpu_threads=self.cpu_threads,
+                        num_workers=self.num_workers
+                    )
+                    logger.info("Whisper model loaded successfully")
         return self._model
 
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the model weights are already in memory."""
+        return self._model is not None
+
+    def warmup(self, duration_seconds: float = 1.0) -> None:
+        """
+        Load the model and run one short decode so the first real chunk
+        does not pay for weight loading and kernel initialization.
+        
+        Args:
+            duration_seconds: Length of the silent warmup clip in seconds
+        """
+        model = self._ensure_model_loaded()
+        silence = np.zeros(int(16000 * duration_seconds), dtype=np.float32)
+        segments, _ = model.transcribe(silence, language="en", beam_size=1)
+        # Segments are generated lazily; consume them so decoding actually runs
+        for _ in segments:
+            pass
+        logger.info(f"Whisper model warmed up: {self.model_size}")
+
     def transcribe_file(
         self,
-        audio_path: str,
+        audio_path: Union[str, np.ndarray],
         language: Optional[str] = None,
         beam_size: int = 5,
         time_offset: float = 0.0
@@ -50,7 +118,7 @@ class LocalWhisperService:
         Transcribe an audio file.
         
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to audio file, or 16 kHz mono float32 samples
             language: Language code (e.g., 'en'), None for auto-detect
             beam_size: Beam size for decoding (higher = more accurate but slower)
             time_offset: Time offset in seconds to add to all timestamps (for cumulative timing)
@@ -60,7 +128,9 @@ class LocalWhisperService:
         """
         model = self._ensure_model_loaded()
         
-        logger.info(f"Transcribing file: {audio_path} (offset: {time_offset}s)")
+        started = time.perf_counter()
+        source = audio_path if isinstance(audio_path, str) else f"<{len(audio_path)} samples>"
+        logger.info(f"Transcribing file: {source} (offset: {time_offset}s)")
         segments, info = model.transcribe(
             audio_path,
             language=language,
@@ -77,26 +147,116 @@ class LocalWhisperService:
                 "end": segment.end + time_offset,
                 "text": segment.text.strip()
             }
+        
+        # Segments decode lazily, so the chunk is only done once they are all consumed
+        elapsed = time.perf_counter() - started
+        CHUNK_LATENCY.labels(self.model_size).observe(elapsed)
+        if info.duration:
+            CHUNK_RTF.labels(self.model_size).observe(elapsed / info.duration)
+            CHUNK_AUDIO.labels(self.model_size).inc(info.duration)
 
     def transcribe_stream(
         self,
         audio_data: bytes,
         language: Optional[str] = None,
         beam_size: int = 5,
-        time_offset: float = 0.0
+        time_offset: float = 0.0,
+        audio_format: str = "webm",
+        cache_key: Optional[str] = None
     ) -> Iterator[dict]:
         """
         Transcribe audio from bytes (for WebSocket streaming).
         
         Args:
-            audio_data: Raw audio bytes (WebM format from MediaRecorder)
+            audio_data: Raw audio bytes (WebM format from MediaRecorder, or PCM16)
             language: Language code (e.g., 'en'), None for auto-detect
             beam_size: Beam size for decoding
             time_offset: Time offset in seconds to add to all timestamps (for cumulative timing)
+            audio_format: "webm" for container audio, "pcm16" for raw 16 kHz mono
+                little-endian PCM16, which skips container demuxing and decoding
+            cache_key: Result cache key of a lookup the caller already made and
+                missed (see get_cached); the audio is then not hashed or looked up again
             
         Yields:
             Segment dictionaries with 'start', 'end', 'text' keys (timestamps include offset)
         """
+        if self.result_cache is None:
+            yield from self._transcribe_bytes(audio_data, language, beam_size, time_offset, audio_format)
+            return
+
+        if cache_key is None:
+            cache_key = self.cache_key(audio_data, language, beam_size, audio_format)
+            cached = self.get_cached(audio_data, language, beam_size, time_offset, audio_format, cache_key)
+            if cached is not None:
+                yield from cached
+                return
+
+        segments = []
+        for segment in self._transcribe_bytes(audio_data, language, beam_size, 0.0, audio_format):
+            segments.append(segment)
+            yield offset_segments([segment], time_offset)[0]
+        self.result_cache.set(cache_key, segments)
+
+    def get_cached(
+        self,
+        audio_data: bytes,
+        language: Optional[str] = None,
+        beam_size: int = 5,
+        time_offset: float = 0.0,
+        audio_format: str = "webm",
+        cache_key: Optional[str] = None
+    ) -> Optional[List[dict]]:
+        """
+        Look up cached segments for this exact audio without transcribing.
+        
+        Args:
+            cache_key: Precomputed cache_key() of the audio, to avoid hashing it again
+
+        Returns:
+            Segments shifted by time_offset, or None if not cached
+        """
+        if self.result_cache is None:
+            return None
+        cached = self.result_cache.get(
+            cache_key or self.cache_key(audio_data, language, beam_size, audio_format)
+        )
+        return offset_segments(cached, time_offset) if cached is not None else None
+
+    def cache_key(
+        self,
+        audio_data: bytes,
+        language: Optional[str],
+        beam_size: int,
+        audio_format: str
+    ) -> Optional[str]:
+        """Result cache key of the audio with this model (None without a result cache)"""
+        if self.result_cache is None:
+            return None
+        # Same audio with the same model and decode settings always gives the same
+        # segments; they are cached relative to offset 0
+        return self.result_cache.make_key(
+            audio_data,
+            model_size=self.model_size,
+            compute_type=self.compute_type,
+            language=language,
+            beam_size=beam_size,
+            audio_format=audio_format
+        )
+
+    def _transcribe_bytes(
+        self,
+        audio_data: bytes,
+        language: Optional[str],
+        beam_size: int,
+        time_offset: float,
+        audio_format: str
+    ) -> Iterator[dict]:
+        """Decode audio bytes in the given format and transcribe them."""
+        if audio_format == "pcm16":
+            samples = np.frombuffer(audio_data, dtype="<i2").astype(np.float32) / 32768.0
+            yield from self.transcribe_file(samples, language, beam_size, time_offset)
+            return
+
         # Write audio data to temporary file with correct extension
         # MediaRecorder sends WebM/Opus format, not WAV
         with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as tmp_file:
@@ -0,0 +1,373 @@
+"""
+Local stand-in for the Alpha Vantage query API.
+
+Serves GET /query for the functions the backend uses (SYMBOL_SEARCH, OVERVIEW,
+EARNINGS, INCOME_STATEMENT, TIME_SERIES_DAILY, EARNINGS_CALL_TRANSCRIPT and the
+EARNINGS_CALENDAR CSV) so the backend can be load-tested without spending API
+quota. Responses come from recorded fixtures when present, otherwise they are
+generated deterministically per symbol. Latency and errors (HTTP 500, rate
+limit notes, error messages) can be injected, and /stats counts requests.
+
+Run:
+    python -m app.services.mock_alpha_vantage --port 8200 --latency 0.2 --error-rate 0.01
+then set ALPHA_VANTAGE_BASE_URL=http://localhost:8200/query
+
+Record real responses as fixtures (uses ALPHA_VANTAGE_API_KEY):
+    python -m app.services.mock_alpha_vantage record --tickers AAPL MSFT --quarters 2024Q4 --out fixtures/
+
+In-process, without a server:
+    AlphaVantageService(api_key="x", transport=create_mock_transport(latency=0.05))
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import zlib
+from collections import Counter
+from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import httpx
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.services.boilerplate import BOILERPLATE_CORPUS
+
+DEFAULT_TICKERS = {
+    "AAPL": "Apple Inc", "MSFT": "Microsoft Corporation", "GOOGL": "Alphabet Inc",
+    "AMZN": "Amazon.com Inc", "META": "Meta Platforms Inc", "NVDA": "NVIDIA Corporation",
+    "TSLA": "Tesla Inc", "JPM": "JPMorgan Chase & Co", "V": "Visa Inc", "WMT": "Walmart Inc",
+    "JNJ": "Johnson & Johnson", "PG": "Procter & Gamble Co", "XOM": "Exxon Mobil Corp",
+    "KO": "Coca-Cola Co", "NFLX": "Netflix Inc", "ORCL": "Oracle Corp", "INTC": "Intel Corp",
+    "AMD": "Advanced Micro Devices Inc", "CRM": "Salesforce Inc", "DIS": "Walt Disney Co",
+}
+
+ERROR_KINDS = ("http_500", "rate_limit", "error_message")
+
+SENTENCES = [
+    "Revenue grew {n} percent year over year, driven by strong demand across our core segments.",
+    "Gross margin expanded {n} basis points as pricing offset higher input costs.",
+    "We remain cautious on the macro environment and are managing expenses carefully.",
+    "Our pipeline has never been stronger and customer retention improved again this quarter.",
+    "Supply constraints weighed on shipments, and we expect some headwinds to persist.",
+    "We are raising our full-year guidance to reflect the momentum we are seeing.",
+    "Operating cash flow was {n} million, and we returned capital through buybacks and dividends.",
+    "Competition intensified in several markets, but we gained share in our largest category.",
+    "Can you talk about how you are thinking about margins for the rest of the year?",
+    "We continue to invest in research and development to extend our technology lead.",
+    "Inventory levels are healthy, and we see normal seasonality into the next quarter.",
+    "Foreign exchange was a headwind of about {n} percent to reported growth.",
+]
+
+
+def _seed(*parts) -> int:
+    return zlib.crc32("|".join(str(p) for p in parts).encode("utf-8"))
+
+
+def _name(symbol: str) -> str:
+    return DEFAULT_TICKERS.get(symbol, f"{symbol.title()} Holdings Inc")
+
+
+def _quarter_ends(count: int, today: date) -> List[date]:
+    """Most recent `count` fiscal quarter ends already reported (~45 days ago or more), newest first"""
+    cutoff = today - timedelta(days=45)
+    year, quarter = cutoff.year, (cutoff.month - 1) // 3
+    if quarter == 0:
+        year, quarter = year - 1, 4
+    ends = []
+    for _ in range(count):
+        month = quarter * 3
+        next_month = date(year + (month == 12), month % 12 + 1, 1)
+        ends.append(next_month - timedelta(days=1))
+        year, quarter = (year, quarter - 1) if quarter > 1 else (year - 1, 4)
+    return ends
+
+
+@lru_cache(maxsize=256)
+def _earnings_rows(symbol: str, today: date) -> tuple:
+    rng = np.random.default_rng(_seed("earnings", symbol))
+    ends = _quarter_ends(20, today)
+    base = rng.uniform(0.5, 4.0)
+    rows = []
+    for i, end in enumerate(ends):
+        estimated = base * (1 + 0.02 * (len(ends) - i)) * rng.uniform(0.9, 1.1)
+        reported = estimated * rng.normal(1.03, 0.06)
+        rows.append({
+            "fiscalDateEnding": end.isoformat(),
+            "reportedDate": (end + timedelta(days=int(rng.integers(25, 40)))).isoformat(),
+            "reportedEPS": f"{reported:.2f}",
+            "estimatedEPS": f"{estimated:.2f}",
+            "surprise": f"{reported - estimated:.2f}",
+            "surprisePercentage": f"{(reported - estimated) / estimated * 100:.4f}",
+            "reportTime": "post-market"
+        })
+    return tuple(rows)
+
+
+@lru_cache(maxsize=64)
+def _daily_series(symbol: str, today: date, full: bool) -> str:
+    """TIME_SERIES_DAILY body (pre-serialized; full history is large)"""
+    rng = np.random.default_rng(_seed("prices", symbol))
+    start = date(2005, 1, 3)
+    days = np.arange(np.datetime64(start), np.datetime64(today))
+    days = days[np.is_busday(days)]
+    closes = rng.uniform(20, 300) * np.exp(np.cumsum(rng.normal(0.0003, 0.018, len(days))))
+    if not full:
+        days, closes = days[-100:], closes[-100:]
+    series = {}
+    for day, close in zip(days[::-1].tolist(), closes[::-1].tolist()):
+        series[day.isoformat()] = {
+            "1. open": f"{close * 0.995:.4f}",
+            "2. high": f"{close * 1.01:.4f}",
+            "3. low": f"{close * 0.99:.4f}",
+            "4. close": f"{close:.4f}",
+            "5. volume": str(int(close * 100000) % 90000000 + 1000000)
+        }
+    return json.dumps({
+        "Meta Data": {
+            "1. Information": "Daily Prices (open, high, low, close) and Volumes",
+            "2. Symbol": symbol,
+            "3. Last Refreshed": days[-1].item().isoformat() if len(days) else today.isoformat(),
+            "4. Output Size": "Full size" if full else "Compact",
+            "5. Time Zone": "US/Eastern"
+        },
+        "Time Series (Daily)": series
+    })
+
+
+def _overview(symbol: str, today: date) -> dict:
+    rng = np.random.default_rng(_seed("overview", symbol))
+    eps = float(sum(float(row["reportedEPS"]) for row in _earnings_rows(symbol, today)[:4]))
+    price = rng.uniform(20, 400)
+    revenue = rng.uniform(1e9, 4e11)
+    return {
+        "Symbol": symbol,
+        "Name": _name(symbol),
+        "Description": f"{_name(symbol)} designs, manufactures and sells products and services worldwide.",
+        "Sector": "TECHNOLOGY",
+        "Industry": "SERVICES-PREPACKAGED SOFTWARE",
+        "MarketCapitalization": str(int(price * rng.uniform(1e8, 1e10))),
+        "PERatio": f"{price / eps:.2f}" if eps > 0 else "None",
+        "EPS": f"{eps:.2f}",
+        "RevenueTTM": str(int(revenue)),
+        "ProfitMargin": f"{rng.uniform(0.05, 0.35):.3f}",
+        "OperatingMarginTTM": f"{rng.uniform(0.05, 0.4):.3f}",
+        "ReturnOnEquityTTM": f"{rng.uniform(0.05, 0.6):.3f}",
+        "DividendYield": f"{rng.uniform(0, 0.03):.4f}",
+        "52WeekHigh": f"{price * 1.2:.2f}",
+        "52WeekLow": f"{price * 0.75:.2f}"
+    }
+
+
+def _income_statement(symbol: str, today: date) -> dict:
+    rng = np.random.default_rng(_seed("income", symbol))
+    revenue = rng.uniform(2e8, 1e11)
+    return {
+        "symbol": symbol,
+        "quarterlyReports": [
+            {
+                "fiscalDateEnding": row["fiscalDateEnding"],
+                "reportedCurrency": "USD",
+                "totalRevenue": str(int(revenue * (1 - 0.015 * i) * rng.uniform(0.95, 1.05))),
+                "netIncome": str(int(revenue * 0.15 * rng.uniform(0.8, 1.2)))
+            }
+            for i, row in enumerate(_earnings_rows(symbol, today))
+        ]
+    }
+
+
+def _transcript(symbol: str, quarter: str, today: date) -> dict:
+    """quarter is Alpha Vantage's "2024Q4" form"""
+    reported = {
+        f"{row['fiscalDateEnding'][:4]}Q{(int(row['fiscalDateEnding'][5:7]) - 1) // 3 + 1}"
+        for row in _earnings_rows(symbol, today)
+    }
+    if quarter not in reported:
+        return {}
+    rng = random.Random(_seed("transcript", symbol, quarter))
+    entries = [
+        {"speaker": "Operator", "title": "Operator", "content": BOILERPLATE_CORPUS[0]},
+        {"speaker": "Investor Relations", "title": "IR", "content": BOILERPLATE_CORPUS[2]},
+        {"speaker": "Investor Relations", "title": "IR", "content": BOILERPLATE_CORPUS[4]},
+    ]
+    for i in range(60):
+        speaker = ("Chief Executive Officer", "Chief Financial Officer", "Analyst")[i % 3 if i > 30 else i % 2]
+        content = " ".join(rng.choice(SENTENCES).format(n=rng.randint(2, 40)) for _ in range(rng.randint(2, 6)))
+        entries.append({"speaker": speaker, "title": speaker, "content": content})
+    entries.append({"speaker": "Operator", "title": "Operator", "content": BOILERPLATE_CORPUS[-1]})
+    return {"symbol": symbol, "quarter": quarter, "transcript": entries}
+
+
+def _calendar_csv(today: date) -> str:
+    lines = ["symbol,name,reportDate,fiscalDateEnding,estimate,currency"]
+    for i, (symbol, name) in enumerate(sorted(DEFAULT_TICKERS.items())):
+        rng = np.random.default_rng(_seed("calendar", symbol))
+        report = today + timedelta(days=int(rng.integers(1, 90)))
+        fiscal = _quarter_ends(1, report + timedelta(days=45))[0]
+        lines.append(f"{symbol},{name.replace(',', '')},{report},{fiscal},{rng.uniform(0.5, 4):.2f},USD")
+    return "\n".join(lines) + "\n"
+
+
+def _search(keywords: str) -> dict:
+    needle = keywords.upper()
+    matches = [
+        {
+            "1. symbol": symbol, "2. name": name, "3. type": "Equity", "4. region": "United States",
+            "5. marketOpen": "09:30", "6. marketClose": "16:00", "7. timezone": "UTC-04",
+            "8. currency": "USD", "9. matchScore": "1.0000" if symbol == needle else "0.5000"
+        }
+        for symbol, name in DEFAULT_TICKERS.items()
+        if needle in symbol or needle in name.upper()
+    ]
+    return {"bestMatches": matches}
+
+
+def fixture_key(params: dict) -> str:
+    """File stem for a recorded response: symbol, keywords or horizon, plus quarter/outputsize"""
+    parts = [params.get("symbol") or params.get("keywords") or params.get("horizon") or "default"]
+    for name in ("quarter", "outputsize"):
+        if params.get(name):
+            parts.append(params[name])
+    return "_".join(parts)
+
+
+def create_mock_alpha_vantage_app(
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    error_kinds: Sequence[str] = ERROR_KINDS,
+    fixtures_dir: Optional[str] = None,
+    seed: int = 0
+) -> FastAPI:
+    """
+    Mock API app. Every response waits `latency` +/- `jitter` seconds; a share
+    `error_rate` of requests fail with one of `error_kinds`.
+    """
+    app = FastAPI(title="Mock Alpha Vantage API")
+    app.state.requests = Counter()
+    app.state.errors = Counter()
+    fixtures = Path(fixtures_dir) if fixtures_dir else None
+    rng = random.Random(seed)
+
+    @app.get("/query")
+    async def query(request: Request):
+        params = dict(request.query_params)
+        function = params.get("function", "")
+        app.state.requests[function] += 1
+        if latency or jitter:
+            await asyncio.sleep(max(0.0, latency + rng.uniform(-jitter, jitter)))
+
+        if error_rate and rng.random() < error_rate:
+            kind = rng.choice(list(error_kinds))
+            app.state.errors[kind] += 1
+            if kind == "http_500":
+                return JSONResponse({"detail": "Injected server error"}, status_code=500)
+            if kind == "rate_limit":
+                return {"Note": "Thank you for using Alpha Vantage! Our standard API rate limit is 25 requests per day."}
+            return {"Error Message": f"Invalid API call for {function} (injected)"}
+
+        if fixtures is not None:
+            for suffix in (".json", ".csv"):
+                path = fixtures / function / f"{fixture_key(params)}{suffix}"
+                if path.exists():
+                    if suffix == ".csv":
+                        return PlainTextResponse(path.read_text())
+                    return JSONResponse(json.loads(path.read_text()))
+
+        today = date.today()
+        symbol = params.get("symbol", "").upper()
+        if function == "SYMBOL_SEARCH":
+            return _search(params.get("keywords", ""))
+        if function == "OVERVIEW":
+            return _overview(symbol, today)
+        if function == "EARNINGS":
+            return {"symbol": symbol, "annualEarnings": [], "quarterlyEarnings": list(_earnings_rows(symbol, today))}
+        if function == "INCOME_STATEMENT":
+            return _income_statement(symbol, today)
+        if function == "TIME_SERIES_DAILY":
+            body = _daily_series(symbol, today, params.get("outputsize") == "full")
+            return PlainTextResponse(body, media_type="application/json")
+        if function == "EARNINGS_CALL_TRANSCRIPT":
+            return _transcript(symbol, params.get("quarter", ""), today)
+        if function == "EARNINGS_CALENDAR":
+            return PlainTextResponse(_calendar_csv(today), media_type="text/csv")
+        return {"Error Message": f"Unsupported function {function}"}
+
+    @app.get("/stats")
+    async def stats():
+        return {"requests": dict(app.state.requests), "injected_errors": dict(app.state.errors)}
+
+    return app
+
+
+def create_mock_transport(**kwargs) -> httpx.ASGITransport:
+    """httpx transport answering Alpha Vantage requests in-process (same options as the app)"""
+    return httpx.ASGITransport(app=create_mock_alpha_vantage_app(**kwargs))
+
+
+async def record_fixtures(api_key: str, tickers: List[str], quarters: List[str], out: str, delay: float):
+    """Save real API responses in the fixture layout the mock serves"""
+    requests = [{"function": "EARNINGS_CALENDAR", "horizon": "3month"}]
+    for ticker in tickers:
+        requests += [
+            {"function": "SYMBOL_SEARCH", "keywords": ticker},
+            {"function": "OVERVIEW", "symbol": ticker},
+            {"function": "EARNINGS", "symbol": ticker},
+            {"function": "INCOME_STATEMENT", "symbol": ticker},
+            {"function": "TIME_SERIES_DAILY", "symbol": ticker, "outputsize": "compact"},
+        ]
+        requests += [{"function": "EARNINGS_CALL_TRANSCRIPT", "symbol": ticker, "quarter": q} for q in quarters]
+
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        for params in requests:
+            response = await client.get("https://www.alphavantage.co/query", params={**params, "apikey": api_key})
+            response.raise_for_status()
+            is_csv = params["function"] == "EARNINGS_CALENDAR"
+            path = Path(out) / params["function"] / f"{fixture_key(params)}{'.csv' if is_csv else '.json'}"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(response.text)
+            print(f"Recorded {path}")
+            await asyncio.sleep(delay)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] == "record":
+        from app.config import get_settings
+        parser = argparse.ArgumentParser(description="Record Alpha Vantage responses as fixtures")
+        parser.add_argument("--tickers", nargs="+", required=True)
+        parser.add_argument("--quarters", nargs="*", default=[], help='Transcripts to record, e.g. "2024Q4"')
+        parser.add_argument("--out", default="fixtures")
+        parser.add_argument("--delay", type=float, default=1.0, help="Seconds between requests (rate limit)")
+        args = parser.parse_args(argv[1:])
+        asyncio.run(record_fixtures(get_settings().alpha_vantage_api_key, args.tickers, args.quarters, args.out, args.delay))
+        return 0
+
+    parser = argparse.ArgumentParser(description="Run a mock Alpha Vantage API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8200)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- seconds around --latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests that fail")
+    parser.add_argument("--error-kinds", nargs="+", default=list(ERROR_KINDS), choices=ERROR_KINDS)
+    parser.add_argument("--fixtures", help="Directory of recorded responses (see the record command)")
+    args = parser.parse_args(argv)
+    app = create_mock_alpha_vantage_app(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_kinds=args.error_kinds,
+        fixtures_dir=args.fixtures
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
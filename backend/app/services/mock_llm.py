@@ -0,0 +1,151 @@
+"""
+Local stand-in for an OpenAI-compatible chat completions API.
+
+Answers POST /v1/chat/completions with deterministic analysis JSON so the LLM
+pipeline can be developed and tested without an API key or network access:
+excerpts are scored with the lexicon, and merge requests (a JSON array of
+analyses) are combined. Optional artificial latency makes concurrency and
+caching effects visible, and /stats counts requests served.
+
+Run:
+    python -m app.services.mock_llm --port 8100 --latency 0.5
+then set LLM_BASE_URL=http://localhost:8100/v1
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+import uuid
+from typing import List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+from app.services.lexicon_sentiment import CATEGORIES, get_lexicon
+
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def _analyze_excerpt(text: str) -> dict:
+    lexicon = get_lexicon()
+    sentences = [s for s in SENTENCE_PATTERN.split(text) if s.strip()] or [text]
+    scores = lexicon.score_texts(sentences)
+    opinion = scores["positive"].sum() + scores["negative"].sum()
+    overall = float((scores["positive"].sum() - scores["negative"].sum()) / (opinion + 1))
+
+    category_insights = []
+    for column, category in enumerate(CATEGORIES):
+        relevant = [i for i in range(len(sentences)) if scores["categories"][i, column] > 0]
+        if not relevant:
+            continue
+        strongest = sorted(relevant, key=lambda i: -abs(scores["sentiment"][i]))[:3]
+        category_insights.append({
+            "category": category.value,
+            "sentiment": round(float(scores["sentiment"][relevant].mean()), 3),
+            "key_points": [sentences[i].strip() for i in strongest],
+            "notable_quotes": [{"text": sentences[strongest[0]].strip(), "speaker": None}]
+        })
+
+    return {
+        "overall_sentiment": round(overall, 3),
+        "sentiment_rationale": f"{int(scores['positive'].sum())} positive and {int(scores['negative'].sum())} negative terms",
+        "category_insights": category_insights,
+        "key_takeaways": [sentences[i].strip() for i in scores["sentiment"].argsort()[::-1][:3]],
+        "investment_implications": "Mock analysis generated locally."
+    }
+
+
+def _merge_analyses(analyses: List[dict]) -> dict:
+    by_category = {}
+    for analysis in analyses:
+        for insight in analysis.get("category_insights", []):
+            merged = by_category.setdefault(insight["category"], {
+                "category": insight["category"], "sentiments": [], "key_points": [], "notable_quotes": []
+            })
+            merged["sentiments"].append(insight["sentiment"])
+            merged["key_points"].extend(p for p in insight["key_points"] if p not in merged["key_points"])
+            merged["notable_quotes"].extend(insight["notable_quotes"])
+
+    return {
+        "overall_sentiment": round(sum(a["overall_sentiment"] for a in analyses) / len(analyses), 3),
+        "sentiment_rationale": "; ".join(a["sentiment_rationale"] for a in analyses),
+        "category_insights": [
+            {
+                "category": merged["category"],
+                "sentiment": round(sum(merged["sentiments"]) / len(merged["sentiments"]), 3),
+                "key_points": merged["key_points"][:5],
+                "notable_quotes": merged["notable_quotes"][:2]
+            }
+            for merged in by_category.values()
+        ],
+        "key_takeaways": [t for a in analyses for t in a["key_takeaways"]][:5],
+        "investment_implications": analyses[0]["investment_implications"]
+    }
+
+
+def create_mock_llm_app(latency: float = 0.0) -> FastAPI:
+    """Mock API app; `latency` seconds are added to every completion"""
+    app = FastAPI(title="Mock LLM API")
+    app.state.requests = 0
+    app.state.in_flight = 0
+    app.state.max_in_flight = 0
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        app.state.in_flight += 1
+        app.state.max_in_flight = max(app.state.max_in_flight, app.state.in_flight)
+        try:
+            if latency:
+                await asyncio.sleep(latency)
+            user = next(m["content"] for m in reversed(body["messages"]) if m["role"] == "user")
+            try:
+                payload = json.loads(user)
+            except ValueError:
+                payload = None
+            result = _merge_analyses(payload) if isinstance(payload, list) else _analyze_excerpt(user)
+        finally:
+            app.state.in_flight -= 1
+
+        content = json.dumps(result)
+        prompt_tokens = sum(len(m["content"]) // 4 for m in body["messages"])
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": prompt_tokens + len(content) // 4
+            }
+        }
+
+    @app.get("/stats")
+    async def stats():
+        return {"requests": app.state.requests, "max_in_flight": app.state.max_in_flight}
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a mock OpenAI-compatible LLM API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every completion")
+    args = parser.parse_args(argv)
+    uvicorn.run(create_mock_llm_app(args.latency), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Minimal in-memory Redis-protocol (RESP2) server.
+
+Stand-in for a real Redis when developing or testing the shared cache tier
+(CACHE_BACKEND=redis) on a machine without one. Supports the commands the
+cache and redis-py's connection setup use: PING, GET, SET (EX/PX/NX/XX),
+MGET, DEL, EXISTS, PTTL, DBSIZE, FLUSHDB/FLUSHALL, SELECT, CLIENT, ECHO and
+INFO. Data lives in one process and is lost on exit.
+
+Run:
+    python -m app.services.mock_redis --port 6380
+then set CACHE_BACKEND=redis and REDIS_URL=redis://localhost:6380/0
+
+In-process:
+    server = MockRedisServer()
+    await server.start()          # server.url -> redis://127.0.0.1:<port>/0
+    ...
+    await server.stop()
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class ProtocolError(Exception):
+    pass
+
+
+async def _read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+    """Read one command (RESP array of bulk strings, or an inline command)"""
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.strip().split()
+    args = []
+    for _ in range(int(line[1:])):
+        header = await reader.readline()
+        if not header.startswith(b"$"):
+            raise ProtocolError("expected bulk string")
+        size = int(header[1:])
+        data = await reader.readexactly(size + 2)
+        args.append(data[:-2])
+    return args
+
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _integer(value: int) -> bytes:
+    return b":%d\r\n" % value
+
+
+def _error(message: str) -> bytes:
+    return f"-ERR {message}\r\n".encode("utf-8")
+
+
+OK = b"+OK\r\n"
+
+
+class MockRedisServer:
+    """Key-value store with millisecond expiry behind a RESP2 socket server"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.commands = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, args: List[bytes]) -> bytes:
+        self.commands += 1
+        command = args[0].upper().decode("ascii", "replace")
+        keys = args[1:]
+        if command == "PING":
+            return b"+PONG\r\n" if not keys else _bulk(keys[0])
+        if command == "ECHO" and keys:
+            return _bulk(keys[0])
+        if command in ("SELECT", "CLIENT"):
+            return OK
+        if command == "GET" and len(keys) == 1:
+            return _bulk(self._get(keys[0]))
+        if command == "MGET" and keys:
+            return b"*%d\r\n" % len(keys) + b"".join(_bulk(self._get(key)) for key in keys)
+        if command == "SET" and len(keys) >= 2:
+            return self._set(keys)
+        if command == "DEL":
+            return _integer(sum(self.data.pop(key, None) is not None for key in keys))
+        if command == "EXISTS":
+            return _integer(sum(self._get(key) is not None for key in keys))
+        if command == "PTTL" and len(keys) == 1:
+            if self._get(keys[0]) is None:
+                return _integer(-2)
+            expires_at = self.data[keys[0]][1]
+            return _integer(-1 if expires_at is None else int((expires_at - time.monotonic()) * 1000))
+        if command == "DBSIZE":
+            return _integer(len(self.data))
+        if command in ("FLUSHDB", "FLUSHALL"):
+            self.data.clear()
+            return OK
+        if command == "INFO":
+            return _bulk(f"# Server\r\nredis_version:7.0.0-mock\r\nkeys:{len(self.data)}\r\n".encode())
+        return _error(f"unknown or malformed command '{command}'")
+
+    def _set(self, args: List[bytes]) -> bytes:
+        key, value = args[0], args[1]
+        expires_at = None
+        nx = xx = False
+        options = [arg.upper() for arg in args[2:]]
+        i = 0
+        while i < len(options):
+            option = options[i]
+            if option in (b"EX", b"PX") and i + 1 < len(options):
+                amount = int(args[2 + i + 1])
+                expires_at = time.monotonic() + (amount if option == b"EX" else amount / 1000)
+                i += 2
+                continue
+            if option == b"NX":
+                nx = True
+            elif option == b"XX":
+                xx = True
+            else:
+                return _error("syntax error")
+            i += 1
+        exists = self._get(key) is not None
+        if (nx and exists) or (xx and not exists):
+            return _bulk(None)
+        self.data[key] = (value, expires_at)
+        return OK
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                args = await _read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                writer.write(self.execute(args))
+                await writer.drain()
+        except (ProtocolError, ValueError, asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+
+async def serve(host: str, port: int):
+    server = MockRedisServer(host, port)
+    await server.start()
+    print(f"Mock Redis listening on {server.url}")
+    await asyncio.Event().wait()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run an in-memory Redis-protocol stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
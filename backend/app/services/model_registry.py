@@ -0,0 +1,309 @@
+"""Registry of preloaded Whisper models with load-adaptive model selection."""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+from app.config import get_settings
+from app.services.local_whisper import LocalWhisperService
+from app.services.metrics import REGISTRY
+from app.services.transcription_cache import TranscriptionCache
+from app.services.whisper_autotune import load_tuning
+
+logger = logging.getLogger(__name__)
+
+QUEUE_WAIT = REGISTRY.histogram(
+    "whisper_queue_wait_seconds",
+    "Time a chunk waits for a free transcription slot"
+)
+
+# Model sizes ordered from fastest to most accurate
+MODEL_LADDER = ["tiny", "base", "small", "medium", "large-v2", "large-v3"]
+
+
+def _rank(size: str) -> int:
+    # Known sizes are ordered by the ladder, unknown ones are kept last
+    return MODEL_LADDER.index(size) if size in MODEL_LADDER else len(MODEL_LADDER)
+
+
+def parse_model_sizes(value: str, model_size: Optional[str] = None) -> List[str]:
+    """
+    Parse a comma-separated list of model sizes (e.g. "base,tiny").
+    "auto" stands for the next smaller size than model_size on the ladder.
+    """
+    sizes = []
+    for size in (part.strip() for part in value.split(",")):
+        if size == "auto":
+            if model_size in MODEL_LADDER and MODEL_LADDER.index(model_size) > 0:
+                sizes.append(MODEL_LADDER[MODEL_LADDER.index(model_size) - 1])
+        elif size:
+            sizes.append(size)
+    return sizes
+
+
+class WhisperModelRegistry:
+    """
+    Holds one LocalWhisperService per configured model size.
+
+    New chunks are routed to the largest model the server can currently keep
+    up with. Queue latency (time a chunk waits for a free transcription slot)
+    is tracked as an exponential moving average; when it exceeds the target
+    the registry steps down to the next smaller model, and when it falls well
+    below the target it steps back up.
+    """
+
+    def __init__(
+        self,
+        model_size: str = "base",
+        fallback_sizes: Optional[List[str]] = None,
+        device: str = "cpu",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        beam_size: int = 5,
+        latency_target_ms: int = 1500,
+        max_concurrency: int = 2,
+        adaptive: bool = True,
+        cooldown_seconds: float = 10.0,
+        result_cache: Optional[TranscriptionCache] = None
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            model_size: Preferred (largest) model size
+            fallback_sizes: Smaller sizes to downgrade to under load (larger
+                ones could never be selected and are ignored)
+            device: Device to run on (cpu, cuda)
+            compute_type: Computation type (int8, int16, float16, float32)
+            cpu_threads: Threads per transcription (0 = CTranslate2 default)
+            num_workers: Parallel transcriptions per model
+            beam_size: Default beam size for decoding
+            latency_target_ms: Queue latency above which new chunks are downgraded
+            max_concurrency: Number of chunks transcribed at the same time
+            adaptive: Whether to switch models based on queue latency
+            cooldown_seconds: Minimum time between two model switches
+            result_cache: Transcription result cache shared by all models
+        """
+        sizes = {model_size}
+        for size in fallback_sizes or []:
+            if _rank(size) > _rank(model_size):
+                logger.warning(
+                    f"Ignoring Whisper fallback model {size}: not smaller than {model_size}"
+                )
+            else:
+                sizes.add(size)
+        self.sizes = sorted(sizes, key=_rank)
+        if adaptive and len(self.sizes) < 2:
+            logger.info("No smaller Whisper fallback model configured, adaptive model selection is off")
+        self.preferred_size = model_size
+        self.latency_target = latency_target_ms / 1000
+        self.max_concurrency = max_concurrency
+        self.adaptive = adaptive
+        self.cooldown_seconds = cooldown_seconds
+        self.result_cache = result_cache
+        self.beam_size = beam_size
+        self.tuned = False
+
+        self._services = self._build_services(device, compute_type, cpu_threads, num_workers)
+        self._level = self.sizes.index(model_size)
+        self._max_level = self._level
+        self._latency_ewma = 0.0
+        self._last_switch = 0.0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _build_services(
+        self,
+        device: str,
+        compute_type: str,
+        cpu_threads: int,
+        num_workers: int
+    ) -> Dict[str, LocalWhisperService]:
+        return {
+            size: LocalWhisperService(
+                model_size=size,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                num_workers=num_workers,
+                result_cache=self.result_cache
+            )
+            for size in self.sizes
+        }
+
+    def apply_tuning(self, config: dict, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Switch to tuned inference settings (see whisper_autotune). Models are
+        rebuilt and loaded again on next use or preload; chunks already being
+        transcribed finish on the old ones.
+
+        Args:
+            loop: Event loop serving transcriptions, when called from another
+                thread; the concurrency limit is raised on that loop
+        """
+        services = self._build_services(
+            config["device"],
+            config["compute_type"],
+            config["cpu_threads"],
+            config["num_workers"]
+        )
+        self.tuned = True
+        self.beam_size = config["beam_size"]
+        # A single reference swap; each chunk keeps the service it started with
+        self._services = services
+        concurrency = max(self.max_concurrency, config["num_workers"])
+        if loop is not None:
+            loop.call_soon_threadsafe(self._raise_concurrency, concurrency)
+        else:
+            self._raise_concurrency(concurrency)
+        logger.info(f"Applied Whisper tuning: {config}")
+
+    def _raise_concurrency(self, concurrency: int):
+        # Chunks may be waiting on the semaphore, so widen it rather than replace it
+        if self._semaphore is not None:
+            for _ in range(concurrency - self.max_concurrency):
+                self._semaphore.release()
+        self.max_concurrency = max(self.max_concurrency, concurrency)
+
+    @property
+    def current_size(self) -> str:
+        """Model size new chunks are currently routed to."""
+        return self.sizes[self._level]
+
+    @property
+    def queue_latency_ms(self) -> float:
+        """Smoothed queue latency in milliseconds."""
+        return self._latency_ewma * 1000
+
+    def get_service(self, model_size: Optional[str] = None) -> LocalWhisperService:
+        """Get the service for a model size (defaults to the current selection)."""
+        return self._services[model_size or self.current_size]
+
+    def preload(self) -> None:
+        """Load and warm up every configured model (blocking)."""
+        for size in self.sizes:
+            service = self._services[size]
+            try:
+                service.warmup()
+            except Exception as e:
+                logger.error(f"Failed to warm up Whisper model {size}: {e}")
+
+    def record_queue_latency(self, seconds: float) -> None:
+        """Update the latency average and switch models if needed."""
+        self._latency_ewma = 0.8 * self._latency_ewma + 0.2 * seconds
+        if not self.adaptive or len(self.sizes) < 2:
+            return
+
+        now = time.monotonic()
+        if now - self._last_switch < self.cooldown_seconds:
+            return
+
+        if self._latency_ewma > self.latency_target and self._level > 0:
+            self._level -= 1
+            self._last_switch = now
+            logger.warning(
+                f"Queue latency {self.queue_latency_ms:.0f}ms over target, "
+                f"downgrading Whisper model to {self.current_size}"
+            )
+        elif self._latency_ewma < self.latency_target / 2 and self._level < self._max_level:
+            self._level += 1
+            self._last_switch = now
+            logger.info(
+                f"Queue latency {self.queue_latency_ms:.0f}ms recovered, "
+                f"upgrading Whisper model to {self.current_size}"
+            )
+
+    async def transcribe(
+        self,
+        audio_data: bytes,
+        language: Optional[str] = None,
+        beam_size: Optional[int] = None,
+        time_offset: float = 0.0,
+        audio_format: str = "webm",
+        timing: Optional[dict] = None
+    ) -> List[dict]:
+        """
+        Transcribe an audio chunk on a worker thread with the currently selected model.
+        The registry's (possibly tuned) beam size is used unless one is given.
+
+        Args:
+            timing: If given, filled with "queue_seconds" and "inference_seconds"
+                (both 0 for cached results)
+
+        Returns:
+            List of segment dictionaries with 'start', 'end', 'text' keys
+        """
+        beam_size = beam_size or self.beam_size
+        # Replayed audio is answered from the result cache without queueing
+        looked_up = self.get_service()
+
+        def lookup():
+            key = looked_up.cache_key(audio_data, language, beam_size, audio_format)
+            return key, looked_up.get_cached(audio_data, language, beam_size, time_offset, audio_format, key)
+
+        if self.result_cache is not None and self.result_cache.cache_dir:
+            # The persistent tier reads files
+            cache_key, cached = await asyncio.to_thread(lookup)
+        else:
+            cache_key, cached = lookup()
+        if cached is not None:
+            if timing is not None:
+                timing.update(queue_seconds=0.0, inference_seconds=0.0)
+            return cached
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        queued_at = time.monotonic()
+        async with self._semaphore:
+            waited = time.monotonic() - queued_at
+            QUEUE_WAIT.observe(waited)
+            self.record_queue_latency(waited)
+            service = self.get_service()
+            started = time.monotonic()
+            segments = await asyncio.to_thread(
+                lambda: list(service.transcribe_stream(
+                    audio_data,
+                    language=language,
+                    beam_size=beam_size,
+                    time_offset=time_offset,
+                    audio_format=audio_format,
+                    # The miss above holds unless the model was switched while queued
+                    cache_key=cache_key if service is looked_up else None
+                ))
+            )
+            if timing is not None:
+                timing.update(queue_seconds=waited, inference_seconds=time.monotonic() - started)
+            return segments
+
+
+# Global instance
+_model_registry: Optional[WhisperModelRegistry] = None
+
+
+def get_model_registry() -> WhisperModelRegistry:
+    """Get or create the global model registry from settings."""
+    global _model_registry
+    if _model_registry is None:
+        settings = get_settings()
+        result_cache = None
+        if settings.transcription_cache_entries > 0:
+            result_cache = TranscriptionCache(
+                max_entries=settings.transcription_cache_entries,
+                cache_dir=settings.transcription_cache_dir or None
+            )
+        _model_registry = WhisperModelRegistry(
+            model_size=settings.whisper_model_size,
+            device=settings.whisper_device,
+            compute_type=settings.whisper_compute_type,
+            fallback_sizes=parse_model_sizes(settings.whisper_fallback_models, settings.whisper_model_size),
+            latency_target_ms=settings.whisper_latency_target_ms,
+            max_concurrency=settings.whisper_max_concurrency,
+            adaptive=settings.whisper_adaptive_models,
+            result_cache=result_cache
+        )
+        tuning = load_tuning(settings.whisper_tuning_file, settings.whisper_model_size, settings.whisper_device)
+        if tuning:
+            _model_registry.apply_tuning(tuning)
+    return _model_registry
@@ -0,0 +1,85 @@
+"""
+Fetch planning and streaming parsing for TIME_SERIES_DAILY.
+
+`outputsize=full` returns 20+ years of prices (several MB of JSON) while
+`compact` returns the last 100 trading days in a few KB. plan_outputsize()
+picks compact whenever the oldest date a caller needs is recent enough; the
+service upgrades a cached compact series to full only when an older date is
+asked for (see AlphaVantageService.get_price_series).
+
+DailyCloseParser reads the response body chunk by chunk and keeps only the
+date and close of each day, so the full document is never held or turned into
+nested dicts.
+"""
+
+import json
+import re
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+# 100 trading days reach back about 145 calendar days; stay inside that so
+# holidays never leave a gap at the start of a compact series
+COMPACT_CALENDAR_DAYS = 135
+
+# One day of the series: "2024-01-31": { ... "4. close": "184.4000", ... }
+_DAY = re.compile(rb'"(\d{4}-\d{2}-\d{2})"\s*:\s*\{[^{}]*?"4\. close"\s*:\s*"([^"]*)"[^{}]*\}')
+
+# Bytes kept for error detection when the body has no daily entries
+MAX_ERROR_BODY = 65536
+
+# Unparsed bytes carried over to the next chunk. A day's object is about 200
+# bytes, so this always holds an unfinished one; anything older cannot match
+MAX_TAIL = 4096
+
+
+def plan_outputsize(since: Optional[date], today: Optional[date] = None) -> str:
+    """Smallest TIME_SERIES_DAILY payload that reaches back to `since`"""
+    if since is None:
+        return "compact"
+    today = today or date.today()
+    return "compact" if since >= today - timedelta(days=COMPACT_CALENDAR_DAYS) else "full"
+
+
+class DailyCloseParser:
+    """Incremental extractor of (date, close) pairs from a TIME_SERIES_DAILY body"""
+
+    def __init__(self):
+        self.dates: List[str] = []
+        self.closes: List[float] = []
+        self._buffer = b""
+        self._head = b""  # Start of the body, for error messages
+
+    def feed(self, chunk: bytes):
+        if len(self._head) < MAX_ERROR_BODY:
+            self._head += chunk[:MAX_ERROR_BODY - len(self._head)]
+        buffer = self._buffer + chunk
+        end = 0
+        for match in _DAY.finditer(buffer):
+            day, close = match.groups()
+            try:
+                value = float(close)
+            except ValueError:
+                value = float("nan")
+            self.dates.append(day.decode("ascii"))
+            self.closes.append(value)
+            end = match.end()
+        # Keep the unfinished tail, bounded so a body without daily entries
+        # (metadata, an error, or not JSON at all) is never held whole
+        self._buffer = buffer[end:][-MAX_TAIL:]
+
+    def finish(self) -> Tuple[List[str], List[float]]:
+        """Dates (oldest first) and closes; raises ValueError for API error bodies"""
+        if not self.dates:
+            try:
+                data = json.loads(self._head)
+            except ValueError:
+                data = {}
+            if isinstance(data, dict):
+                if "Error Message" in data:
+                    raise ValueError(f"Alpha Vantage API error: {data['Error Message']}")
+                if "Note" in data:
+                    raise ValueError(f"Alpha Vantage rate limit: {data['Note']}")
+                if "Information" in data:
+                    raise ValueError(f"Alpha Vantage API error: {data['Information']}")
+        pairs = sorted(zip(self.dates, self.closes))
+        return [day for day, _ in pairs], [close for _, close in pairs]
@@ -0,0 +1,286 @@
+"""
+Opt-in sampled profiling of HTTP requests and WebSocket sessions.
+
+A request is profiled when it carries `X-Profile: 1` (WebSocket handshakes,
+which browsers cannot add headers to, use `?profile=1`) or is picked by
+`profiling_sample_rate`. While any profiled request is in flight, one sampler
+thread reads the event loop thread's stack every `interval` seconds and files
+each sample under the request whose task is running:
+
+- the request's own stack (from the middleware inward) when its task runs,
+  so pydantic construction, loops and JSON encoding show up by function;
+- `(waiting)` when the loop is idle, i.e. the request is awaiting I/O such as
+  an upstream call or a worker thread;
+- `(other tasks)` when another coroutine holds the loop.
+
+Profiles are stored in collapsed-stack format ("frame;frame;frame count" per
+line), which flamegraph.pl, speedscope and inferno read directly. HTTP
+requests slower than `slow_seconds` are listed whether or not they were profiled.
+"""
+
+import asyncio
+import logging
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+WAITING = "(waiting)"
+OTHER_TASKS = "(other tasks)"
+
+# Maps each event loop to the task it is running; shared by the C and Python implementations
+_current_tasks: Optional[dict] = getattr(asyncio.tasks, "_current_tasks", None)
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", Path(code.co_filename).stem)
+    return f"{module}:{code.co_name}"
+
+
+class Profile:
+    """Collapsed-stack samples of one request"""
+
+    def __init__(self, kind: str, method: str, path: str, task: Optional[asyncio.Task]):
+        self.profile_id = str(uuid.uuid4())
+        self.kind = kind
+        self.method = method
+        self.path = path
+        self.task = task
+        self.started_at = datetime.now()
+        self.duration: Optional[float] = None
+        self.status: Optional[int] = None
+        self.stacks: Counter = Counter()
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        """flamegraph.pl / speedscope input, heaviest stacks first"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def to_dict(self) -> dict:
+        return {
+            "profile_id": self.profile_id,
+            "kind": self.kind,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 1) if self.duration is not None else None,
+            "samples": self.samples,
+            "top_frames": [stack.rsplit(";", 1)[-1] for stack, _ in self.stacks.most_common(5)]
+        }
+
+
+class StackSampler:
+    """Background thread sampling the event loop thread while profiles are active"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._active: Dict[str, Profile] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._root_codes = set()
+
+    def add_root(self, code):
+        """Stacks are cut above this code object (the middleware's entry point)"""
+        self._root_codes.add(code)
+
+    def start(self, profile: Profile):
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread_id = threading.get_ident()
+            self._active[profile.profile_id] = profile
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+                self._thread.start()
+
+    def stop(self, profile: Profile):
+        with self._lock:
+            self._active.pop(profile.profile_id, None)
+
+    def _stack(self, frame) -> str:
+        names = []
+        while frame is not None:
+            names.append(_frame_name(frame))
+            if frame.f_code in self._root_codes:
+                break
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                profiles = list(self._active.values())
+                loop, thread_id = self._loop, self._loop_thread_id
+            frame = sys._current_frames().get(thread_id)
+            running = _current_tasks.get(loop) if _current_tasks is not None else None
+            stack = None
+            for profile in profiles:
+                if running is None:
+                    key = WAITING
+                elif profile.task is None or running is profile.task:
+                    if stack is None:
+                        stack = self._stack(frame) if frame is not None else WAITING
+                    key = stack
+                else:
+                    key = OTHER_TASKS
+                profile.stacks[key] += 1
+
+
+class _BoundedDict(dict):
+    """Insertion-ordered dict that drops its oldest entries beyond `maxlen`"""
+
+    def __init__(self, maxlen: int):
+        super().__init__()
+        self.maxlen = maxlen
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        while len(self) > self.maxlen:
+            del self[next(iter(self))]
+
+
+class ProfileStore:
+    """Recent profiles and slow requests, optionally saved as .folded files"""
+
+    def __init__(self, retained: int = 100, slow_seconds: float = 1.0, profile_dir: Optional[str] = None):
+        self.slow_seconds = slow_seconds
+        self.profiles: Dict[str, Profile] = _BoundedDict(retained)
+        self.slow_requests: Deque[dict] = deque(maxlen=retained)
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        if self.profile_dir:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+
+    def add_profile(self, profile: Profile):
+        self.profiles[profile.profile_id] = profile
+        if self.profile_dir:
+            try:
+                (self.profile_dir / f"{profile.profile_id}.folded").write_text(profile.collapsed())
+            except OSError as e:
+                logger.warning(f"Could not save profile {profile.profile_id}: {e}")
+
+    def record_request(self, method: str, path: str, status: Optional[int],
+                       duration: float, profile_id: Optional[str]):
+        if duration >= self.slow_seconds:
+            self.slow_requests.append({
+                "method": method,
+                "path": path,
+                "status": status,
+                "finished_at": datetime.now().isoformat(),
+                "duration_ms": round(duration * 1000, 1),
+                "profile_id": profile_id
+            })
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return self.profiles.get(profile_id)
+
+    def list_profiles(self) -> List[dict]:
+        return [profile.to_dict() for profile in reversed(self.profiles.values())]
+
+    def list_slow_requests(self) -> List[dict]:
+        return sorted(self.slow_requests, key=lambda request: -request["duration_ms"])
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware (not BaseHTTPMiddleware, so the endpoint runs in the
+    request's own task and its samples can be attributed to it)
+    """
+
+    def __init__(self, app, enabled: bool = False, sample_rate: float = 0.0,
+                 sampler: Optional[StackSampler] = None, store: Optional[ProfileStore] = None):
+        self.app = app
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.sampler = sampler or StackSampler()
+        self.store = store or ProfileStore()
+        self.sampler.add_root(ProfilingMiddleware.__call__.__code__)
+
+    def _requested(self, scope) -> bool:
+        if not self.enabled:
+            return False
+        for name, value in scope.get("headers", ()):
+            if name == PROFILE_HEADER:
+                return value.lower() in (b"1", b"true", b"yes")
+        if scope["type"] == "websocket" and b"profile=1" in scope.get("query_string", b""):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        kind = scope["type"]
+        method = scope.get("method", "WS")
+        profile = None
+        if self._requested(scope):
+            profile = Profile(kind, method, scope["path"], asyncio.current_task())
+            self.sampler.start(profile)
+        status = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if profile is not None:
+                    message = {**message, "headers": [
+                        *message.get("headers", []), (PROFILE_ID_HEADER, profile.profile_id.encode())
+                    ]}
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            if profile is not None:
+                self.sampler.stop(profile)
+                profile.duration = duration
+                profile.status = status
+                self.store.add_profile(profile)
+                logger.info(f"Profiled {method} {scope['path']}: {duration * 1000:.0f}ms, {profile.samples} samples")
+            if kind == "http":
+                # WebSocket sessions are long by design; only their profiles are kept
+                self.store.record_request(
+                    method, scope["path"], status, duration,
+                    profile.profile_id if profile is not None else None
+                )
+
+
+# Global instance
+_profile_store: Optional[ProfileStore] = None
+
+
+def get_profile_store() -> ProfileStore:
+    """Get or create the global profile store from settings"""
+    global _profile_store
+    if _profile_store is None:
+        settings = get_settings()
+        _profile_store = ProfileStore(
+            retained=settings.profiling_retained,
+            slow_seconds=settings.profiling_slow_ms / 1000,
+            profile_dir=settings.profiling_dir or None
+        )
+    return _profile_store
@@ -0,0 +1,104 @@
+"""Content-addressed cache of JSON results (transcriptions, LLM analyses)."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    Caches JSON-serializable results by a hash of their input plus everything
+    that changes the output (see make_key).
+
+    An in-memory LRU tier is always used; a directory of JSON files can be added
+    as a persistent tier that survives restarts and is shared by processes on
+    the same host.
+    """
+
+    def __init__(self, max_entries: int = 2048, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(data: bytes, **params) -> str:
+        """Hash input bytes together with everything that changes the output"""
+        digest = hashlib.sha256(data)
+        digest.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get the result for a key, or None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        if self.cache_dir:
+            try:
+                value = json.loads(self._path(key).read_text())
+            except FileNotFoundError:
+                value = None
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable cache entry {key}: {e}")
+                value = None
+            if value is not None:
+                self._remember(key, value)
+                with self._lock:
+                    self.hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any):
+        """Store a result"""
+        self._remember(key, value)
+        if self.cache_dir:
+            path = self._path(key)
+            try:
+                path.parent.mkdir(exist_ok=True)
+                # Write then rename so concurrent readers never see a partial file
+                tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+                tmp_path.write_text(json.dumps(value))
+                tmp_path.replace(path)
+            except OSError as e:
+                logger.warning(f"Failed to persist cache entry {key}: {e}")
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        """get() for async callers: the disk tier is read on a worker thread"""
+        if self.cache_dir is None:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(self, key: str, value: Any):
+        """set() for async callers: the disk tier is written on a worker thread"""
+        if self.cache_dir is None:
+            self.set(key, value)
+        else:
+            await asyncio.to_thread(self.set, key, value)
+
+    def _remember(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
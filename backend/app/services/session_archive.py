@@ -0,0 +1,259 @@
+"""Append-only archive of live transcription sessions (received audio and emitted segments)."""
+
+import asyncio
+import json
+import logging
+import mmap
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Each session is a directory with two append-only files:
+#   data.bin   - record payloads back to back (audio bytes, or segments as JSON)
+#   index.bin  - one fixed-width INDEX_DTYPE entry per record, in append order
+# Data is always written before its index entries, so a crash can leave unindexed
+# bytes at the end of data.bin but never an index entry pointing past the data.
+INDEX_DTYPE = np.dtype([
+    ("time_offset", "<f8"),  # seconds into the session
+    ("offset", "<u8"),  # position in data.bin
+    ("length", "<u4"),
+    ("kind", "u1"),
+    ("format", "u1"),
+    ("reserved", "<u2"),
+])
+
+KIND_AUDIO = 1
+KIND_SEGMENTS = 2
+
+AUDIO_FORMATS = ["webm", "pcm16"]
+
+
+class ArchiveRecord(NamedTuple):
+    """Single archived record"""
+    index: int
+    time_offset: float
+    kind: int
+    audio_format: Optional[str]
+    data: bytes
+
+
+class SessionArchiveWriter:
+    """
+    Buffered writer for one session.
+
+    Appends only touch memory; buffers are written to disk in batches (by size or
+    age) on a worker thread so the live WebSocket loop never waits on disk I/O.
+    """
+
+    def __init__(self, path: Path, flush_bytes: int = 1024 * 1024, flush_interval: float = 5.0):
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._data_file = open(self.path / "data.bin", "ab")
+        self._index_file = open(self.path / "index.bin", "ab")
+        self._data_size = self._data_file.tell()
+        self._data: List[bytes] = []
+        self._index: List[tuple] = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        self._flush_lock = asyncio.Lock()
+        self._closed = False
+
+    def _append(self, time_offset: float, kind: int, audio_format: int, data: bytes):
+        self._index.append((time_offset, self._data_size, len(data), kind, audio_format, 0))
+        self._data.append(data)
+        self._data_size += len(data)
+        self._buffered_bytes += len(data)
+
+    def append_audio(self, time_offset: float, audio_format: str, audio: bytes):
+        """Buffer a received audio chunk"""
+        self._append(time_offset, KIND_AUDIO, AUDIO_FORMATS.index(audio_format), audio)
+
+    def append_segments(self, time_offset: float, segments: List[dict]):
+        """Buffer the segments emitted for the chunk at time_offset"""
+        if segments:
+            self._append(time_offset, KIND_SEGMENTS, 0, json.dumps(segments).encode("utf-8"))
+
+    def _write(self, data: List[bytes], index: List[tuple]):
+        self._data_file.write(b"".join(data))
+        self._data_file.flush()
+        self._index_file.write(np.array(index, dtype=INDEX_DTYPE).tobytes())
+        self._index_file.flush()
+
+    async def flush(self):
+        """Write buffered records to disk on a worker thread"""
+        async with self._flush_lock:
+            if not self._index:
+                return
+            data, index = self._data, self._index
+            self._data, self._index, self._buffered_bytes = [], [], 0
+            self._last_flush = time.monotonic()
+            await asyncio.to_thread(self._write, data, index)
+
+    async def maybe_flush(self):
+        """Flush once enough bytes are buffered or the buffer is old enough"""
+        if self._buffered_bytes >= self.flush_bytes or (
+            self._index and time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            await self.flush()
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self.flush()
+        finally:
+            self._data_file.close()
+            self._index_file.close()
+
+
+class SessionArchiveReader:
+    """Memory-mapped, random-access reader for one archived session"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        # Index before data: a flush in between then only adds unindexed data
+        self._index_map = self._map(path / "index.bin")
+        self._data = self._map(path / "data.bin")
+        count = len(self._index_map) // INDEX_DTYPE.itemsize if self._index_map is not None else 0
+        index = (
+            np.frombuffer(self._index_map, dtype=INDEX_DTYPE, count=count)
+            if count else np.empty(0, dtype=INDEX_DTYPE)
+        )
+        # Entries past the mapped data (e.g. a data file truncated by hand) are dropped
+        data_size = len(self._data) if self._data is not None else 0
+        complete = index["offset"] + index["length"] <= data_size
+        self.index = index if complete.all() else index[complete]
+        # Records are appended in time order; sort defensively for binary search
+        self._order = np.argsort(self.index["time_offset"], kind="stable")
+        self._sorted_offsets = self.index["time_offset"][self._order]
+
+    @staticmethod
+    def _map(path: Path) -> Optional[mmap.mmap]:
+        if not path.exists() or path.stat().st_size == 0:
+            return None
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def duration_seconds(self) -> float:
+        return float(self._sorted_offsets[-1]) if len(self.index) else 0.0
+
+    def count(self, kind: int) -> int:
+        return int(np.count_nonzero(self.index["kind"] == kind))
+
+    def record(self, position: int) -> ArchiveRecord:
+        entry = self.index[position]
+        start = int(entry["offset"])
+        kind = int(entry["kind"])
+        return ArchiveRecord(
+            index=position,
+            time_offset=float(entry["time_offset"]),
+            kind=kind,
+            audio_format=AUDIO_FORMATS[entry["format"]] if kind == KIND_AUDIO else None,
+            data=self._data[start:start + int(entry["length"])]
+        )
+
+    def records(
+        self,
+        kind: Optional[int] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None
+    ) -> Iterator[ArchiveRecord]:
+        """Records with start <= time_offset < end, in time order"""
+        lo = np.searchsorted(self._sorted_offsets, start, side="left") if start is not None else 0
+        hi = np.searchsorted(self._sorted_offsets, end, side="left") if end is not None else len(self.index)
+        for position in self._order[lo:hi]:
+            if kind is None or self.index[position]["kind"] == kind:
+                yield self.record(int(position))
+
+    def segments(self, start: Optional[float] = None, end: Optional[float] = None) -> List[dict]:
+        """Segments emitted for chunks starting in [start, end)"""
+        return [
+            segment
+            for record in self.records(KIND_SEGMENTS, start, end)
+            for segment in json.loads(record.data)
+        ]
+
+    def close(self):
+        # The index array views the mmap; drop it before closing
+        self.index = np.empty(0, dtype=INDEX_DTYPE)
+        self._order = np.empty(0, dtype=np.int64)
+        self._sorted_offsets = np.empty(0)
+        for mapped in (self._data, self._index_map):
+            if mapped is not None:
+                mapped.close()
+
+
+class SessionArchive:
+    """Directory of archived sessions"""
+
+    def __init__(self, root: str, flush_bytes: int = 1024 * 1024, flush_interval: float = 5.0):
+        self.root = Path(root)
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _session_path(self, session_id: str) -> Path:
+        path = (self.root / session_id).resolve()
+        if path.parent != self.root.resolve():
+            raise ValueError(f"Invalid session id: {session_id}")
+        return path
+
+    def open_writer(self, session_id: str) -> SessionArchiveWriter:
+        return SessionArchiveWriter(self._session_path(session_id), self.flush_bytes, self.flush_interval)
+
+    def open_reader(self, session_id: str) -> SessionArchiveReader:
+        path = self._session_path(session_id)
+        if not path.is_dir():
+            raise ValueError(f"Session {session_id} not found")
+        return SessionArchiveReader(path)
+
+    def list_sessions(self) -> List[dict]:
+        sessions = []
+        for path in sorted(self.root.iterdir(), key=lambda p: p.stat().st_mtime, reverse=True):
+            if not (path / "index.bin").exists():
+                continue
+            reader = SessionArchiveReader(path)
+            try:
+                sessions.append({
+                    "session_id": path.name,
+                    "updated_at": datetime.fromtimestamp(path.stat().st_mtime).isoformat(),
+                    "duration_seconds": reader.duration_seconds,
+                    "audio_chunks": reader.count(KIND_AUDIO),
+                    "segment_batches": reader.count(KIND_SEGMENTS)
+                })
+            finally:
+                reader.close()
+        return sessions
+
+
+# Global instance
+_session_archive: Optional[SessionArchive] = None
+
+
+def get_session_archive() -> Optional[SessionArchive]:
+    """Get the session archive, or None if archiving is disabled"""
+    global _session_archive
+    if _session_archive is None:
+        settings = get_settings()
+        if not settings.session_archive_dir:
+            return None
+        _session_archive = SessionArchive(
+            settings.session_archive_dir,
+            flush_bytes=settings.session_archive_flush_bytes,
+            flush_interval=settings.session_archive_flush_seconds
+        )
+    return _session_archive
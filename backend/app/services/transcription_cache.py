@@ -0,0 +1,22 @@
+"""Content-addressed cache of transcription results for replayed audio."""
+
+from typing import List
+
+from app.services.result_cache import ResultCache
+
+
+class TranscriptionCache(ResultCache):
+    """
+    Caches segments by a hash of the audio bytes plus model and decode parameters.
+
+    Segments are stored relative to the start of the audio (offset 0) so a hit can
+    be re-offset to wherever the same audio appears in a new session.
+    """
+
+
+def offset_segments(segments: List[dict], time_offset: float) -> List[dict]:
+    """Copy segments with time_offset added to every timestamp"""
+    return [
+        {**segment, "start": segment["start"] + time_offset, "end": segment["end"] + time_offset}
+        for segment in segments
+    ]
@@ -0,0 +1,340 @@
+"""
+Per-ticker cross-quarter trend table.
+
+Each ticker has one materialized table with a row per fiscal quarter: EPS and
+surprise, QoQ / YoY EPS change, the share price reaction around the report,
+and lexicon sentiment overall and per analysis category. Tables are stored
+columnar (one NumPy array per column in a single .npz file), so serving a
+ticker's trends is one file read.
+
+Refreshing is incremental: earnings history is one upstream call, and only
+quarters not yet in the table cost a transcript fetch and scoring. Quarters
+whose price reaction is still missing are retried with the next price fetch.
+Derived columns (QoQ, YoY) are recomputed over the whole table with array
+operations.
+"""
+
+import asyncio
+import io
+import logging
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.config import get_settings
+from app.models.analysis import AnalysisCategory
+from app.models.company import CompanyTrends, QuarterTrend
+from app.models.records import EarningsRecord, PriceSeriesRecord
+from app.services.alpha_vantage import AlphaVantageService
+from app.services.lexicon_sentiment import get_lexicon
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT_COLUMNS = [f"sentiment_{category.value}" for category in AnalysisCategory]
+
+# Column name -> dtype. Missing numbers are NaN.
+COLUMNS = {
+    "fiscal_date": "datetime64[D]",
+    "report_date": "datetime64[D]",
+    "year": np.int16,
+    "quarter": np.int8,
+    "reported_eps": np.float64,
+    "estimated_eps": np.float64,
+    "surprise_pct": np.float64,
+    "eps_qoq_pct": np.float64,
+    "eps_yoy_pct": np.float64,
+    "price_before": np.float64,
+    "price_after": np.float64,
+    "price_reaction_pct": np.float64,
+    "has_transcript": np.bool_,
+    "overall_sentiment": np.float64,
+    **{name: np.float64 for name in SENTIMENT_COLUMNS},
+}
+
+# Quarters this recent are re-checked for a transcript that was not yet published
+TRANSCRIPT_RETRY_DAYS = 30
+
+Table = Dict[str, np.ndarray]
+
+
+def empty_table(rows: int = 0) -> Table:
+    table = {}
+    for name, dtype in COLUMNS.items():
+        column = np.empty(rows, dtype=dtype)
+        if np.issubdtype(column.dtype, np.floating):
+            column.fill(np.nan)
+        elif column.dtype.kind == "M":
+            column.fill(np.datetime64("NaT"))
+        else:
+            column.fill(0)
+        table[name] = column
+    return table
+
+
+def _to_float(value: Optional[str]) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _pct_change(current: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = (current - previous) / np.abs(previous) * 100
+    change[~np.isfinite(change)] = np.nan
+    return change
+
+
+def _lagged(period: np.ndarray, values: np.ndarray, lag: int) -> np.ndarray:
+    """Each row's value `lag` quarters earlier, matched by period (NaN where that quarter is missing)"""
+    lagged = np.full(len(period), np.nan)
+    if len(period):
+        order = np.argsort(period)
+        position = np.clip(np.searchsorted(period[order], period - lag), 0, len(period) - 1)
+        found = period[order][position] == period - lag
+        lagged[found] = values[order][position][found]
+    return lagged
+
+
+def compute_derived(table: Table):
+    """Recompute QoQ and YoY EPS change for every row"""
+    eps = table["reported_eps"]
+    # Previous quarter and same quarter a year earlier, matched by (year, quarter)
+    # rather than position so a gap in the history never pairs the wrong quarters
+    period = table["year"].astype(np.int64) * 4 + table["quarter"]
+    table["eps_qoq_pct"] = _pct_change(eps, _lagged(period, eps, 1))
+    table["eps_yoy_pct"] = _pct_change(eps, _lagged(period, eps, 4))
+
+
+def price_reactions(report_dates: np.ndarray, prices: Optional[PriceSeriesRecord]) -> tuple:
+    """
+    Close before and after each report date and the % move between them.
+    'Before' is the last trading day before the report, 'after' the first trading
+    day after it, which covers both pre-market and after-close reports.
+    """
+    n = len(report_dates)
+    if prices is None or not prices.dates or n == 0:
+        return np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan)
+
+    dates = np.array(prices.dates, dtype="datetime64[D]")  # Already sorted
+    closes = np.array(prices.closes, dtype=np.float64)
+
+    before_index = np.searchsorted(dates, report_dates, side="left") - 1
+    after_index = np.searchsorted(dates, report_dates, side="right")
+    valid_before = (before_index >= 0) & ~np.isnat(report_dates)
+    valid_after = (after_index < len(dates)) & ~np.isnat(report_dates)
+    before = np.where(valid_before, closes[np.clip(before_index, 0, len(dates) - 1)], np.nan)
+    after = np.where(valid_after, closes[np.clip(after_index, 0, len(dates) - 1)], np.nan)
+    return before, after, _pct_change(after, before)
+
+
+class TrendStore:
+    """Materialized per-ticker trend tables, in memory and optionally on disk"""
+
+    def __init__(self, root: Optional[str] = None, max_age_seconds: float = 12 * 3600):
+        self.root = Path(root) if root else None
+        self.max_age_seconds = max_age_seconds
+        self._tables: Dict[str, Table] = {}
+        self._updated: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        if self.root:
+            self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, ticker: str) -> Path:
+        return self.root / f"{ticker}.npz"
+
+    def _read(self, ticker: str) -> Optional[tuple]:
+        """(table, updated_at) from disk, or None"""
+        if not self.root or not self._path(ticker).exists():
+            return None
+        try:
+            with np.load(self._path(ticker)) as data:
+                table = {name: data[name] for name in COLUMNS if name in data}
+                updated = float(data["updated_at"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable trend table for {ticker}: {e}")
+            return None
+        if len(table) != len(COLUMNS):
+            # Written by an older version with different columns: rebuild
+            return None
+        return table, updated
+
+    async def load(self, ticker: str) -> Optional[Table]:
+        """A ticker's table from memory or disk (one file read, on a worker thread), or None"""
+        if ticker in self._tables:
+            return self._tables[ticker]
+        stored = await asyncio.to_thread(self._read, ticker)
+        if stored is None:
+            return None
+        self._tables[ticker], self._updated[ticker] = stored
+        return stored[0]
+
+    def peek(self, ticker: str) -> Optional[Table]:
+        """Like load(), but a table read from disk is not kept in memory (for scans over many tickers)"""
+        if ticker in self._tables:
+            return self._tables[ticker]
+        stored = self._read(ticker)
+        return stored[0] if stored else None
+
+    def _write(self, ticker: str, table: Table, updated: float):
+        buffer = io.BytesIO()
+        np.savez(buffer, updated_at=np.float64(updated), **table)
+        # Write then rename so readers never see a partial file
+        tmp_path = self._path(ticker).with_suffix(".tmp")
+        tmp_path.write_bytes(buffer.getvalue())
+        tmp_path.replace(self._path(ticker))
+
+    async def save(self, ticker: str, table: Table):
+        self._tables[ticker] = table
+        self._updated[ticker] = time.time()
+        if self.root:
+            await asyncio.to_thread(self._write, ticker, table, self._updated[ticker])
+
+    def is_fresh(self, ticker: str) -> bool:
+        return time.time() - self._updated.get(ticker, 0.0) < self.max_age_seconds
+
+    async def _score_transcript(self, service: AlphaVantageService, call: EarningsRecord) -> Optional[dict]:
+        try:
+            transcript = await service.get_earnings_call_transcript(call.ticker, call.quarter, call.year)
+        except Exception as e:
+            logger.info(f"No transcript for {call.ticker} {call.quarter} {call.year}: {e}")
+            return None
+        point = await asyncio.to_thread(get_lexicon().transcript_sentiment, transcript.entries)
+        if point is None:
+            return None
+        return {
+            "overall_sentiment": point.overall_sentiment,
+            **{f"sentiment_{name}": value for name, value in point.category_sentiments.items()}
+        }
+
+    async def refresh(self, ticker: str, service: AlphaVantageService) -> Table:
+        """Add quarters that are new since the last refresh and recompute derived columns"""
+        earnings = await service.get_earnings(ticker)
+        table = await self.load(ticker)
+        if table is None:
+            table = empty_table()
+
+        known = {str(date): i for i, date in enumerate(table["fiscal_date"])}
+        today = np.datetime64(datetime.now().date(), "D")
+        pending: List[tuple] = []  # (row or None, call)
+        for call in earnings:
+            if not call.fiscal_date_ending:
+                continue
+            row = known.get(call.fiscal_date_ending)
+            if row is None:
+                pending.append((None, call))
+            elif not table["has_transcript"][row] and (
+                today - table["report_date"][row] <= np.timedelta64(TRANSCRIPT_RETRY_DAYS, "D")
+            ):
+                pending.append((row, call))
+
+        # Rows whose price reaction is missing, e.g. because the price fetch failed
+        # last time, are retried; reports from today have no 'after' close yet
+        missing_prices = np.isnan(table["price_reaction_pct"]) & (table["report_date"] < today)
+
+        if pending or missing_prices.any():
+            new_rows = [call for row, call in pending if row is None]
+            logger.info(f"Refreshing trends for {ticker}: {len(new_rows)} new quarters, "
+                        f"{len(pending) - len(new_rows)} awaiting transcripts, "
+                        f"{int(missing_prices.sum())} missing price reactions")
+            additions = empty_table(len(new_rows))
+            for i, call in enumerate(new_rows):
+                additions["fiscal_date"][i] = np.datetime64(call.fiscal_date_ending, "D")
+                additions["report_date"][i] = np.datetime64(call.date or call.fiscal_date_ending, "D")
+                additions["year"][i] = call.year
+                additions["quarter"][i] = int(call.quarter[1:])
+                additions["reported_eps"][i] = _to_float(call.reported_eps)
+                additions["estimated_eps"][i] = _to_float(call.estimated_eps)
+                additions["surprise_pct"][i] = _to_float(call.surprise_percentage)
+            table = {name: np.concatenate((table[name], additions[name])) for name in COLUMNS}
+
+            # NaT compares False, so rows without a report date are never fetched for
+            missing_prices = np.isnan(table["price_reaction_pct"]) & (table["report_date"] < today)
+            if missing_prices.any():
+                # Only as far back as the oldest missing report: a routine refresh
+                # adding the latest quarter fits the compact series
+                since = table["report_date"][missing_prices].min().astype(date) - timedelta(days=7)
+                try:
+                    prices = await service.get_price_series(ticker, since=since)
+                except Exception as e:
+                    logger.warning(f"No daily prices for {ticker}: {e}")
+                    prices = None
+                before, after, reaction = price_reactions(table["report_date"][missing_prices], prices)
+                table["price_before"][missing_prices] = before
+                table["price_after"][missing_prices] = after
+                table["price_reaction_pct"][missing_prices] = reaction
+
+            # Transcripts are the expensive part; fetch and score them concurrently
+            rows, next_row = [], len(known)
+            for row, _ in pending:
+                if row is None:
+                    row, next_row = next_row, next_row + 1
+                rows.append(row)
+            scores = await asyncio.gather(*[self._score_transcript(service, call) for _, call in pending])
+            for row, score in zip(rows, scores):
+                if score is not None:
+                    table["has_transcript"][row] = True
+                    for name, value in score.items():
+                        if name in table:
+                            table[name][row] = value
+
+            order = np.argsort(table["fiscal_date"])
+            table = {name: column[order] for name, column in table.items()}
+            compute_derived(table)
+        await self.save(ticker, table)
+        return table
+
+    async def get_trends(self, ticker: str, service: AlphaVantageService, refresh: bool = False) -> CompanyTrends:
+        """Serve a ticker's trends, refreshing first if stale or requested"""
+        lock = self._locks.setdefault(ticker, asyncio.Lock())
+        async with lock:
+            table = await self.load(ticker)
+            if table is None or refresh or not self.is_fresh(ticker):
+                table = await self.refresh(ticker, service)
+        return to_model(ticker, table, self._updated[ticker])
+
+
+def to_model(ticker: str, table: Table, updated_at: float) -> CompanyTrends:
+    columns = {name: column.tolist() for name, column in table.items()}
+    clean = lambda value: None if isinstance(value, float) and np.isnan(value) else value
+    quarters = []
+    for i in range(len(table["fiscal_date"])):
+        quarters.append(QuarterTrend(
+            quarter=f"Q{columns['quarter'][i]}",
+            year=columns["year"][i],
+            fiscal_date_ending=str(table["fiscal_date"][i]),
+            report_date=str(table["report_date"][i]),
+            reported_eps=clean(columns["reported_eps"][i]),
+            estimated_eps=clean(columns["estimated_eps"][i]),
+            surprise_percentage=clean(columns["surprise_pct"][i]),
+            eps_qoq_change=clean(columns["eps_qoq_pct"][i]),
+            eps_yoy_change=clean(columns["eps_yoy_pct"][i]),
+            price_before=clean(columns["price_before"][i]),
+            price_after=clean(columns["price_after"][i]),
+            price_reaction=clean(columns["price_reaction_pct"][i]),
+            overall_sentiment=clean(columns["overall_sentiment"][i]),
+            category_sentiments={
+                category.value: clean(columns[f"sentiment_{category.value}"][i])
+                for category in AnalysisCategory
+            } if columns["has_transcript"][i] else {}
+        ))
+    return CompanyTrends(ticker=ticker, updated_at=datetime.fromtimestamp(updated_at), quarters=quarters)
+
+
+# Global instance
+_trend_store: Optional[TrendStore] = None
+
+
+def get_trend_store() -> TrendStore:
+    """Get or create the global trend store from settings"""
+    global _trend_store
+    if _trend_store is None:
+        settings = get_settings()
+        _trend_store = TrendStore(
+            root=settings.trend_store_dir or None,
+            max_age_seconds=settings.trend_refresh_hours * 3600
+        )
+    return _trend_store
@@ -0,0 +1,282 @@
+"""
+Hardware-aware tuning of Whisper inference settings.
+
+Detects the CPU (core count, SIMD features, compute types CTranslate2 supports),
+benchmarks compute_type / cpu_threads / num_workers / beam_size combinations on
+a short speech fixture, and persists the fastest combination whose word error
+rate stays within a threshold. The model registry applies the saved tuning at
+startup when it matches the current hardware.
+
+Run:
+    python -m app.services.whisper_autotune --model-size base
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from app.config import get_settings
+from app.services.local_whisper import LocalWhisperService
+from app.services.speech_fixture import SAMPLE_RATE, SpeechFixture, load_fixture, to_pcm16
+
+logger = logging.getLogger(__name__)
+
+# SIMD features that matter for CTranslate2 CPU kernels
+SIMD_FEATURES = [
+    "sse4_2", "avx", "avx2", "fma", "avx512f", "avx512bw", "avx512_vnni", "avx_vnni",
+    "avx512_bf16", "amx_int8", "asimd", "asimddp", "i8mm", "sve"
+]
+
+# Compute types tried on CPU, in order of expected speed
+CPU_COMPUTE_TYPES = ["int8", "int8_float32", "int16", "float32"]
+
+# Numeric precision rank, used to pick a reference run when the fixture has no transcript
+PRECISION = {"int8": 0, "int8_float32": 1, "int8_float16": 1, "int16": 2, "float16": 2, "float32": 3}
+
+
+def detect_simd_features() -> List[str]:
+    """SIMD features of this CPU (Linux /proc/cpuinfo, macOS sysctl)"""
+    flags = set()
+    try:
+        if sys.platform == "darwin":
+            output = subprocess.run(
+                ["sysctl", "-n", "machdep.cpu.features", "machdep.cpu.leaf7_features"],
+                capture_output=True, text=True
+            ).stdout
+            flags = {flag.lower().replace(".", "_") for flag in output.split()}
+            if platform.machine() == "arm64":
+                # Apple Silicon always has NEON with dot product
+                flags |= {"asimd", "asimddp"}
+        else:
+            for line in Path("/proc/cpuinfo").read_text().splitlines():
+                if line.startswith(("flags", "Features")):
+                    flags = set(line.split(":", 1)[1].split())
+                    break
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Could not detect SIMD features: {e}")
+    return [feature for feature in SIMD_FEATURES if feature in flags]
+
+
+def available_cores() -> int:
+    """Cores this process may run on (respects CPU affinity / container limits)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def detect_hardware(device: str = "cpu") -> dict:
+    """Hardware fingerprint; saved tuning is only applied on matching hardware"""
+    import ctranslate2
+    return {
+        "machine": platform.machine(),
+        "cores": available_cores(),
+        "simd": detect_simd_features(),
+        "device": device,
+        "compute_types": sorted(ctranslate2.get_supported_compute_types(device))
+    }
+
+
+def candidate_configs(hardware: dict, beam_sizes: List[int]) -> List[dict]:
+    """Combinations to benchmark for this hardware"""
+    cores = hardware["cores"]
+    if hardware["device"] == "cpu":
+        compute_types = [c for c in CPU_COMPUTE_TYPES if c in hardware["compute_types"]]
+    else:
+        compute_types = [c for c in ["int8_float16", "float16", "int8"] if c in hardware["compute_types"]]
+    # Split the cores between parallel workers: one wide worker up to one per 2 cores
+    worker_counts = sorted({w for w in (1, 2, 4, cores // 2) if 1 <= w <= max(1, cores // 2)})
+
+    return [
+        {
+            "device": hardware["device"],
+            "compute_type": compute_type,
+            "cpu_threads": max(1, cores // workers),
+            "num_workers": workers,
+            "beam_size": beam_size
+        }
+        for compute_type in compute_types
+        for workers in worker_counts
+        for beam_size in beam_sizes
+    ]
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance divided by the reference length"""
+    normalize = lambda text: "".join(c for c in text.lower() if c.isalnum() or c.isspace()).split()
+    ref, hyp = normalize(reference), normalize(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            ))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def measure_config(model_size: str, config: dict, fixture: SpeechFixture, chunk_ms: int = 3000) -> dict:
+    """Stream the fixture through one configuration from num_workers sessions at once"""
+    service = LocalWhisperService(
+        model_size=model_size,
+        device=config["device"],
+        compute_type=config["compute_type"],
+        cpu_threads=config["cpu_threads"],
+        num_workers=config["num_workers"]
+    )
+    service.warmup()
+    size = int(SAMPLE_RATE * chunk_ms / 1000)
+    chunks = [to_pcm16(fixture.samples[i:i + size]) for i in range(0, len(fixture.samples), size)]
+
+    def session(_) -> str:
+        texts = []
+        for index, chunk in enumerate(chunks):
+            for segment in service.transcribe_stream(
+                chunk,
+                language="en",
+                beam_size=config["beam_size"],
+                time_offset=index * chunk_ms / 1000,
+                audio_format="pcm16"
+            ):
+                texts.append(segment["text"])
+        return " ".join(texts)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=config["num_workers"]) as pool:
+        transcripts = list(pool.map(session, range(config["num_workers"])))
+    wall = time.perf_counter() - started
+
+    return {
+        **config,
+        "throughput": round(fixture.duration_seconds * config["num_workers"] / wall, 3),
+        "rtf": round(wall / fixture.duration_seconds, 4),
+        "transcript": transcripts[0]
+    }
+
+
+def autotune(
+    model_size: str,
+    device: str = "cpu",
+    fixture: Optional[SpeechFixture] = None,
+    beam_sizes: Optional[List[int]] = None,
+    max_wer: float = 0.15
+) -> dict:
+    """
+    Benchmark candidate configurations and pick the one with the highest throughput
+    among those within max_wer of the reference transcript. Without a reference
+    transcript, the most precise configuration's output is used as the reference.
+    """
+    hardware = detect_hardware(device)
+    fixture = fixture or load_fixture(duration_seconds=20.0)
+    configs = candidate_configs(hardware, beam_sizes or [1, 5])
+    logger.info(
+        f"Autotuning {model_size} on {hardware['cores']} cores "
+        f"(SIMD: {', '.join(hardware['simd']) or 'none'}), {len(configs)} configurations"
+    )
+
+    results = []
+    for config in configs:
+        try:
+            result = measure_config(model_size, config, fixture)
+        except Exception as e:
+            logger.warning(f"Configuration {config} failed: {e}")
+            continue
+        results.append(result)
+        logger.info(
+            f"{config['compute_type']:>12} threads={config['cpu_threads']} workers={config['num_workers']} "
+            f"beam={config['beam_size']}: {result['throughput']:.2f} audio-s/s"
+        )
+    if not results:
+        raise RuntimeError("No Whisper configuration could be benchmarked")
+
+    reference = fixture.reference_text
+    if reference is None:
+        # Highest precision with the widest beam is the most accurate run
+        reference = max(
+            results,
+            key=lambda r: (PRECISION.get(r["compute_type"], 0), r["beam_size"])
+        )["transcript"]
+    for result in results:
+        result["wer"] = round(word_error_rate(reference, result.pop("transcript")), 4)
+
+    accurate = [r for r in results if r["wer"] <= max_wer]
+    if not accurate:
+        logger.warning(f"No configuration within WER {max_wer}; using the most accurate one")
+        accurate = [min(results, key=lambda r: r["wer"])]
+    best = max(accurate, key=lambda r: r["throughput"])
+
+    return {
+        "tuned_at": datetime.now().isoformat(),
+        "model_size": model_size,
+        "fixture": fixture.name,
+        "max_wer": max_wer,
+        "hardware": hardware,
+        "config": {key: best[key] for key in ("device", "compute_type", "cpu_threads", "num_workers", "beam_size")},
+        "results": results
+    }
+
+
+def save_tuning(path: str, tuning: dict):
+    Path(path).write_text(json.dumps(tuning, indent=2))
+
+
+def load_tuning(path: str, model_size: str, device: str = "cpu") -> Optional[dict]:
+    """Saved tuning config for this model size, if it was measured on this hardware"""
+    try:
+        tuning = json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable Whisper tuning file {path}: {e}")
+        return None
+
+    if tuning.get("model_size") != model_size:
+        logger.info(f"Whisper tuning in {path} is for {tuning.get('model_size')}, not {model_size}")
+        return None
+    if tuning.get("hardware") != detect_hardware(device):
+        logger.warning(f"Whisper tuning in {path} was measured on different hardware; re-run autotune")
+        return None
+    return tuning["config"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Tune Whisper inference settings for this machine")
+    parser.add_argument("--model-size", default=settings.whisper_model_size)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--beam-size", nargs="+", type=int, default=[1, 5])
+    parser.add_argument("--max-wer", type=float, default=settings.whisper_autotune_max_wer)
+    parser.add_argument("--fixture", help="Audio file (reference text in a sibling .txt)")
+    parser.add_argument("--output", default=settings.whisper_tuning_file)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    tuning = autotune(
+        args.model_size,
+        device=args.device,
+        fixture=load_fixture(args.fixture, 20.0) if args.fixture else None,
+        beam_sizes=args.beam_size,
+        max_wer=args.max_wer
+    )
+    save_tuning(args.output, tuning)
+    print(f"Best configuration: {tuning['config']}")
+    print(f"Saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""WebSocket endpoint for following an analysis session's progress."""
+
+import logging
+from fastapi import WebSocket, WebSocketDisconnect
+from app.services.analysis_sessions import get_analysis_session_manager
+
+logger = logging.getLogger(__name__)
+
+
+async def handle_analysis_websocket(websocket: WebSocket, session_id: str):
+    """
+    Stream WSMessage updates for an analysis session.
+
+    Server sends (JSON):
+    - {"type": "analysis_status", "payload": {session_id, status, progress, message}}
+      on connect and whenever progress changes
+    - {"type": "analysis_complete", "payload": {session_id, analysis}} when done, or
+      {"type": "error", "payload": {session_id, message}} if the analysis failed
+
+    The connection is closed after the final message. Clients joining a finished
+    session get its status and final message immediately.
+    """
+    await websocket.accept()
+    manager = get_analysis_session_manager()
+    job = manager.get_job(session_id)
+    if job is None:
+        await websocket.close(code=4404, reason=f"Analysis session {session_id} not found")
+        return
+
+    queue = manager.subscribe(job)
+    try:
+        while True:
+            message = await queue.get()
+            await websocket.send_json(message.model_dump())
+            if message.type in ("analysis_complete", "error"):
+                break
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info(f"Subscriber left analysis session {session_id}")
+    finally:
+        manager.unsubscribe(job, queue)
@@ -0,0 +1,108 @@
+"""
+Compact binary framing for the transcription WebSocket.
+
+Every frame starts with a 12-byte little-endian header:
+
+    offset  size  field
+    0       2     magic b"ET"
+    2       1     version (1)
+    3       1     kind: audio format (client -> server) or message type (server -> client)
+    4       4     sequence number (uint32), echoed back in results
+    8       4     time offset in milliseconds (uint32)
+
+Client -> server audio frames carry the audio bytes right after the header.
+Audio formats: 0 = WebM/Opus container, 1 = raw PCM16 little-endian, 16 kHz mono.
+
+Server -> client frames carry a payload by message type:
+    1 = segments: uint16 count, then per segment uint32 start_ms, uint32 end_ms,
+        uint16 text length, UTF-8 text
+    2 = error: UTF-8 message
+"""
+
+import struct
+from typing import List, NamedTuple, Optional
+
+MAGIC = b"ET"
+VERSION = 1
+
+HEADER = struct.Struct("<2sBBII")
+SEGMENT = struct.Struct("<IIH")
+COUNT = struct.Struct("<H")
+
+FORMAT_WEBM = 0
+FORMAT_PCM16 = 1
+AUDIO_FORMATS = {FORMAT_WEBM: "webm", FORMAT_PCM16: "pcm16"}
+
+MSG_SEGMENTS = 1
+MSG_ERROR = 2
+
+
+class AudioFrame(NamedTuple):
+    """Decoded client audio frame"""
+    sequence: int
+    time_offset: float  # seconds
+    audio_format: str  # webm, pcm16
+    audio: bytes
+
+
+def is_binary_frame(data: bytes) -> bool:
+    """Whether a binary message uses the framed protocol (vs. a bare audio blob)"""
+    return len(data) >= HEADER.size and data[:2] == MAGIC
+
+
+def decode_audio_frame(data: bytes) -> AudioFrame:
+    """Parse a client audio frame; raises ValueError if the header is invalid"""
+    if not is_binary_frame(data):
+        raise ValueError("Not a framed audio message")
+    _, version, kind, sequence, offset_ms = HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"Unsupported frame version: {version}")
+    if kind not in AUDIO_FORMATS:
+        raise ValueError(f"Unsupported audio format: {kind}")
+    return AudioFrame(sequence, offset_ms / 1000, AUDIO_FORMATS[kind], data[HEADER.size:])
+
+
+def encode_audio_frame(sequence: int, time_offset: float, audio: bytes, audio_format: int = FORMAT_WEBM) -> bytes:
+    """Build a client audio frame (used by tools and benchmarks)"""
+    return HEADER.pack(MAGIC, VERSION, audio_format, sequence, int(round(time_offset * 1000))) + audio
+
+
+def encode_segments_frame(sequence: int, time_offset: float, segments: List[dict]) -> bytes:
+    """Pack all segments of one chunk into a single result frame; raises ValueError past 65535 segments"""
+    if len(segments) > 0xFFFF:
+        raise ValueError(f"Too many segments for one frame: {len(segments)}")
+    parts = [HEADER.pack(MAGIC, VERSION, MSG_SEGMENTS, sequence, int(round(time_offset * 1000)))]
+    parts.append(COUNT.pack(len(segments)))
+    for segment in segments:
+        text = segment["text"].encode("utf-8")
+        if len(text) > 0xFFFF:
+            # Cut at a character boundary so the frame stays valid UTF-8
+            text = text[:0xFFFF].decode("utf-8", errors="ignore").encode("utf-8")
+        parts.append(SEGMENT.pack(
+            max(0, int(round(segment["start"] * 1000))),
+            max(0, int(round(segment["end"] * 1000))),
+            len(text)
+        ))
+        parts.append(text)
+    return b"".join(parts)
+
+
+def decode_segments_frame(data: bytes) -> List[dict]:
+    """Unpack a result frame into segment dictionaries (used by tools and benchmarks)"""
+    if len(data) < HEADER.size + COUNT.size or data[:2] != MAGIC or data[3] != MSG_SEGMENTS:
+        raise ValueError("Not a segments frame")
+    (count,) = COUNT.unpack_from(data, HEADER.size)
+    position = HEADER.size + COUNT.size
+    segments = []
+    for _ in range(count):
+        start_ms, end_ms, length = SEGMENT.unpack_from(data, position)
+        position += SEGMENT.size
+        text = data[position:position + length].decode("utf-8", errors="replace")
+        position += length
+        segments.append({"start": start_ms / 1000, "end": end_ms / 1000, "text": text})
+    return segments
+
+
+def encode_error_frame(sequence: Optional[int], message: str) -> bytes:
+    """Build an error frame with a UTF-8 message"""
+    return HEADER.pack(MAGIC, VERSION, MSG_ERROR, sequence or 0, 0) + message.encode("utf-8")
@@ -0,0 +1,64 @@
+"""WebSocket endpoint for listening to a shared live-call room."""
+
+import asyncio
+import logging
+from fastapi import WebSocket, WebSocketDisconnect
+from app.services.live_rooms import get_live_room_registry
+
+logger = logging.getLogger(__name__)
+
+
+async def _drain_client(websocket: WebSocket):
+    """Listeners send nothing; read until the client disconnects"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+async def handle_room_websocket(websocket: WebSocket, room_id: str):
+    """
+    Listen to a live call transcribed by another session (/ws/transcribe?room=<id>).
+
+    Server sends (JSON):
+    - {"type": "snapshot", "room_id", "segments": [...], "analysis": {...}} on join,
+      with everything transcribed so far ("analysis" only if the producer has it on)
+    - {"type": "segment", "start", "end", "text"} for each new segment
+    - insight_update / sentiment_update WSMessages when analysis is on
+    - {"type": "room_closed", "room_id", "reason"} when the producer leaves
+
+    Listeners that fall too far behind are disconnected with code 4008
+    (LIVE_ROOM_QUEUE_SIZE messages queued).
+    """
+    await websocket.accept()
+    room = get_live_room_registry().get(room_id)
+    if room is None:
+        await websocket.close(code=4404, reason=f"Room {room_id} not found")
+        return
+    try:
+        subscriber = room.join()
+    except RuntimeError as e:
+        await websocket.close(code=4429, reason=str(e))
+        return
+    logger.info(f"Listener joined room {room_id} ({len(room.subscribers)} listening)")
+
+    async def send():
+        while True:
+            message = await subscriber.queue.get()
+            if message is None:
+                await websocket.close(code=subscriber.close_code, reason=subscriber.close_reason)
+                return
+            await websocket.send_text(message)
+
+    sender = asyncio.create_task(send())
+    receiver = asyncio.create_task(_drain_client(websocket))
+    try:
+        await asyncio.wait([sender, receiver], return_when=asyncio.FIRST_COMPLETED)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in (sender, receiver):
+            task.cancel()
+        await asyncio.gather(sender, receiver, return_exceptions=True)
+        room.leave(subscriber)
+        logger.info(f"Listener left room {room_id}")
@@ -1,27 +1,75 @@
 """WebSocket endpoint for real-time audio transcription."""
 
+import asyncio
 import logging
+import time
+import uuid
+from typing import Optional
 from fastapi import WebSocket, WebSocketDisconnect
-from app.services.local_whisper import get_whisper_service
+from app.services.chunk_controller import ChunkDurationController
+from app.services.model_registry import get_model_registry
+from app.services.session_archive import get_session_archive
+from app.services.live_analysis import LiveAnalysisEngine, get_analyzer
+from app.services.live_rooms import get_live_room_registry
+from app.services.metrics import REGISTRY
+from app.websockets.protocol import (
+    AudioFrame,
+    decode_audio_frame,
+    encode_error_frame,
+    encode_segments_frame,
+    is_binary_frame
+)
 from app.config import get_settings
 import json
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+CONNECTIONS = REGISTRY.gauge("transcription_websocket_connections", "Open /ws/transcribe connections")
+QUEUE_DEPTH = REGISTRY.gauge(
+    "transcription_queue_depth",
+    "Audio chunks received over WebSockets that are waiting for or in transcription"
+)
+CHUNK_SECONDS = REGISTRY.histogram(
+    "transcription_chunk_seconds",
+    "Time from receiving an audio chunk to sending its segments",
+    ["protocol"]
+)
+CHUNK_ERRORS = REGISTRY.counter("transcription_chunk_errors_total", "Audio chunks that failed to transcribe")
+
+
+def _acknowledged_duration(message: dict) -> Optional[int]:
+    """
+    Chunk duration from a control_ack, kept within the range the server would
+    request (it scales latency observations); None if it is not a number
+    """
+    try:
+        duration_ms = int(message.get("chunk_duration_ms"))
+    except (TypeError, ValueError, OverflowError):
+        logger.warning(f"Ignoring invalid control_ack: {message.get('chunk_duration_ms')!r}")
+        return None
+    return min(max(duration_ms, settings.whisper_chunk_min_ms), settings.whisper_chunk_max_ms)
+
 
 async def handle_transcription_websocket(websocket: WebSocket):
     """
     Handle WebSocket connection for audio transcription.
-    
-    Protocol:
+
+    Two protocols are accepted on the same endpoint, chosen per message:
+
+    Binary protocol (see app.websockets.protocol):
+    - Client sends: one binary frame per chunk, a 12-byte header (sequence,
+      time offset, audio format) followed by WebM or raw PCM16 16 kHz audio
+    - Server responds: one binary frame per chunk with all of its segments
+
+    JSON protocol:
     - Client sends: JSON metadata with timeOffsetSeconds, then binary audio data
     - Server responds: JSON with transcription segments (timestamps adjusted by offset)
-    
+
     Message format (client -> server):
     1. JSON: {"type": "metadata", "timeOffsetSeconds": 5.0}
     2. Binary: WebM audio blob
-    
+
     Message format (server -> client):
     {
         "type": "segment",
@@ -34,73 +82,221 @@ async def handle_transcription_websocket(websocket: WebSocket):
         "type": "error",
         "message": "Error description"
     }
+
+    When session archiving is enabled, the server first sends
+    {"type": "session", "session_id": "..."}; the received audio and emitted
+    segments are then available under /api/sessions/{session_id}.
+
+    With ?analysis=true, segments are also fed to a LiveAnalysisEngine and its
+    deltas are sent as JSON WSMessages ({"type": "insight_update" |
+    "sentiment_update", "payload": {...}, "timestamp": ms}).
+
+    With ?room=<id>, this session also produces a shared room: its segments (and
+    analysis updates) are broadcast to listeners on /ws/rooms/<id>. The server
+    first sends {"type": "room", "room_id": "..."}.
+
+    With WHISPER_ADAPTIVE_CHUNKS, the server sends {"type": "control",
+    "chunk_duration_ms": ..., "expected_latency_ms": ...} on connect and whenever
+    the session's chunk duration should change (see ChunkDurationController).
+    A client that follows it replies {"type": "control_ack", "chunk_duration_ms": ...}
+    when it starts recording at the new duration (also accepted between a
+    metadata message and its audio), so the server knows the length of the
+    WebM chunks that follow; changes are only sent after a first ack
+    (or for PCM16 audio, whose length is known).
     """
     await websocket.accept()
     logger.info("Transcription WebSocket connected")
-    
-    whisper_service = get_whisper_service(model_size=settings.whisper_model_size)
-    time_offset = 0.0  # Default offset
-    
-    try:
+
+    registry = get_model_registry()
+    analysis_engine = None
+    if websocket.query_params.get("analysis", "").lower() in ("1", "true", "yes"):
+        analysis_engine = LiveAnalysisEngine(get_analyzer(settings.live_analysis_backend))
+    archive = None
+    session_archive = get_session_archive()
+    if session_archive is not None:
+        session_id = str(uuid.uuid4())
+        # Creates the session directory and opens its files
+        archive = await asyncio.to_thread(session_archive.open_writer, session_id)
+        await websocket.send_json({"type": "session", "session_id": session_id})
+    room = None
+    room_id = websocket.query_params.get("room")
+    if room_id:
+        try:
+            room = get_live_room_registry().open(room_id)
+        except ValueError as e:
+            await websocket.send_json({"type": "error", "message": str(e)})
+            await websocket.close(code=4409)
+            if archive is not None:
+                await archive.close()
+            return
+        room.analysis_engine = analysis_engine
+        await websocket.send_json({"type": "room", "room_id": room_id})
+
+    controller = None
+    client_duration_ms = None  # Chunk duration the client last acknowledged
+    if settings.whisper_adaptive_chunks:
+        controller = ChunkDurationController(
+            initial_ms=settings.whisper_chunk_duration_ms,
+            min_ms=settings.whisper_chunk_min_ms,
+            max_ms=settings.whisper_chunk_max_ms,
+            latency_target_ms=settings.whisper_chunk_latency_target_ms
+        )
+        await websocket.send_json(controller.control_message())
+
+    async def receive_audio() -> bytes:
+        """The audio blob following a JSON message; a control_ack sent in between is applied first"""
+        nonlocal client_duration_ms
         while True:
-            # First, try to receive metadata (JSON)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes") is not None:
+                return message["bytes"]
             try:
-                message = await websocket.receive_text()
-                metadata = json.loads(message)
-                if metadata.get("type") == "metadata":
+                data = json.loads(message.get("text") or "")
+            except json.JSONDecodeError:
+                data = None
+            if isinstance(data, dict) and data.get("type") == "control_ack":
+                client_duration_ms = _acknowledged_duration(data) or client_duration_ms
+            else:
+                logger.warning("Ignoring text message while waiting for audio")
+
+    binary_session = False  # Client has used the binary protocol
+    CONNECTIONS.inc()
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            # Results go back in the same protocol the chunk arrived in
+            binary_protocol = False
+            if message.get("bytes") is not None:
+                data = message["bytes"]
+                if is_binary_frame(data):
+                    # Single-frame binary protocol: header + audio
+                    binary_protocol = binary_session = True
+                    try:
+                        frame = decode_audio_frame(data)
+                    except ValueError as e:
+                        await websocket.send_bytes(encode_error_frame(None, str(e)))
+                        continue
+                else:
+                    # Bare audio blob without metadata (old protocol)
+                    logger.warning("Received audio without metadata, assuming offset 0")
+                    frame = AudioFrame(0, 0.0, "webm", data)
+            else:
+                try:
+                    metadata = json.loads(message.get("text") or "")
+                except json.JSONDecodeError:
+                    # If not JSON, might be old protocol with just audio
+                    logger.warning("Received non-JSON message, assuming binary audio")
+                    frame = AudioFrame(0, 0.0, "webm", await receive_audio())
+                else:
+                    if metadata.get("type") == "control_ack":
+                        client_duration_ms = _acknowledged_duration(metadata) or client_duration_ms
+                        continue
+                    if metadata.get("type") != "metadata":
+                        logger.warning(f"Unexpected message type: {metadata.get('type')}")
+                        continue
                     time_offset = metadata.get("timeOffsetSeconds", 0.0)
                     logger.info(f"Received metadata: time_offset={time_offset}s")
                     # Now receive the audio data
-                    audio_data = await websocket.receive_bytes()
-                else:
-                    logger.warning(f"Unexpected message type: {metadata.get('type')}")
-                    continue
-            except json.JSONDecodeError:
-                # If not JSON, might be old protocol with just audio
-                logger.warning("Received non-JSON message, assuming binary audio")
-                audio_data = await websocket.receive_bytes()
-                time_offset = 0.0
-            
+                    frame = AudioFrame(0, time_offset, "webm", await receive_audio())
+
             # Skip if empty
-            if len(audio_data) == 0:
+            if len(frame.audio) == 0:
                 continue
-            
-            logger.info(f"Received audio blob: {len(audio_data)} bytes, offset: {time_offset}s")
-            
+
+            logger.info(
+                f"Received audio chunk #{frame.sequence}: {len(frame.audio)} bytes "
+                f"({frame.audio_format}), offset: {frame.time_offset}s"
+            )
+            if archive is not None:
+                archive.append_audio(frame.time_offset, frame.audio_format, frame.audio)
+
+            received_at = time.perf_counter()
+            timing = {}
             try:
-                # Transcribe the audio blob with time offset
-                segment_count = 0
-                for segment in whisper_service.transcribe_stream(
-                    audio_data,
-                    language="en",
-                    time_offset=time_offset
-                ):
-                    # Send each segment back to client (timestamps already adjusted)
-                    await websocket.send_json({
-                        "type": "segment",
-                        "start": segment["start"],
-                        "end": segment["end"],
-                        "text": segment["text"]
-                    })
-                    segment_count += 1
-                
-                logger.info(f"Transcribed {segment_count} segments")
-                
+                # Transcribe the audio blob with time offset on a worker thread,
+                # using whichever model the registry currently selects under load
+                QUEUE_DEPTH.inc()
+                try:
+                    segments = await registry.transcribe(
+                        frame.audio,
+                        language="en",
+                        time_offset=frame.time_offset,
+                        audio_format=frame.audio_format,
+                        timing=timing
+                    )
+                finally:
+                    QUEUE_DEPTH.dec()
+                if binary_protocol:
+                    # All segments of the chunk in one compact frame
+                    await websocket.send_bytes(
+                        encode_segments_frame(frame.sequence, frame.time_offset, segments)
+                    )
+                else:
+                    for segment in segments:
+                        # Send each segment back to client (timestamps already adjusted)
+                        await websocket.send_json({
+                            "type": "segment",
+                            "start": segment["start"],
+                            "end": segment["end"],
+                            "text": segment["text"]
+                        })
+                CHUNK_SECONDS.labels("binary" if binary_protocol else "json").observe(
+                    time.perf_counter() - received_at
+                )
+
+                logger.info(f"Transcribed {len(segments)} segments with model {registry.current_size}")
+                if controller is not None and timing.get("inference_seconds"):
+                    # PCM16 is 2 bytes per sample at 16 kHz; WebM chunks last as long as acknowledged
+                    if frame.audio_format == "pcm16":
+                        audio_seconds = len(frame.audio) / 32000
+                    else:
+                        audio_seconds = (client_duration_ms or 0) / 1000
+                    if controller.observe(audio_seconds, timing["queue_seconds"], timing["inference_seconds"]):
+                        await websocket.send_json(controller.control_message())
+                if archive is not None:
+                    archive.append_segments(frame.time_offset, segments)
+                    await archive.maybe_flush()
+                if room is not None:
+                    room.publish_segments(segments)
+                if analysis_engine is not None:
+                    for update in await analysis_engine.consume(segments):
+                        await websocket.send_json(update.model_dump())
+                        if room is not None:
+                            room.publish(update.model_dump())
+
             except Exception as e:
                 logger.error(f"Transcription error: {e}")
-                await websocket.send_json({
-                    "type": "error",
-                    "message": str(e)
-                })
-                    
+                CHUNK_ERRORS.inc()
+                if binary_protocol:
+                    await websocket.send_bytes(encode_error_frame(frame.sequence, str(e)))
+                else:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": str(e)
+                    })
+
     except WebSocketDisconnect:
         logger.info("Transcription WebSocket disconnected")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
         try:
-            await websocket.send_json({
-                "type": "error",
-                "message": str(e)
-            })
+            if binary_session:
+                await websocket.send_bytes(encode_error_frame(None, str(e)))
+            else:
+                await websocket.send_json({
+                    "type": "error",
+                    "message": str(e)
+                })
         except:
             pass
+    finally:
+        CONNECTIONS.dec()
+        if room is not None:
+            get_live_room_registry().close(room.room_id)
+        if archive is not None:
+            await archive.close()
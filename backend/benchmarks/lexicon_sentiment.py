@@ -0,0 +1,109 @@
+"""
+Lexicon sentiment benchmark
+
+Generates synthetic earnings call transcripts (tickers x quarters, each with the
+given number of entries drawn from finance-flavoured sentences) and scores them
+all into SentimentDataPoint series with score_transcripts.
+
+Reports total time, transcripts/s, entries/s and tokens/s.
+
+Run:
+    python -m benchmarks.lexicon_sentiment --tickers 1000 --quarters 20 --workers 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from app.models.records import TranscriptEntryRecord, TranscriptRecord
+from app.services.lexicon_sentiment import (
+    NEGATIONS,
+    NEGATIVE_WORDS,
+    POSITIVE_WORDS,
+    UNCERTAINTY_WORDS,
+    score_transcripts
+)
+
+FILLER_WORDS = """
+the we our in and of to a for this that quarter year revenue margin customers business
+team results operating as with on from were was continue continued approximately
+compared million billion percent growth demand product segment services
+""".split()
+
+
+def synthetic_transcripts(tickers: int, quarters: int, entries: int, words: int, seed: int = 0) -> List[TranscriptRecord]:
+    """Deterministic transcripts with a realistic mix of filler, opinion and negation words"""
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(FILLER_WORDS * 8 + POSITIVE_WORDS + NEGATIVE_WORDS + UNCERTAINTY_WORDS + NEGATIONS)
+    transcripts = []
+    for t in range(tickers):
+        for q in range(quarters):
+            texts = rng.choice(vocabulary, size=(entries, words))
+            transcripts.append(TranscriptRecord(
+                ticker=f"T{t:04d}",
+                quarter=f"Q{q % 4 + 1}",
+                year=2020 + q // 4,
+                fiscal_date_ending="",
+                transcript="",
+                entries=[
+                    TranscriptEntryRecord(id=str(i), timestamp=f"{i // 2:02d}:{(i % 2) * 30:02d}", text=" ".join(row))
+                    for i, row in enumerate(texts)
+                ]
+            ))
+    return transcripts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark lexicon sentiment scoring")
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--quarters", type=int, default=20)
+    parser.add_argument("--entries", type=int, default=120, help="Entries per transcript")
+    parser.add_argument("--words", type=int, default=40, help="Words per entry")
+    parser.add_argument("--bucket-seconds", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    transcripts = synthetic_transcripts(args.tickers, args.quarters, args.entries, args.words)
+    print(f"Generated {len(transcripts)} transcripts in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    series = score_transcripts(
+        transcripts,
+        bucket_seconds=args.bucket_seconds,
+        workers=args.workers,
+        batch_size=args.batch_size
+    )
+    elapsed = time.perf_counter() - started
+
+    entries = len(transcripts) * args.entries
+    result = {
+        "transcripts": len(transcripts),
+        "entries": entries,
+        "workers": args.workers,
+        "data_points": sum(len(s) for s in series),
+        "seconds": round(elapsed, 3),
+        "transcripts_per_second": round(len(transcripts) / elapsed, 1),
+        "entries_per_second": round(entries / elapsed, 1),
+        "tokens_per_second": round(entries * args.words / elapsed, 1)
+    }
+    print(
+        f"Scored {result['transcripts']} transcripts ({result['entries']} entries) in {result['seconds']}s "
+        f"with {args.workers} workers: {result['transcripts_per_second']} transcripts/s, "
+        f"{result['tokens_per_second']:.0f} tokens/s"
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
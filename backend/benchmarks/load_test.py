@@ -0,0 +1,262 @@
+"""
+HTTP load test for the API against a local Alpha Vantage stand-in
+
+Drives the company, transcript and calendar routes at increasing concurrency
+and reports, per concurrency level and route:
+- rps: completed requests per second
+- p50_ms / p99_ms: latency percentiles
+- errors: non-2xx responses and transport failures (404s for symbols or
+  quarters without data count as successes only with --allow-404)
+
+With --spawn, starts app.services.mock_alpha_vantage and an API-only backend
+(uvicorn, APP_MODE=api) pointed at it, so no API quota is used; otherwise
+load is sent to --url. Tickers are drawn from a universe of --universe
+symbols (the mock serves any symbol), so a larger universe means fewer
+backend cache hits.
+
+Run:
+    python -m benchmarks.load_test --spawn --concurrency 1 4 16 64 --duration 10 --output load.json
+    python -m benchmarks.load_test --spawn --upstream-latency 0.2 --upstream-error-rate 0.02
+    python -m benchmarks.load_test --url http://localhost:8000 --baseline load.json --max-regression 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from app.services.mock_alpha_vantage import DEFAULT_TICKERS
+
+ROUTES = {
+    "search": lambda ticker, rng: f"/api/companies/search?q={ticker[:2]}",
+    "company": lambda ticker, rng: f"/api/companies/{ticker}",
+    "earnings": lambda ticker, rng: f"/api/companies/{ticker}/earnings",
+    "financials": lambda ticker, rng: f"/api/companies/{ticker}/financials",
+    "financials_history": lambda ticker, rng: f"/api/companies/{ticker}/financials/history",
+    "trends": lambda ticker, rng: f"/api/companies/{ticker}/trends",
+    "transcript": lambda ticker, rng: f"/api/transcript/{ticker}/Q{rng.randint(1, 4)}/{date.today().year - rng.randint(1, 3)}",
+    "calendar": lambda ticker, rng: "/api/companies/calendar/upcoming",
+}
+# Rough mix of a browsing session: lookups dominate, trends and transcripts are heavier
+DEFAULT_WEIGHTS = {"search": 2, "company": 4, "earnings": 3, "financials": 3, "financials_history": 1, "trends": 1, "transcript": 2, "calendar": 1}
+REGRESSION_METRICS = ["p50_ms", "p99_ms"]
+
+
+def ticker_universe(size: int) -> List[str]:
+    tickers = sorted(DEFAULT_TICKERS)
+    return tickers[:size] + [f"T{i:04d}" for i in range(max(0, size - len(tickers)))]
+
+
+async def run_level(
+    url: str,
+    concurrency: int,
+    duration: float,
+    routes: Dict[str, int],
+    tickers: List[str],
+    allow_404: bool,
+    seed: int
+) -> dict:
+    """Keep `concurrency` requests in flight for `duration` seconds"""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    names, weights = list(routes), list(routes.values())
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, timeout=60.0, limits=limits) as client:
+        async def worker(worker_id: int):
+            rng = random.Random(seed * 1000 + worker_id)
+            while time.perf_counter() < deadline:
+                route = rng.choices(names, weights)[0]
+                path = ROUTES[route](rng.choice(tickers), rng)
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    ok = response.is_success or (allow_404 and response.status_code == 404)
+                except httpx.HTTPError:
+                    ok = False
+                latencies[route].append(time.perf_counter() - started)
+                if not ok:
+                    errors[route] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    results = {}
+    for route in names:
+        samples = np.array(latencies.get(route, []))
+        if not len(samples):
+            continue
+        results[route] = {
+            "requests": int(len(samples)),
+            "errors": errors[route],
+            "rps": round(len(samples) / elapsed, 1),
+            "p50_ms": round(float(np.percentile(samples, 50)) * 1000, 1),
+            "p99_ms": round(float(np.percentile(samples, 99)) * 1000, 1)
+        }
+    total = sum(len(v) for v in latencies.values())
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "rps": round(total / elapsed, 1),
+        "errors": sum(errors.values()),
+        "routes": results
+    }
+
+
+def _wait_ready(url: str, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{' '.join(process.args)} exited with {process.returncode}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+@contextmanager
+def spawn_stack(port: int, mock_port: int, upstream_latency: float, upstream_error_rate: float):
+    """Run the mock Alpha Vantage API and an API-only backend as subprocesses"""
+    mock = subprocess.Popen([
+        sys.executable, "-m", "app.services.mock_alpha_vantage", "--port", str(mock_port),
+        "--latency", str(upstream_latency), "--jitter", str(upstream_latency / 2),
+        "--error-rate", str(upstream_error_rate)
+    ])
+    env = {
+        **os.environ,
+        "APP_MODE": "api",
+        "ALPHA_VANTAGE_API_KEY": "load-test",
+        "ALPHA_VANTAGE_BASE_URL": f"http://127.0.0.1:{mock_port}/query",
+        "ALPHA_VANTAGE_RATE_LIMIT": "1000000",
+        "WHISPER_PRELOAD_MODELS": "false"
+    }
+    backend = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env
+    )
+    try:
+        _wait_ready(f"http://127.0.0.1:{mock_port}/stats", mock)
+        _wait_ready(f"http://127.0.0.1:{port}/health", backend)
+        yield f"http://127.0.0.1:{port}", f"http://127.0.0.1:{mock_port}"
+    finally:
+        for process in (backend, mock):
+            process.terminate()
+            process.wait(timeout=10)
+
+
+def compare_to_baseline(levels: List[dict], baseline_path: str, max_regression: float) -> List[str]:
+    """Return a description of every route latency that regressed beyond max_regression"""
+    with open(baseline_path) as f:
+        baseline = {level["concurrency"]: level for level in json.load(f)["levels"]}
+
+    regressions = []
+    for level in levels:
+        previous = baseline.get(level["concurrency"])
+        if previous is None:
+            continue
+        for route, result in level["routes"].items():
+            before = previous["routes"].get(route)
+            if before is None:
+                continue
+            for metric in REGRESSION_METRICS:
+                if before[metric] > 0 and result[metric] > before[metric] * (1 + max_regression):
+                    regressions.append(
+                        f"c={level['concurrency']} {route} {metric}: {before[metric]} -> {result[metric]}"
+                    )
+    return regressions
+
+
+async def run(url: str, args) -> List[dict]:
+    routes = {name: DEFAULT_WEIGHTS[name] for name in args.routes}
+    tickers = ticker_universe(args.universe)
+    levels = []
+    for i, concurrency in enumerate(args.concurrency):
+        level = await run_level(url, concurrency, args.duration, routes, tickers, args.allow_404, args.seed + i)
+        levels.append(level)
+        print(f"concurrency {concurrency}: {level['rps']:.1f} req/s, {level['errors']} errors")
+        for route, result in level["routes"].items():
+            print(
+                f"  {route:>11}: {result['requests']:6d} req {result['rps']:8.1f}/s  "
+                f"p50 {result['p50_ms']:8.1f}ms  p99 {result['p99_ms']:8.1f}ms  errors {result['errors']}"
+            )
+    return levels
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the API against a local Alpha Vantage stand-in")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Backend to load (ignored with --spawn)")
+    parser.add_argument("--spawn", action="store_true", help="Start the mock upstream and an API-only backend")
+    parser.add_argument("--port", type=int, default=8300, help="Backend port with --spawn")
+    parser.add_argument("--mock-port", type=int, default=8200, help="Mock Alpha Vantage port with --spawn")
+    parser.add_argument("--upstream-latency", type=float, default=0.05, help="Mock upstream seconds per request")
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0, help="Share of failing upstream requests")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--routes", nargs="+", default=list(ROUTES), choices=list(ROUTES))
+    parser.add_argument("--universe", type=int, default=50, help="Number of distinct tickers requested")
+    parser.add_argument("--allow-404", action="store_true", help="Count 404 responses as successes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", help="Previous JSON results to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.20,
+                        help="Allowed relative increase in p50/p99 latency")
+    args = parser.parse_args(argv)
+
+    upstream_stats = None
+    if args.spawn:
+        with spawn_stack(args.port, args.mock_port, args.upstream_latency, args.upstream_error_rate) as (url, mock_url):
+            levels = asyncio.run(run(url, args))
+            upstream_stats = httpx.get(f"{mock_url}/stats").json()
+        print(f"Upstream requests: {upstream_stats['requests']}")
+    else:
+        levels = asyncio.run(run(args.url, args))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "host": platform.node(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "spawned": args.spawn,
+            "upstream_latency": args.upstream_latency if args.spawn else None,
+            "universe": args.universe,
+            "duration_s": args.duration
+        },
+        "levels": levels,
+        "upstream": upstream_stats
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(levels, args.baseline, args.max_regression)
+        if regressions:
+            print("Regressions beyond threshold:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Internal records vs pydantic models on the hot Alpha Vantage routes
+
+For search, earnings and transcript responses, compares the pydantic API models
+the service used to cache with the slots records it caches now
+(app.models.records), on deterministic data from the mock Alpha Vantage API:
+- build_us: constructing the cached value from the parsed upstream payload
+- serve_us: one cache-hit request through FastAPI (response_model validation
+  and encoding for models, orjson via records.dumps() for records), CPU time
+- kb: memory held by the cached value (tracemalloc)
+
+Run:
+    python -m benchmarks.record_overhead --requests 2000 --output records.json
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+import tracemalloc
+from datetime import date
+from typing import Callable, List, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+from app.models.company import CompanySearchResult, EarningsCall
+from app.models.records import (
+    EarningsRecord,
+    SearchResultRecord,
+    TranscriptEntryRecord,
+    TranscriptRecord,
+    dumps
+)
+from app.models.transcript import TranscriptData, TranscriptEntry
+from app.services.mock_alpha_vantage import _earnings_rows, _search, _transcript
+
+SEARCH_FIELDS = {"ticker": "1. symbol", "name": "2. name", "type": "3. type", "region": "4. region", "currency": "8. currency"}
+
+
+def earnings_kwargs(ticker: str) -> List[dict]:
+    rows = []
+    for earning in _earnings_rows(ticker, date.today()):
+        fiscal_date = earning["fiscalDateEnding"]
+        year, quarter = int(fiscal_date[:4]), f"Q{(int(fiscal_date[5:7]) - 1) // 3 + 1}"
+        rows.append({
+            "id": f"{ticker}-{quarter}-{year}", "ticker": ticker, "quarter": quarter, "year": year,
+            "date": earning["reportedDate"], "fiscal_date_ending": fiscal_date,
+            "reported_eps": earning["reportedEPS"], "estimated_eps": earning["estimatedEPS"],
+            "surprise": earning["surprise"], "surprise_percentage": earning["surprisePercentage"],
+            "status": "recorded"
+        })
+    return rows
+
+
+def transcript_kwargs(ticker: str) -> dict:
+    """Fields of the latest transcript, entries split the way the service parses them"""
+    latest = _earnings_rows(ticker, date.today())[0]["fiscalDateEnding"]
+    quarter = f"Q{(int(latest[5:7]) - 1) // 3 + 1}"
+    data = _transcript(ticker, f"{latest[:4]}{quarter}", date.today())
+    text = "\n\n".join(f"{item['speaker']}: {item['content']}" for item in data["transcript"])
+    entries = []
+    for i, para in enumerate(text.split("\n\n")):
+        match = re.match(r'^([A-Za-z\s\.]+):\s*', para)
+        entries.append({
+            "id": f"{ticker}-{i}", "timestamp": f"{i // 60:02d}:{i % 60:02d}",
+            "text": para[match.end():] if match else para,
+            "speaker": match.group(1) if match else None, "confidence": 1.0
+        })
+    return {"ticker": ticker, "quarter": quarter, "year": int(latest[:4]),
+            "fiscal_date_ending": latest, "transcript": text, "entries": entries}
+
+
+def build_cases(ticker: str) -> dict:
+    """route -> (model builder, record builder, response_model)"""
+    matches = _search(ticker[:2])["bestMatches"]
+    earnings = earnings_kwargs(ticker)
+    transcript = transcript_kwargs(ticker)
+
+    def transcript_model():
+        return TranscriptData(**{**transcript, "entries": [TranscriptEntry(**e) for e in transcript["entries"]]})
+
+    def transcript_record():
+        return TranscriptRecord(**{**transcript, "entries": [TranscriptEntryRecord(**e) for e in transcript["entries"]]})
+
+    return {
+        "search": (
+            lambda: [CompanySearchResult(**match) for match in matches],
+            lambda: [SearchResultRecord(**{name: match[key] for name, key in SEARCH_FIELDS.items()}) for match in matches],
+            None  # The search route dumps its models itself (field names, not aliases)
+        ),
+        "earnings": (
+            lambda: [EarningsCall(**row) for row in earnings],
+            lambda: [EarningsRecord(**row) for row in earnings],
+            List[EarningsCall]
+        ),
+        "transcript": (transcript_model, transcript_record, TranscriptData),
+    }
+
+
+def per_call_us(operation: Callable[[], object], calls: int) -> float:
+    started = time.process_time()
+    for _ in range(calls):
+        operation()
+    return (time.process_time() - started) / calls * 1e6
+
+
+def retained_kb(build: Callable[[], object]) -> float:
+    tracemalloc.start()
+    value = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return size / 1024
+
+
+def make_app(models: dict, records: dict) -> FastAPI:
+    """Two cache-hit routes per case: models through response_model, records written directly"""
+    app = FastAPI()
+    for route, (value, response_model) in models.items():
+        app.add_api_route(f"/models/{route}", _model_endpoint(value, response_model), response_model=response_model)
+    for route, value in records.items():
+        app.add_api_route(f"/records/{route}", _record_endpoint(value))
+    return app
+
+
+def _model_endpoint(value, response_model):
+    async def endpoint():
+        if response_model is None:
+            return [item.model_dump(by_alias=False) for item in value]
+        return value
+    return endpoint
+
+
+def _record_endpoint(value):
+    async def endpoint():
+        return Response(content=dumps(value), media_type="application/json")
+    return endpoint
+
+
+async def request(app: FastAPI, path: str) -> bytes:
+    """One GET through the ASGI app without a network or HTTP client"""
+    body = []
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+             "headers": [], "client": ("127.0.0.1", 1), "server": ("test", 80), "root_path": ""}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def serve_us(app: FastAPI, path: str, requests: int) -> float:
+    await request(app, path)
+    started = time.process_time()
+    for _ in range(requests):
+        await request(app, path)
+    return (time.process_time() - started) / requests * 1e6
+
+
+async def run(ticker: str, builds: int, requests: int) -> dict:
+    cases = build_cases(ticker)
+    app = make_app(
+        {route: (build_model(), response_model) for route, (build_model, _, response_model) in cases.items()},
+        {route: build_record() for route, (_, build_record, _) in cases.items()}
+    )
+    results = {}
+    for route, (build_model, build_record, _) in cases.items():
+        if json.loads(await request(app, f"/models/{route}")) != json.loads(await request(app, f"/records/{route}")):
+            raise AssertionError(f"{route}: record and model responses differ")
+        results[route] = {
+            "model": {
+                "build_us": round(per_call_us(build_model, builds), 1),
+                "serve_us": round(await serve_us(app, f"/models/{route}", requests), 1),
+                "kb": round(retained_kb(build_model), 1)
+            },
+            "record": {
+                "build_us": round(per_call_us(build_record, builds), 1),
+                "serve_us": round(await serve_us(app, f"/records/{route}", requests), 1),
+                "kb": round(retained_kb(build_record), 1)
+            }
+        }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark internal records against pydantic models")
+    parser.add_argument("--ticker", default="AAPL")
+    parser.add_argument("--builds", type=int, default=2000, help="Constructions timed per case")
+    parser.add_argument("--requests", type=int, default=1000, help="Cache-hit requests timed per case")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args.ticker, args.builds, args.requests))
+    print(f"{'route':>11} {'':>7} {'build_us':>10} {'serve_us':>10} {'kb':>8}")
+    for route, result in results.items():
+        for kind in ("model", "record"):
+            r = result[kind]
+            print(f"{route:>11} {kind:>7} {r['build_us']:10.1f} {r['serve_us']:10.1f} {r['kb']:8.1f}")
+        model, record = result["model"], result["record"]
+        print(f"{'':>11} {'saving':>7} {model['build_us'] / max(record['build_us'], 0.1):9.1f}x "
+              f"{model['serve_us'] / max(record['serve_us'], 0.1):9.1f}x {model['kb'] / max(record['kb'], 0.1):7.1f}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"ticker": args.ticker, "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
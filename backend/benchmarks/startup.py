@@ -0,0 +1,141 @@
+"""
+Cold-start benchmark for the FastAPI app
+
+Imports app.main in a fresh interpreter for each APP_MODE, several times, and
+reports per mode:
+- import_ms: median wall time of `import app.main` (lower is better)
+- rss_mb: median resident memory once the app is importable
+- heavy_modules: which optional heavy dependencies got imported (faster-whisper,
+  CTranslate2, onnxruntime, OpenAI SDK); an API-only worker should load none
+
+Run:
+    python -m benchmarks.startup --mode all api transcription --output startup.json
+    python -m benchmarks.startup --baseline startup.json --max-regression 0.1
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+HEAVY_MODULES = ["faster_whisper", "ctranslate2", "onnxruntime", "openai"]
+REGRESSION_METRICS = ["import_ms", "rss_mb"]
+
+# Runs in the child; prints one JSON line
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+rss_kb = 0
+with open("/proc/self/status") as f:
+    for line in f:
+        if line.startswith("VmRSS:"):
+            rss_kb = int(line.split()[1])
+print(json.dumps({
+    "import_ms": elapsed * 1000,
+    "rss_mb": rss_kb / 1024,
+    "routes": len(app.main.app.routes),
+    "heavy_modules": [name for name in %r if name in sys.modules]
+}))
+""" % (HEAVY_MODULES,)
+
+
+def measure(mode: str) -> dict:
+    env = {
+        **os.environ,
+        "APP_MODE": mode,
+        # Measure imports only, never model loading
+        "WHISPER_PRELOAD_MODELS": "false",
+        "WHISPER_AUTOTUNE_ON_STARTUP": "false",
+        "ALPHA_VANTAGE_API_KEY": os.environ.get("ALPHA_VANTAGE_API_KEY", "benchmark"),
+        "PYTHONDONTWRITEBYTECODE": "1"
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def benchmark_mode(mode: str, runs: int) -> dict:
+    samples = [measure(mode) for _ in range(runs)]
+    return {
+        "mode": mode,
+        "runs": runs,
+        "import_ms": round(statistics.median(s["import_ms"] for s in samples), 1),
+        "import_ms_min": round(min(s["import_ms"] for s in samples), 1),
+        "rss_mb": round(statistics.median(s["rss_mb"] for s in samples), 1),
+        "routes": samples[0]["routes"],
+        "heavy_modules": samples[0]["heavy_modules"]
+    }
+
+
+def compare_to_baseline(results: List[dict], baseline_path: str, max_regression: float) -> List[str]:
+    """Return a description of every metric that regressed beyond max_regression"""
+    with open(baseline_path) as f:
+        baseline = {r["mode"]: r for r in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["mode"])
+        if previous is None:
+            continue
+        for metric in REGRESSION_METRICS:
+            if previous[metric] > 0 and result[metric] > previous[metric] * (1 + max_regression):
+                regressions.append(f"{result['mode']} {metric}: {previous[metric]} -> {result[metric]}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark app cold-start import time and RSS")
+    parser.add_argument("--mode", nargs="+", default=["all", "api", "transcription"])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per mode")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", help="Previous JSON results to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.10,
+                        help="Allowed relative increase in import time and RSS")
+    args = parser.parse_args(argv)
+
+    results = []
+    for mode in args.mode:
+        result = benchmark_mode(mode, args.runs)
+        results.append(result)
+        print(
+            f"{mode:>13}: import {result['import_ms']:.0f}ms (min {result['import_ms_min']:.0f}ms)  "
+            f"RSS {result['rss_mb']:.0f}MB  {result['routes']} routes  "
+            f"heavy: {', '.join(result['heavy_modules']) or 'none'}"
+        )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "host": platform.node(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count()
+        },
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.max_regression)
+        if regressions:
+            print("Regressions beyond threshold:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
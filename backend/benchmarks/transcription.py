@@ -0,0 +1,214 @@
+"""
+Transcription benchmark for LocalWhisperService
+
+Streams a speech fixture through transcribe_stream in fixed-size chunks, the way
+/ws/transcribe receives it, for every combination of the given parameters.
+
+Reports per configuration:
+- rtf: processing time / audio duration for one session (lower is better)
+- latency_ms p50/p95/p99: per-chunk transcription latency
+- throughput: audio seconds transcribed per wall-clock second across N sessions
+- peak_rss_mb: peak resident memory while measuring it (each configuration
+  runs in a fresh worker process, so earlier ones do not inflate it)
+
+Run:
+    python -m benchmarks.transcription --model-size tiny base --beam-size 1 5 \\
+        --concurrency 1 4 --output results.json
+    python -m benchmarks.transcription --baseline results.json --max-regression 0.1
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+
+from app.services.local_whisper import LocalWhisperService
+from app.services.speech_fixture import SAMPLE_RATE, SpeechFixture, load_fixture, to_pcm16
+
+# Metrics where a larger value is a regression
+REGRESSION_METRICS = ["rtf", "latency_p95_ms"]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (a high-water mark for its lifetime)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def split_chunks(fixture: SpeechFixture, chunk_ms: int) -> List[bytes]:
+    """Cut the fixture into PCM16 chunks of chunk_ms"""
+    size = int(SAMPLE_RATE * chunk_ms / 1000)
+    return [to_pcm16(fixture.samples[i:i + size]) for i in range(0, len(fixture.samples), size)]
+
+
+def run_session(service: LocalWhisperService, chunks: List[bytes], chunk_ms: int, beam_size: int) -> List[float]:
+    """Transcribe chunks in order like a live session; returns per-chunk latency in seconds"""
+    latencies = []
+    for index, chunk in enumerate(chunks):
+        started = time.perf_counter()
+        list(service.transcribe_stream(
+            chunk,
+            language="en",
+            beam_size=beam_size,
+            time_offset=index * chunk_ms / 1000,
+            audio_format="pcm16"
+        ))
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def benchmark_config(
+    fixture: SpeechFixture,
+    model_size: str,
+    compute_type: str,
+    beam_size: int,
+    chunk_ms: int,
+    concurrency: int
+) -> dict:
+    """Measure one parameter combination"""
+    service = LocalWhisperService(
+        model_size=model_size,
+        compute_type=compute_type,
+        num_workers=concurrency
+    )
+    service.warmup()
+    chunks = split_chunks(fixture, chunk_ms)
+
+    # Single session: real-time factor
+    started = time.perf_counter()
+    single_latencies = run_session(service, chunks, chunk_ms, beam_size)
+    rtf = (time.perf_counter() - started) / fixture.duration_seconds
+
+    # N concurrent sessions sharing one model: throughput and latency under load
+    latencies = single_latencies
+    throughput = fixture.duration_seconds / sum(single_latencies)
+    if concurrency > 1:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            sessions = list(pool.map(
+                lambda _: run_session(service, chunks, chunk_ms, beam_size),
+                range(concurrency)
+            ))
+        wall = time.perf_counter() - started
+        latencies = [latency for session in sessions for latency in session]
+        throughput = fixture.duration_seconds * concurrency / wall
+
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return {
+        "model_size": model_size,
+        "compute_type": compute_type,
+        "beam_size": beam_size,
+        "chunk_ms": chunk_ms,
+        "concurrency": concurrency,
+        "audio_seconds": round(fixture.duration_seconds, 2),
+        "chunks": len(chunks),
+        "rtf": round(rtf, 4),
+        "latency_p50_ms": round(float(p50), 1),
+        "latency_p95_ms": round(float(p95), 1),
+        "latency_p99_ms": round(float(p99), 1),
+        "throughput_audio_s_per_s": round(throughput, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+
+def benchmark_isolated(fixture: SpeechFixture, *args) -> dict:
+    """benchmark_config in a fresh process, so its peak RSS is its own"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(benchmark_config, fixture, *args).result()
+
+
+def config_key(result: dict) -> tuple:
+    return (result["model_size"], result["compute_type"], result["beam_size"],
+            result["chunk_ms"], result["concurrency"])
+
+
+def compare_to_baseline(results: List[dict], baseline_path: str, max_regression: float) -> List[str]:
+    """Return a description of every metric that regressed beyond max_regression"""
+    with open(baseline_path) as f:
+        baseline = {config_key(r): r for r in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(config_key(result))
+        if previous is None:
+            continue
+        for metric in REGRESSION_METRICS:
+            if previous[metric] > 0 and result[metric] > previous[metric] * (1 + max_regression):
+                regressions.append(
+                    f"{config_key(result)} {metric}: {previous[metric]} -> {result[metric]}"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark LocalWhisperService")
+    parser.add_argument("--model-size", nargs="+", default=["base"])
+    parser.add_argument("--compute-type", nargs="+", default=["int8"])
+    parser.add_argument("--beam-size", nargs="+", type=int, default=[5])
+    parser.add_argument("--chunk-ms", nargs="+", type=int, default=[3000])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1])
+    parser.add_argument("--fixture", help="Audio file (reference text in a sibling .txt)")
+    parser.add_argument("--duration", type=float, default=60.0, help="Fixture length in seconds")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", help="Previous JSON results to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.10,
+                        help="Allowed relative increase in RTF and p95 latency")
+    args = parser.parse_args(argv)
+
+    fixture = load_fixture(args.fixture, args.duration)
+    print(f"Fixture: {fixture.name}, {fixture.duration_seconds:.1f}s of audio")
+
+    results = []
+    for model_size, compute_type, beam_size, chunk_ms, concurrency in itertools.product(
+        args.model_size, args.compute_type, args.beam_size, args.chunk_ms, args.concurrency
+    ):
+        result = benchmark_isolated(fixture, model_size, compute_type, beam_size, chunk_ms, concurrency)
+        results.append(result)
+        print(
+            f"{model_size:>9} {compute_type:>8} beam={beam_size} chunk={chunk_ms}ms x{concurrency}: "
+            f"RTF {result['rtf']:.3f}  p50/p95/p99 {result['latency_p50_ms']:.0f}/"
+            f"{result['latency_p95_ms']:.0f}/{result['latency_p99_ms']:.0f}ms  "
+            f"{result['throughput_audio_s_per_s']:.2f} audio-s/s  RSS {result['peak_rss_mb']:.0f}MB"
+        )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "host": platform.node(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "fixture": fixture.name,
+            "audio_seconds": round(fixture.duration_seconds, 2)
+        },
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.max_regression)
+        if regressions:
+            print("Regressions beyond threshold:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""Shared test setup: settings that must exist before app modules are imported."""
+
+import os
+
+os.environ.setdefault("ALPHA_VANTAGE_API_KEY", "test")
+os.environ.setdefault("WHISPER_PRELOAD_MODELS", "false")
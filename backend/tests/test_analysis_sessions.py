@@ -0,0 +1,139 @@
+"""AnalysisSessionManager: shared sessions, retention and subscriber queues."""
+
+import asyncio
+
+import pytest
+
+from app.models.analysis import AnalysisRequest, TranscriptAnalysis
+from app.services.analysis_sessions import AnalysisSessionManager
+
+
+class FakeAlphaVantage:
+    def __init__(self):
+        self.fetches = []
+
+    async def get_earnings_call_transcript(self, ticker, quarter, year):
+        self.fetches.append((ticker, quarter, year))
+        if ticker == "FAIL":
+            raise ValueError(f"No transcript for {ticker}")
+        return (ticker, quarter, year)
+
+
+class FakePipeline:
+    """Reports `steps` progress updates, waiting on `gate` before finishing"""
+
+    def __init__(self, steps: int = 4, gate: asyncio.Event = None):
+        self.steps = steps
+        self.gate = gate
+
+    async def analyze(self, transcript, progress=None):
+        for step in range(1, self.steps + 1):
+            progress(step / self.steps)
+            await asyncio.sleep(0)
+        if self.gate is not None:
+            await self.gate.wait()
+        ticker, quarter, year = transcript
+        return TranscriptAnalysis(
+            ticker=ticker, quarter=quarter, year=year, overall_sentiment=0.5,
+            model="fake", prompt_version="1", chunks=self.steps
+        )
+
+
+def make_manager(pipeline=None, **kwargs) -> AnalysisSessionManager:
+    return AnalysisSessionManager(FakeAlphaVantage(), lambda: pipeline or FakePipeline(), **kwargs)
+
+
+async def wait_finished(job):
+    while not job.finished:
+        await asyncio.sleep(0.001)
+
+
+def test_requests_for_the_same_call_share_a_session():
+    async def main():
+        manager = make_manager()
+        first = manager.submit(AnalysisRequest(ticker="acme", quarter="q4", year=2024))
+        second = manager.submit(AnalysisRequest(ticker="ACME", quarter="Q4", year=2024))
+        other = manager.submit(AnalysisRequest(ticker="ACME", quarter="Q3", year=2024))
+        assert first is second and first is not other
+
+        await wait_finished(first)
+        await wait_finished(other)
+        # Completed sessions are still shared
+        assert manager.submit(AnalysisRequest(ticker="ACME", quarter="Q4", year=2024)) is first
+        assert first.status == "completed" and first.result.chunks == 4
+        assert manager.alpha_vantage.fetches == [("ACME", "Q4", 2024), ("ACME", "Q3", 2024)]
+        await manager.shutdown()
+    asyncio.run(main())
+
+
+def test_failed_sessions_are_retried():
+    async def main():
+        manager = make_manager()
+        failed = manager.submit(AnalysisRequest(ticker="FAIL", quarter="Q4", year=2024))
+        await wait_finished(failed)
+        assert failed.status == "error" and "No transcript" in failed.message
+        retry = manager.submit(AnalysisRequest(ticker="FAIL", quarter="Q4", year=2024))
+        assert retry is not failed
+        await manager.shutdown()
+    asyncio.run(main())
+
+
+def test_finished_sessions_are_evicted():
+    async def main():
+        manager = make_manager(max_retained=2)
+        jobs = [manager.submit(AnalysisRequest(ticker="ACME", quarter=f"Q{q}", year=2024)) for q in range(1, 5)]
+        for job in jobs:
+            await wait_finished(job)
+        assert {job.session_id for job in manager.list_jobs()} == {job.session_id for job in jobs[2:]}
+        assert manager.get_job(jobs[0].session_id) is None
+        # An evicted call starts a new session
+        assert manager.submit(AnalysisRequest(ticker="ACME", quarter="Q1", year=2024)) is not jobs[0]
+
+        manager.retention_seconds = 0
+        assert manager.get_job(jobs[3].session_id) is None
+        await manager.shutdown()
+    asyncio.run(main())
+
+
+def test_queue_limit():
+    async def main():
+        gate = asyncio.Event()
+        manager = make_manager(FakePipeline(gate=gate), workers=1, max_pending=1)
+        manager.submit(AnalysisRequest(ticker="ACME", quarter="Q1", year=2024))
+        await asyncio.sleep(0.01)  # The worker takes the first job
+        manager.submit(AnalysisRequest(ticker="ACME", quarter="Q2", year=2024))
+        with pytest.raises(RuntimeError):
+            manager.submit(AnalysisRequest(ticker="ACME", quarter="Q3", year=2024))
+        gate.set()
+        await manager.shutdown()
+    asyncio.run(main())
+
+
+def test_slow_subscriber_keeps_the_latest_updates():
+    async def main():
+        gate = asyncio.Event()
+        manager = make_manager(FakePipeline(steps=20, gate=gate), subscriber_queue_size=4)
+        job = manager.submit(AnalysisRequest(ticker="ACME", quarter="Q4", year=2024))
+        queue = manager.subscribe(job)
+        fast = manager.subscribe(job)
+        fast_messages = []
+        while job.progress < 1.0:
+            while not fast.empty():
+                fast_messages.append(fast.get_nowait())
+            await asyncio.sleep(0)
+        gate.set()
+        await wait_finished(job)
+
+        # The slow subscriber never read: it holds only the newest updates, ending with the result
+        messages = [queue.get_nowait() for _ in range(queue.qsize())]
+        assert len(messages) == 4
+        assert messages[-1].type == "analysis_complete"
+        assert messages[-2].payload["status"] == "completed"
+        assert [m.payload["progress"] for m in messages[:-1]] == sorted(m.payload["progress"] for m in messages[:-1])
+        assert len(fast_messages) > 4
+        # Finished jobs drop their subscribers; late subscribers get the final state at once
+        assert not job.subscribers
+        late = manager.subscribe(job)
+        assert [late.get_nowait().type, late.get_nowait().type] == ["analysis_status", "analysis_complete"]
+        await manager.shutdown()
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""Boilerplate detection against the corpus and a company's earlier calls."""
+
+from app.models.records import TranscriptEntryRecord, TranscriptRecord
+from app.services.boilerplate import BoilerplateDetector
+
+SAFE_HARBOR = (
+    "Before we begin, I'd like to remind you that today's discussion will include forward-looking statements "
+    "within the meaning of the Private Securities Litigation Reform Act of 1995."
+)
+STRATEGY = (
+    "Our strategy remains focused on expanding the cloud platform, deepening relationships with enterprise "
+    "customers and investing in the products that will drive durable growth over the coming years."
+)
+
+
+def results(revenue: str, margin: str, eps: str) -> str:
+    return (
+        f"Revenue for the quarter was {revenue} billion, up {margin} percent year over year. Gross margin was "
+        f"{margin} percent and diluted earnings per share were {eps}, ahead of our guidance."
+    )
+
+
+def transcript(quarter: str, year: int, *paragraphs: str) -> TranscriptRecord:
+    return TranscriptRecord(
+        ticker="ACME",
+        quarter=quarter,
+        year=year,
+        fiscal_date_ending=f"{year}-12-31",
+        transcript="",
+        entries=[TranscriptEntryRecord(id=str(i), timestamp="", text=text) for i, text in enumerate(paragraphs)]
+    )
+
+
+def flags(record: TranscriptRecord) -> list:
+    return [entry.boilerplate for entry in record.entries]
+
+
+def test_results_with_new_numbers_are_not_boilerplate():
+    detector = BoilerplateDetector()
+    detector.mark(transcript("Q1", 2024, SAFE_HARBOR, results("12.4", "41.2", "1.37")))
+    later = transcript("Q2", 2024, SAFE_HARBOR, results("13.1", "43.8", "1.52"))
+    detector.mark(later)
+    assert flags(later) == [True, False]
+
+
+def test_only_earlier_calls_count():
+    detector = BoilerplateDetector()
+    # The newer call is fetched first; its repeated paragraph is new when it is marked
+    newer = transcript("Q3", 2024, STRATEGY)
+    older = transcript("Q1", 2024, STRATEGY)
+    detector.mark(newer)
+    detector.mark(older)
+    assert flags(newer) == [False]
+    assert flags(older) == [False]
+
+    latest = transcript("Q4", 2024, STRATEGY)
+    detector.mark(latest)
+    assert flags(latest) == [True]
@@ -0,0 +1,116 @@
+"""Columnar export of cached prices, earnings and trend tables."""
+
+import asyncio
+import io
+
+import numpy as np
+import pytest
+
+from app.models.records import EarningsRecord, PriceSeriesRecord
+from app.services.bulk_export import BulkExporter
+from app.services.cache_backend import InMemoryCache
+from app.services.trend_store import TrendStore, empty_table
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def make_exporter(tmp_path, batch_rows: int = 4) -> BulkExporter:
+    async def fill():
+        cache = InMemoryCache()
+        await cache.set("price_series:ACME", PriceSeriesRecord(
+            "ACME", "compact", [f"2024-05-{day:02d}" for day in range(6, 11)], [10.0, 11.0, 12.0, 13.0, float("nan")]
+        ), 3600)
+        await cache.set("price_series:INIT", PriceSeriesRecord("INIT", "compact", ["2024-05-10"], [5.0]), 3600)
+        await cache.set("earnings:ACME", [
+            EarningsRecord("ACME-Q1-2024", "ACME", "Q1", 2024, "2024-04-25", fiscal_date_ending="2024-03-31",
+                           reported_eps="1.5", estimated_eps="None", surprise_percentage="7.1"),
+            EarningsRecord("ACME-Q4-2023", "ACME", "Q4", 2023, "2024-01-25", fiscal_date_ending="2023-12-31",
+                           reported_eps="1.2"),
+        ], 3600)
+
+        # Trend tables are read from disk, through a store that has not loaded them
+        table = empty_table(3)
+        table["fiscal_date"][:] = np.array(["2023-12-31", "2024-03-31", "2024-06-30"], dtype="datetime64[D]")
+        table["year"][:] = [2023, 2024, 2024]
+        table["quarter"][:] = [4, 1, 2]
+        table["reported_eps"][:] = [1.2, 1.5, 1.8]
+        await TrendStore(str(tmp_path)).save("ACME", table)
+        return cache
+    return BulkExporter(asyncio.run(fill()), TrendStore(str(tmp_path)), batch_rows=batch_rows)
+
+
+def export(exporter: BulkExporter, dataset: str, tickers, format: str):
+    async def main():
+        return b"".join([chunk async for chunk in exporter.stream(dataset, tickers, format)])
+    data = asyncio.run(main())
+    if format == "parquet":
+        return pq.read_table(io.BytesIO(data))
+    return pa.ipc.open_stream(data).read_all()
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_prices(tmp_path, format):
+    exporter = make_exporter(tmp_path)
+    table = export(exporter, "prices", ["ACME", "MISSING", "INIT"], format)
+    assert table.column("ticker").to_pylist() == ["ACME"] * 5 + ["INIT"]
+    assert [str(day) for day in table.column("date").to_pylist()[:2]] == ["2024-05-06", "2024-05-07"]
+    # NaN closes are exported as null
+    assert table.column("close").to_pylist() == [10.0, 11.0, 12.0, 13.0, None, 5.0]
+    assert exporter.rows == 6
+    assert exporter.missing == 1
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_earnings(tmp_path, format):
+    exporter = make_exporter(tmp_path)
+    table = export(exporter, "earnings", ["ACME", "MISSING"], format)
+    rows = table.to_pylist()
+    assert [(row["year"], row["quarter"]) for row in rows] == [(2024, "Q1"), (2023, "Q4")]
+    assert str(rows[0]["report_date"]) == "2024-04-25"
+    assert rows[0]["reported_eps"] == 1.5
+    # "None" and absent numbers are null
+    assert rows[0]["estimated_eps"] is None
+    assert rows[1]["surprise_percentage"] is None
+    assert exporter.missing == 1
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_trends(tmp_path, format):
+    exporter = make_exporter(tmp_path)
+    table = export(exporter, "trends", ["ACME", "MISSING"], format)
+    assert table.num_rows == 3
+    assert table.column("quarter").to_pylist() == [4, 1, 2]
+    assert table.column("reported_eps").to_pylist() == [1.2, 1.5, 1.8]
+    # Missing numbers in the table (NaN) are null
+    assert table.column("price_reaction_pct").null_count == 3
+    assert table.column("has_transcript").to_pylist() == [False] * 3
+    assert exporter.missing == 1
+
+
+def test_batches_have_fixed_size(tmp_path):
+    exporter = make_exporter(tmp_path, batch_rows=4)
+
+    async def main():
+        return [batch async for batch in exporter.batches("prices", ["ACME", "INIT", "ACME"])]
+    batches = asyncio.run(main())
+    # 11 rows across tickers: batches are cut at 4 rows, not at ticker boundaries
+    assert [batch.num_rows for batch in batches] == [4, 4, 3]
+    assert batches[1].column(0).to_pylist() == ["ACME", "INIT", "ACME", "ACME"]
+    assert exporter.rows == 11
+
+    # Each batch is one Parquet row group
+    exporter = make_exporter(tmp_path, batch_rows=4)
+
+    async def parquet():
+        return b"".join([chunk async for chunk in exporter.stream("prices", ["ACME", "INIT", "ACME"])])
+    parquet_file = pq.ParquetFile(io.BytesIO(asyncio.run(parquet())))
+    assert [parquet_file.metadata.row_group(i).num_rows for i in range(parquet_file.num_row_groups)] == [4, 4, 3]
+
+
+def test_unknown_dataset_and_format(tmp_path):
+    exporter = make_exporter(tmp_path)
+    with pytest.raises(ValueError):
+        export(exporter, "dividends", ["ACME"], "parquet")
+    with pytest.raises(ValueError):
+        export(exporter, "prices", ["ACME"], "csv")
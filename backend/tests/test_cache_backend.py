@@ -0,0 +1,136 @@
+"""Cache envelope round-trips, and RedisCache / NearCache against the mock Redis server."""
+
+import asyncio
+
+import pytest
+
+from app.models.company import EarningsCall
+from app.models.records import EarningsRecord, PriceSeriesRecord
+from app.services.cache_backend import (
+    FLAG_COMPRESSED,
+    HEADER,
+    NearCache,
+    RedisCache,
+    decode,
+    encode
+)
+from app.services.mock_redis import MockRedisServer
+
+EARNINGS = [
+    EarningsRecord(f"ACME-Q{q}-2024", "ACME", f"Q{q}", 2024, f"2024-0{q * 2}-01", reported_eps="1.5")
+    for q in range(1, 5)
+]
+PRICES = PriceSeriesRecord(
+    "ACME",
+    "full",
+    [f"2024-01-{day:02d}" for day in range(1, 29)] * 10,
+    [100.0 + i / 4 for i in range(280)]
+)
+
+
+@pytest.mark.parametrize("value", [
+    EARNINGS,
+    EARNINGS[0],
+    PRICES,
+    [record.to_model() for record in EARNINGS],
+    EarningsCall(**EARNINGS[0].to_dict()),
+    {"Symbol": "ACME", "Name": "Acme Corp", "values": [1, 2.5, None]},
+    [],
+])
+def test_encode_decode_round_trip(value):
+    assert decode(encode(value)) == value
+
+
+def test_large_payloads_are_compressed():
+    data = encode(PRICES)
+    assert HEADER.unpack_from(data)[2] & FLAG_COMPRESSED
+    assert decode(data) == PRICES
+
+
+def test_decode_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        decode(HEADER.pack(99, 0, 0) + b"{}")
+    with pytest.raises(ValueError):
+        decode(b"\x01")
+
+
+def run_with_server(test):
+    """Run `test(server)` with a started MockRedisServer"""
+    async def main():
+        server = MockRedisServer()
+        await server.start()
+        try:
+            await test(server)
+        finally:
+            await server.stop()
+    asyncio.run(main())
+
+
+def test_redis_cache_stores_encoded_values():
+    async def test(server):
+        cache = RedisCache(server.url, prefix="test:")
+        try:
+            assert await cache.get("earnings") is None
+            await cache.set("earnings", EARNINGS, ttl=60)
+            assert server.data[b"test:earnings"][0] == encode(EARNINGS)
+            assert await cache.get("earnings") == EARNINGS
+
+            await cache.delete("earnings")
+            assert await cache.get("earnings") is None
+        finally:
+            await cache.close()
+    run_with_server(test)
+
+
+def test_redis_cache_expires_entries():
+    async def test(server):
+        cache = RedisCache(server.url)
+        try:
+            await cache.set("short", {"a": 1}, ttl=0.05)
+            assert await cache.get("short") == {"a": 1}
+            await asyncio.sleep(0.1)
+            assert await cache.get("short") is None
+        finally:
+            await cache.close()
+    run_with_server(test)
+
+
+def test_redis_cache_failures_are_misses():
+    async def test(server):
+        cache = RedisCache(server.url, prefix="test:")
+        try:
+            server.data[b"test:garbage"] = (b"not an envelope", None)
+            assert await cache.get("garbage") is None
+
+            await server.stop()
+            await cache.set("down", {"a": 1}, ttl=60)
+            assert await cache.get("down") is None
+        finally:
+            await cache.close()
+    run_with_server(test)
+
+
+def test_near_cache_serves_hot_keys_without_a_round_trip():
+    async def test(server):
+        writer = RedisCache(server.url)
+        cache = NearCache(RedisCache(server.url), ttl=0.05)
+        try:
+            # Written by another replica: the first read goes to the shared tier
+            await writer.set("earnings", EARNINGS, ttl=60)
+            assert await cache.get("earnings") == EARNINGS
+            commands = server.commands
+            assert await cache.get("earnings") == EARNINGS
+            assert server.commands == commands
+
+            # Once the near entry expires, the shared tier is read again
+            await asyncio.sleep(0.1)
+            assert await cache.get("earnings") == EARNINGS
+            assert server.commands == commands + 1
+
+            await cache.delete("earnings")
+            assert await cache.get("earnings") is None
+            assert await writer.get("earnings") is None
+        finally:
+            await writer.close()
+            await cache.close()
+    run_with_server(test)
@@ -0,0 +1,132 @@
+"""Server-Sent Events stream of everything about one earnings call."""
+
+import asyncio
+
+import httpx
+import orjson
+import pytest
+from fastapi import FastAPI
+
+from app.models.company import CompanyOverview, FinancialData
+from app.models.records import EarningsRecord
+from app.routes import calls
+
+
+class FakeAlphaVantage:
+    """Each part answers after `delays[part]` seconds; parts in `failures` raise"""
+
+    def __init__(self, delays=None, failures=None):
+        self.delays = delays or {}
+        self.failures = failures or {}
+        self.started = []
+        self.cancelled = []
+
+    async def _part(self, name: str):
+        self.started.append(name)
+        try:
+            await asyncio.sleep(self.delays.get(name, 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        if name in self.failures:
+            raise self.failures[name]
+
+    async def get_company_overview(self, ticker):
+        await self._part("overview")
+        return CompanyOverview(Symbol=ticker, Name="Acme")
+
+    async def get_earnings(self, ticker):
+        await self._part("earnings")
+        return [EarningsRecord(f"{ticker}-Q4-2024", ticker, "Q4", 2024, "2025-01-30")]
+
+    async def get_earnings_call_transcript(self, ticker, quarter, year):
+        await self._part("transcript")
+        return {"ticker": ticker, "quarter": quarter, "year": year, "entries": []}
+
+    async def get_financials(self, ticker, quarter, year):
+        await self._part("financials")
+        return FinancialData(ticker=ticker, eps="1.5")
+
+
+@pytest.fixture
+def service(monkeypatch):
+    fake = FakeAlphaVantage()
+    monkeypatch.setattr("app.services.alpha_vantage._alpha_vantage_service", fake)
+    return fake
+
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        assert event.startswith("event: ") and data.startswith("data: ")
+        events.append((event[len("event: "):], orjson.loads(data[len("data: "):])))
+    return events
+
+
+def get(path: str):
+    app = FastAPI()
+    app.include_router(calls.router)
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get(path)
+    return asyncio.run(main())
+
+
+def test_parts_are_sent_as_they_complete(service):
+    service.delays = {"transcript": 0, "earnings": 0.01, "overview": 0.02}
+    response = get("/api/calls/acme/Q4/2024")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    # Financials waits for the overview and earnings it reuses
+    assert [name for name, _ in events] == ["transcript", "earnings", "overview", "financials", "complete"]
+    data = dict(events)
+    assert data["overview"]["symbol"] == "ACME"
+    assert data["earnings"][0]["id"] == "ACME-Q4-2024"
+    assert data["financials"]["eps"] == "1.5"
+    assert data["complete"] == {"parts": ["transcript", "earnings", "overview", "financials"], "failed": []}
+
+
+def test_parts_filter(service):
+    events = parse_events(get("/api/calls/ACME/Q4/2024?parts=transcript, earnings").text)
+    assert sorted(name for name, _ in events[:-1]) == ["earnings", "transcript"]
+    assert events[-1] == ("complete", {"parts": [name for name, _ in events[:-1]], "failed": []})
+    assert sorted(service.started) == ["earnings", "transcript"]
+
+
+def test_unknown_or_empty_parts(service):
+    response = get("/api/calls/ACME/Q4/2024?parts=transcript,dividends")
+    assert response.status_code == 400
+    assert "dividends" in response.json()["detail"]
+    assert get("/api/calls/ACME/Q4/2024?parts=,").status_code == 400
+    assert service.started == []
+
+
+def test_failed_parts_send_error_events(service):
+    service.failures = {"transcript": ValueError("No transcript found"), "earnings": RuntimeError("boom")}
+    events = parse_events(get("/api/calls/ACME/Q4/2024?parts=transcript,earnings,overview").text)
+    errors = [data for name, data in events if name == "error"]
+    by_part = {data["part"]: data for data in errors}
+    assert by_part["transcript"] == {"part": "transcript", "status": 404, "detail": "No transcript found"}
+    assert by_part["earnings"]["status"] == 500 and "boom" in by_part["earnings"]["detail"]
+    assert events[-1] == ("complete", {"parts": ["overview"], "failed": [data["part"] for data in errors]})
+
+
+def test_client_disconnect_cancels_pending_parts(service):
+    service.delays = {"transcript": 60}
+
+    async def main():
+        response = await calls.get_call("ACME", "Q4", 2024, parts=None)
+        # Nothing is fetched until the response is iterated
+        await asyncio.sleep(0)
+        assert service.started == []
+        stream = response.body_iterator
+        sent = [(await stream.__anext__()).split("\n")[0] for _ in range(3)]
+        assert sorted(sent) == ["event: earnings", "event: financials", "event: overview"]
+        # The client goes away: the server closes the body iterator
+        await stream.aclose()
+        await asyncio.sleep(0)
+        assert service.cancelled == ["transcript"]
+    asyncio.run(main())
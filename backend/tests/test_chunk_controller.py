@@ -0,0 +1,88 @@
+"""Adaptive chunk duration: inference fit, warm-up, step limits and bounds."""
+
+import pytest
+
+from app.services.chunk_controller import MAX_STEP, MIN_CHUNKS, ChunkDurationController
+
+
+def feed(controller: ChunkDurationController, chunks: int, overhead: float, rtf: float, queue_wait: float = 0.0):
+    """Observe `chunks` chunks of the current duration; returns the changes requested"""
+    changes = []
+    for _ in range(chunks):
+        seconds = controller.duration_ms / 1000
+        change = controller.observe(seconds, queue_wait, overhead + rtf * seconds)
+        if change is not None:
+            changes.append(change)
+    return changes
+
+
+def test_inference_fit():
+    controller = ChunkDurationController()
+    assert controller.inference_model() == (0.0, 0.0)
+    # One duration only: the overhead cannot be told apart from the real-time factor
+    for _ in range(5):
+        controller.observe(2.0, 0.0, 0.3 + 0.2 * 2.0)
+    assert controller.inference_model() == pytest.approx((0.0, 0.35))
+    # Varied durations recover overhead + rtf * duration
+    for seconds in [1.0, 4.0, 2.5, 6.0, 1.5, 3.0]:
+        controller.observe(seconds, 0.0, 0.3 + 0.2 * seconds)
+    assert controller.inference_model() == pytest.approx((0.3, 0.2))
+    assert controller.expected_latency(2.0) == pytest.approx(2.0 + 0.3 + 0.4)
+
+
+def test_recent_chunks_weigh_more():
+    controller = ChunkDurationController()
+    for seconds in [1.0, 3.0] * 10:
+        controller.observe(seconds, 0.0, 0.1 + 0.1 * seconds)
+    for seconds in [1.0, 3.0] * 20:
+        controller.observe(seconds, 0.0, 0.5 + 0.4 * seconds)
+    overhead, rtf = controller.inference_model()
+    assert overhead == pytest.approx(0.5, abs=0.01)
+    assert rtf == pytest.approx(0.4, abs=0.01)
+
+
+def test_no_change_before_min_chunks():
+    # An idle server with a generous target: longer chunks are wanted at once
+    controller = ChunkDurationController(initial_ms=3000, latency_target_ms=10000)
+    assert feed(controller, MIN_CHUNKS - 1, 0.05, 0.05) == []
+    assert feed(controller, 1, 0.05, 0.05) == [4500]
+    # Evidence is collected again before the next change
+    assert feed(controller, MIN_CHUNKS - 1, 0.05, 0.05) == []
+    assert feed(controller, 1, 0.05, 0.05) == [6750]
+
+
+def test_steps_are_limited():
+    # The target (1 s) is more than one step down
+    controller = ChunkDurationController(initial_ms=4500, latency_target_ms=1000)
+    assert feed(controller, MIN_CHUNKS, 0.0, 0.0) == [round(4500 / MAX_STEP)]
+    # An overloaded session lengthens its chunks even past the latency target
+    controller = ChunkDurationController(initial_ms=3000, latency_target_ms=2500)
+    assert feed(controller, MIN_CHUNKS, 1.0, 0.5, queue_wait=2.0) == [3000 * MAX_STEP]
+
+
+def test_duration_stays_within_bounds():
+    controller = ChunkDurationController(initial_ms=3000, min_ms=2500, latency_target_ms=500)
+    assert feed(controller, 3 * MIN_CHUNKS, 0.0, 0.0) == [2500]
+    controller = ChunkDurationController(initial_ms=3000, max_ms=4000, latency_target_ms=60000)
+    assert feed(controller, 3 * MIN_CHUNKS, 0.0, 0.0) == [4000]
+    assert ChunkDurationController(initial_ms=20000, max_ms=10000).duration_ms == 10000
+    assert ChunkDurationController(initial_ms=3100).duration_ms == 3000  # Rounded
+    assert ChunkDurationController(min_ms=2000, max_ms=1000).max_ms == 2000
+
+
+def test_chunks_of_unknown_length_are_not_observed():
+    controller = ChunkDurationController(latency_target_ms=10000)
+    for _ in range(2 * MIN_CHUNKS):
+        assert controller.observe(0, 0.5, 1.0) is None
+    assert controller.inference_model() == (0.0, 0.0)
+    assert controller.queue_wait == 0.0
+    # Warm-up starts with the first chunk of known length
+    assert feed(controller, MIN_CHUNKS - 1, 0.05, 0.05) == []
+
+
+def test_control_message():
+    controller = ChunkDurationController(initial_ms=2000)
+    controller.observe(2.0, 0.5, 1.0)
+    assert controller.control_message() == {
+        "type": "control", "chunk_duration_ms": 2000, "expected_latency_ms": 3500
+    }
@@ -0,0 +1,152 @@
+"""Financials for every quarter of the earnings history, against get_financials."""
+
+import asyncio
+
+import pytest
+
+from app.models.company import CompanyOverview
+from app.models.records import EarningsRecord, PriceSeriesRecord
+from app.services.alpha_vantage import AlphaVantageService
+
+
+def call(year: int, quarter: int, fiscal: str, reported: str, eps: str) -> EarningsRecord:
+    return EarningsRecord(f"ACME-Q{quarter}-{year}", "ACME", f"Q{quarter}", year, reported,
+                          fiscal_date_ending=fiscal, reported_eps=eps)
+
+
+class FakeAlphaVantage(AlphaVantageService):
+    """Serves fixed upstream data; income statement and prices can be made to fail"""
+
+    def __init__(self):
+        super().__init__(api_key="test")
+        self.income_fails = False
+        self.prices_fail = False
+        self.income_requests = 0
+
+    async def get_company_overview(self, ticker):
+        return CompanyOverview(Symbol=ticker, Name="Acme", MarketCapitalization="1000000",
+                               PERatio="30.5", RevenueTTM="4000", ProfitMargin="0.2", **{"52WeekHigh": "100"})
+
+    async def get_earnings(self, ticker):
+        # Newest first, with 2024 Q2 missing
+        return [
+            call(2024, 4, "2024-12-31", "2025-01-26", "2.0"),  # Sunday
+            call(2024, 3, "2024-09-30", "2024-10-24", "1.6"),
+            call(2024, 1, "2024-03-31", "2024-04-27", "1.0"),  # Saturday
+            call(2023, 4, "2023-12-31", "2024-01-25", "0.8"),
+            call(2023, 3, "2023-09-30", "2023-10-26", "0.5"),
+        ]
+
+    async def get_income_statement(self, ticker):
+        self.income_requests += 1
+        if self.income_fails:
+            raise ValueError("Alpha Vantage rate limit")
+        # No report for 2023-09-30
+        return {"quarterlyReports": [
+            {"fiscalDateEnding": "2024-12-31", "totalRevenue": "1200"},
+            {"fiscalDateEnding": "2024-09-30", "totalRevenue": "1000"},
+            {"fiscalDateEnding": "2024-03-31", "totalRevenue": "900"},
+            {"fiscalDateEnding": "2023-12-31", "totalRevenue": "800"},
+        ]}
+
+    async def get_price_series(self, ticker, since=None):
+        if self.prices_fail:
+            raise ValueError("Alpha Vantage rate limit")
+        # Nothing within a week of 2024-01-25 or 2023-10-26
+        return PriceSeriesRecord(ticker, "full",
+                                 ["2024-04-26", "2024-04-29", "2024-10-24", "2025-01-24", "2025-01-27"],
+                                 [50.0, 52.0, 40.0, 100.0, 110.0])
+
+
+def by_quarter(history):
+    return {(q.quarter, q.year): q for q in history}
+
+
+async def fetch_history():
+    service = FakeAlphaVantage()
+    try:
+        return by_quarter(await service.get_financials_history("ACME"))
+    finally:
+        await service.close()
+
+
+def test_changes_join_by_fiscal_period_across_gaps():
+    async def main():
+        history = await fetch_history()
+        assert history["Q4", 2024].eps_change == "+25.0%"
+        assert history["Q4", 2024].yoy_growth == "+150.0%"
+        # The previous quarter is missing: not bridged to 2024 Q1
+        assert history["Q3", 2024].eps_change is None
+        assert history["Q3", 2024].revenue_change is None
+        assert history["Q3", 2024].yoy_growth == "+220.0%"
+        # No year-ago quarter: the profit margin is shown, as in get_financials
+        assert history["Q1", 2024].eps_change == "+25.0%"
+        assert history["Q1", 2024].yoy_growth == "0.2"
+        assert history["Q3", 2023].eps_change is None
+    asyncio.run(main())
+
+
+def test_revenue_change_uses_quarterly_reports_only():
+    async def main():
+        history = await fetch_history()
+        assert history["Q4", 2024].revenue == "1200"
+        assert history["Q4", 2024].revenue_change == "+20.0%"
+        assert history["Q1", 2024].revenue_change == "+12.5%"
+        # 2023 Q3 has no quarterly report: TTM revenue is shown but never compared against
+        assert history["Q3", 2023].revenue == "4000"
+        assert history["Q4", 2023].revenue_change is None
+    asyncio.run(main())
+
+
+def test_price_on_report_date():
+    async def main():
+        history = await fetch_history()
+        # Sunday report: Monday is nearer than Friday
+        assert history["Q4", 2024].pe_ratio == pytest.approx(110.0 / 2.0)
+        assert history["Q4", 2024].market_cap == "1100000"
+        # Saturday report: Friday is nearer than Monday
+        assert history["Q1", 2024].pe_ratio == pytest.approx(50.0 / 1.0)
+        assert history["Q3", 2024].pe_ratio == pytest.approx(40.0 / 1.6)
+        # No trading day within a week: current P/E and market cap
+        assert history["Q4", 2023].pe_ratio == 30.5
+        assert history["Q4", 2023].market_cap == "1000000"
+    asyncio.run(main())
+
+
+def test_failed_fetches_are_not_cached():
+    async def main():
+        service = FakeAlphaVantage()
+        service.income_fails = True
+        history = by_quarter(await service.get_financials_history("ACME"))
+        assert history["Q4", 2024].revenue == "4000"
+        assert all(q.revenue_change is None for q in history.values())
+
+        service.income_fails = False
+        service.prices_fail = True
+        history = by_quarter(await service.get_financials_history("ACME"))
+        assert service.income_requests == 2
+        assert history["Q4", 2024].revenue_change == "+20.0%"
+        assert history["Q4", 2024].pe_ratio == 30.5
+
+        service.prices_fail = False
+        history = by_quarter(await service.get_financials_history("ACME"))
+        assert history["Q4", 2024].pe_ratio == pytest.approx(55.0)
+        # Both fetches succeeded: served from the cache from now on
+        await service.get_financials_history("ACME")
+        assert service.income_requests == 3
+        await service.close()
+    asyncio.run(main())
+
+
+def test_matches_get_financials():
+    async def main():
+        service = FakeAlphaVantage()
+        for quarter in await service.get_financials_history("ACME"):
+            single = await service.get_financials("ACME", quarter.quarter, quarter.year)
+            assert single.revenue == quarter.revenue
+            assert single.revenue_change == quarter.revenue_change
+            assert single.eps_change == quarter.eps_change
+            assert single.yoy_growth == quarter.yoy_growth
+            assert single.guidance_vs_actual == quarter.guidance_vs_actual
+        await service.close()
+    asyncio.run(main())
@@ -0,0 +1,27 @@
+"""Loading the Loughran-McDonald Master Dictionary format."""
+
+from app.services.lexicon_sentiment import Lexicon
+
+
+def test_from_csv_skips_removed_words(tmp_path):
+    path = tmp_path / "lm.csv"
+    path.write_text(
+        "Word,Positive,Negative,Uncertainty\n"
+        "GAIN,2009,0,0\n"
+        "LOSS,0,2009,0\n"
+        "MAYBE,0,0,2011\n"
+        # Removed in 2020: the year is negated
+        "SHORTFALL,0,-2020,0\n"
+        "UNDERPERFORM,,-2014,\n"
+    )
+    lexicon = Lexicon.from_csv(str(path))
+
+    def flags(word: str) -> tuple:
+        token = lexicon.vocab.get(word, 0)
+        return bool(lexicon.positive[token]), bool(lexicon.negative[token]), bool(lexicon.uncertainty[token])
+
+    assert flags("gain") == (True, False, False)
+    assert flags("loss") == (False, True, False)
+    assert flags("maybe") == (False, False, True)
+    assert flags("shortfall") == (False, False, False)
+    assert flags("underperform") == (False, False, False)
@@ -0,0 +1,100 @@
+"""LiveAnalysisEngine fed with KeywordAnalyzer, the deterministic stand-in backend."""
+
+import asyncio
+
+from app.models.analysis import AnalysisCategory
+from app.services.live_analysis import KeywordAnalyzer, LiveAnalysisEngine
+
+
+def segment(start: float, end: float, text: str) -> dict:
+    return {"start": start, "end": end, "text": text}
+
+
+def consume(engine: LiveAnalysisEngine, *segments: dict) -> list:
+    return asyncio.run(engine.consume(list(segments)))
+
+
+def by_type(messages: list, message_type: str) -> list:
+    return [message.payload for message in messages if message.type == message_type]
+
+
+def test_insight_updates_carry_relevant_segments_and_category_sentiment():
+    engine = LiveAnalysisEngine(KeywordAnalyzer())
+    messages = consume(engine, segment(0, 4, "Revenue grew 12 percent to a record 5 billion dollars."))
+
+    insights = {payload["category"]: payload for payload in by_type(messages, "insight_update")}
+    assert set(insights) == {"financial_performance", "key_statements"}
+    financial = insights["financial_performance"]
+    assert financial["insight"]["text"] == "Revenue grew 12 percent to a record 5 billion dollars."
+    assert financial["insight"]["timestamp"] == "00:00"
+    assert financial["insight"]["relevance"] == 1.0
+    # "grew" and "record" are positive
+    assert financial["sentiment"] == 0.667
+    assert insights["key_statements"]["insight"]["relevance"] == 0.5
+    # No sentiment point before the first interval has passed
+    assert by_type(messages, "sentiment_update") == []
+
+
+def test_low_relevance_signals_only_move_category_sentiment():
+    engine = LiveAnalysisEngine(KeywordAnalyzer(), min_relevance=0.75)
+    messages = consume(engine, segment(0, 3, "We saw strong demand."))
+
+    assert by_type(messages, "insight_update") == []
+    state = engine.categories[AnalysisCategory.MARKET_POSITION]
+    assert state.insights == []
+    assert round(state.sentiment, 3) == 0.333
+
+
+def test_category_sentiment_is_a_running_mean_over_the_call():
+    engine = LiveAnalysisEngine(KeywordAnalyzer())
+    consume(engine, segment(0, 4, "Revenue grew strongly, with record margins."))
+    messages = consume(engine, segment(4, 8, "Revenue declined on weak margins and lower sales."))
+
+    financial = [p for p in by_type(messages, "insight_update") if p["category"] == "financial_performance"]
+    # (+0.667 * 1.0 - 1.0 * 1.0) / 2
+    assert financial[-1]["sentiment"] == -0.167
+    assert len(engine.categories[AnalysisCategory.FINANCIAL_PERFORMANCE].insights) == 2
+
+
+def test_sentiment_updates_follow_call_time():
+    engine = LiveAnalysisEngine(KeywordAnalyzer(), window_seconds=20, sentiment_interval=10)
+    messages = consume(
+        engine,
+        segment(0, 6, "Growth was strong."),
+        segment(6, 12, "Margins declined."),
+        segment(12, 21, "Nothing to report."),
+    )
+
+    points = [payload["dataPoint"] for payload in by_type(messages, "sentiment_update")]
+    assert [point["timestamp"] for point in points] == [10, 20]
+    # At 10 s: +0.667 and -0.333 are in the window
+    assert points[0]["overallSentiment"] == 0.167
+    # At 20 s the window still covers all three segments
+    assert points[1]["overallSentiment"] == 0.111
+    assert set(points[0]["categorySentiments"]) == {c.value for c in AnalysisCategory}
+    assert engine.sentiment_series[0].overall_sentiment == 0.167
+
+
+def test_window_drops_old_segments():
+    engine = LiveAnalysisEngine(KeywordAnalyzer(), window_seconds=10, sentiment_interval=10)
+    consume(engine, segment(0, 9, "Growth was strong."))
+    messages = consume(engine, segment(25, 30, "Margins declined."))
+
+    points = [payload["dataPoint"] for payload in by_type(messages, "sentiment_update")]
+    # The earlier segment ended more than a window before 30 s
+    assert points[-1]["timestamp"] == 30
+    assert points[-1]["overallSentiment"] == -0.333
+
+
+def test_long_gap_does_not_emit_a_run_of_points():
+    engine = LiveAnalysisEngine(KeywordAnalyzer(), window_seconds=20, sentiment_interval=10)
+    consume(engine, segment(0, 5, "Hello."))
+    messages = consume(engine, segment(300, 305, "Welcome back."))
+
+    timestamps = [payload["dataPoint"]["timestamp"] for payload in by_type(messages, "sentiment_update")]
+    assert len(timestamps) <= 3
+    assert timestamps[-1] == 300
+
+
+def test_no_segments_no_messages():
+    assert consume(LiveAnalysisEngine(KeywordAnalyzer())) == []
@@ -0,0 +1,138 @@
+"""LLMAnalysisPipeline against the local mock LLM API (app.services.mock_llm)."""
+
+import asyncio
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.models.records import TranscriptEntryRecord, TranscriptRecord
+from app.services.llm_analysis import LLMAnalysisPipeline, chunk_transcript, estimate_tokens
+from app.services.mock_llm import create_mock_llm_app
+from app.services.result_cache import ResultCache
+
+PREPARED = [
+    ("CEO", "Revenue grew twelve percent to a record five billion dollars, driven by strong demand."),
+    ("CEO", "Gross margin expanded as pricing improved across our product lines."),
+    ("CFO", "Operating expenses were lower than expected and cash flow was robust."),
+    ("CFO", "For the full year we expect revenue growth in the high single digits."),
+    ("CFO", "We remain cautious about supply chain headwinds and foreign exchange pressure."),
+]
+QA = [
+    ("Operator", "We will now open the line for questions. The first question comes from Jane Doe."),
+    ("Jane Doe", "Can you talk about competition and market share in the cloud segment?"),
+    ("CEO", "We gained share again this quarter and customers continue to choose our platform."),
+]
+
+
+def make_transcript(extra: str = "") -> TranscriptRecord:
+    entries = [
+        TranscriptEntryRecord(id=str(i), timestamp=f"00:{i:02d}", text=text, speaker=speaker)
+        for i, (speaker, text) in enumerate(PREPARED + QA)
+    ]
+    if extra:
+        entries[0] = TranscriptEntryRecord(id="0", timestamp="00:00", text=entries[0].text + extra, speaker="CEO")
+    return TranscriptRecord("ACME", "Q4", 2024, "2024-12-31", "", entries)
+
+
+def make_pipeline(app, cache=None, chunk_tokens=40, max_concurrency=2) -> LLMAnalysisPipeline:
+    client = AsyncOpenAI(
+        api_key="test",
+        base_url="http://mock-llm/v1",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    )
+    return LLMAnalysisPipeline(
+        client,
+        model="mock",
+        chunk_tokens=chunk_tokens,
+        max_concurrency=max_concurrency,
+        cache=cache,
+        prompt="Analyze the earnings call and return JSON."
+    )
+
+
+def test_chunks_respect_budget_turns_and_qa_boundary():
+    transcript = make_transcript()
+    chunks = chunk_transcript(transcript.entries, max_tokens=40)
+
+    assert len(chunks) > 2
+    sections = [chunk.section for chunk in chunks]
+    # Prepared remarks first, then Q&A, never mixed in one chunk
+    assert sections == sorted(sections, key=lambda section: section == "Q&A")
+    assert chunks[-1].section == "Q&A" and chunks[0].section == "prepared remarks"
+    assert all(chunk.tokens <= 40 for chunk in chunks)
+    # Every entry ends up in exactly one chunk
+    text = "\n\n".join(chunk.text for chunk in chunks)
+    assert all(text.count(entry.text) == 1 for entry in transcript.entries)
+
+
+def test_oversized_entry_is_split_at_sentences():
+    long_text = " ".join(f"Sentence number {i} about revenue." for i in range(40))
+    entries = [TranscriptEntryRecord(id="0", timestamp="00:00", text=long_text, speaker="CEO")]
+    chunks = chunk_transcript(entries, max_tokens=50)
+
+    assert len(chunks) > 1
+    assert all(chunk.tokens <= 50 for chunk in chunks)
+    assert all(estimate_tokens(chunk.text) <= 50 for chunk in chunks)
+
+
+def test_analysis_maps_chunks_concurrently_and_reduces():
+    app = create_mock_llm_app(latency=0.05)
+    pipeline = make_pipeline(app, max_concurrency=2)
+    progress = []
+
+    analysis = asyncio.run(pipeline.analyze(make_transcript(), progress.append))
+
+    chunks = len(chunk_transcript(make_transcript().entries, 40))
+    assert analysis.chunks == chunks
+    assert analysis.ticker == "ACME" and not analysis.cached
+    assert analysis.category_insights
+    # Map requests overlap, but never beyond the concurrency limit
+    assert app.state.max_in_flight == 2
+    assert app.state.requests > chunks  # plus at least one reduce
+    assert progress[-1] == 1.0 and progress == sorted(progress)
+
+
+def test_repeated_analysis_is_served_from_cache():
+    app = create_mock_llm_app()
+    cache = ResultCache(max_entries=64)
+    pipeline = make_pipeline(app, cache=cache)
+
+    first = asyncio.run(pipeline.analyze(make_transcript()))
+    requests = app.state.requests
+    second = asyncio.run(pipeline.analyze(make_transcript()))
+
+    assert app.state.requests == requests
+    assert second.cached
+    assert second.overall_sentiment == first.overall_sentiment
+
+    # Only the changed chunk and the merges are requested again
+    asyncio.run(pipeline.analyze(make_transcript(extra=" Bookings were strong.")))
+    assert 0 < app.state.requests - requests < requests
+
+
+def test_concurrent_identical_analyses_share_requests():
+    single = create_mock_llm_app(latency=0.02)
+    asyncio.run(make_pipeline(single).analyze(make_transcript()))
+
+    app = create_mock_llm_app(latency=0.02)
+    pipeline = make_pipeline(app, cache=ResultCache(max_entries=64))
+
+    async def analyze_twice():
+        return await asyncio.gather(pipeline.analyze(make_transcript()), pipeline.analyze(make_transcript()))
+
+    first, second = asyncio.run(analyze_twice())
+    assert app.state.requests == single.state.requests
+    assert first.overall_sentiment == second.overall_sentiment
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    app = create_mock_llm_app()
+    first = asyncio.run(make_pipeline(app, cache=ResultCache(cache_dir=str(tmp_path))).analyze(make_transcript()))
+    requests = app.state.requests
+
+    # A new process: empty memory tier, same directory
+    restarted = make_pipeline(app, cache=ResultCache(cache_dir=str(tmp_path)))
+    second = asyncio.run(restarted.analyze(make_transcript()))
+    assert app.state.requests == requests
+    assert second.cached
+    assert second.overall_sentiment == first.overall_sentiment
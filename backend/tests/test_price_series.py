@@ -0,0 +1,75 @@
+"""Streaming TIME_SERIES_DAILY parsing and outputsize planning."""
+
+from datetime import date
+
+import pytest
+
+from app.models.records import PriceSeriesRecord
+from app.services.price_series import MAX_TAIL, DailyCloseParser, plan_outputsize
+
+BODY = b"""{
+    "Meta Data": {"1. Information": "Daily Prices", "2. Symbol": "ACME"},
+    "Time Series (Daily)": {
+        "2024-05-08": {"1. open": "120.0", "2. high": "122.0", "3. low": "98.0", "4. close": "99.0", "5. volume": "10"},
+        "2024-05-07": {"1. open": "110.0", "2. high": "121.5", "3. low": "109.0", "4. close": "121.0", "5. volume": "12"},
+        "2024-05-06": {"1. open": "100.0", "2. high": "111.0", "3. low": "99.5", "4. close": "110.0", "5. volume": "9"}
+    }
+}"""
+
+
+def parse(body: bytes, chunk_size: int):
+    parser = DailyCloseParser()
+    for i in range(0, len(body), chunk_size):
+        parser.feed(body[i:i + chunk_size])
+    return parser.finish()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, len(BODY)])
+def test_days_split_across_chunks(chunk_size):
+    dates, closes = parse(BODY, chunk_size)
+    assert dates == ["2024-05-06", "2024-05-07", "2024-05-08"]
+    assert closes == [110.0, 121.0, 99.0]
+
+
+@pytest.mark.parametrize("body, message", [
+    (b'{"Error Message": "Invalid API call."}', "Invalid API call"),
+    (b'{"Note": "Thank you for using Alpha Vantage!"}', "rate limit"),
+    (b'{"Information": "The **demo** API key is for demo purposes only."}', "demo"),
+])
+def test_error_bodies(body, message):
+    with pytest.raises(ValueError, match=message):
+        parse(body, 5)
+
+
+def test_empty_bodies():
+    assert parse(b"", 1) == ([], [])
+    assert parse(b"{}", 1) == ([], [])
+    assert parse(b'{"Meta Data": {}, "Time Series (Daily)": {}}', 3) == ([], [])
+    assert parse(b"<html>Service unavailable</html>", 8) == ([], [])
+
+
+def test_buffer_is_bounded():
+    parser = DailyCloseParser()
+    for _ in range(100):
+        parser.feed(b" " * 1000)
+        assert len(parser._buffer) <= MAX_TAIL
+    # A day arriving after a long run of unparsed bytes is still found
+    parser.feed(BODY)
+    assert parser.finish()[0] == ["2024-05-06", "2024-05-07", "2024-05-08"]
+
+
+def test_plan_outputsize():
+    today = date(2024, 6, 1)
+    assert plan_outputsize(None, today) == "compact"
+    assert plan_outputsize(date(2024, 5, 1), today) == "compact"
+    assert plan_outputsize(date(2024, 1, 18), today) == "compact"  # 135 days back
+    assert plan_outputsize(date(2024, 1, 17), today) == "full"
+    assert plan_outputsize(date(2010, 1, 1), today) == "full"
+
+
+def test_empty_series_covers_nothing():
+    assert not PriceSeriesRecord("ACME", "full", [], []).covers(None)
+    assert not PriceSeriesRecord("ACME", "compact", [], []).covers(date(2024, 5, 1))
+    series = PriceSeriesRecord("ACME", "compact", ["2024-05-06"], [110.0])
+    assert series.covers(None) and series.covers(date(2024, 5, 6))
+    assert not series.covers(date(2024, 5, 3))
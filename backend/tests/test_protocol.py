@@ -0,0 +1,80 @@
+"""Binary framing of the transcription WebSocket."""
+
+import pytest
+
+from app.websockets.protocol import (
+    FORMAT_PCM16,
+    FORMAT_WEBM,
+    HEADER,
+    MAGIC,
+    MSG_ERROR,
+    VERSION,
+    decode_audio_frame,
+    decode_segments_frame,
+    encode_audio_frame,
+    encode_error_frame,
+    encode_segments_frame,
+    is_binary_frame
+)
+
+
+@pytest.mark.parametrize("audio_format, name", [(FORMAT_WEBM, "webm"), (FORMAT_PCM16, "pcm16")])
+def test_audio_frame_round_trip(audio_format, name):
+    audio = bytes(range(256)) * 4
+    frame = decode_audio_frame(encode_audio_frame(7, 12.345, audio, audio_format))
+    assert frame.sequence == 7
+    assert frame.time_offset == 12.345
+    assert frame.audio_format == name
+    assert frame.audio == audio
+
+
+def test_segments_frame_round_trip():
+    segments = [
+        {"start": 5.0, "end": 7.25, "text": "Revenue grew twelve percent."},
+        {"start": 7.25, "end": 9.5, "text": "Marge brute: 45 % — en hausse"},
+        {"start": 9.5, "end": 9.5, "text": ""},
+    ]
+    data = encode_segments_frame(3, 5.0, segments)
+    assert HEADER.unpack_from(data)[3] == 3
+    assert decode_segments_frame(data) == segments
+    assert decode_segments_frame(encode_segments_frame(4, 0.0, [])) == []
+
+
+def test_long_text_is_cut_at_a_character_boundary():
+    # One ASCII byte then 3-byte characters: byte 0xFFFF falls inside a character
+    text = "a" + "€" * 30000
+    (segment,) = decode_segments_frame(encode_segments_frame(0, 0.0, [{"start": 0.0, "end": 1.0, "text": text}]))
+    encoded = segment["text"].encode("utf-8")
+    assert len(encoded) <= 0xFFFF
+    assert text.startswith(segment["text"])
+    assert "�" not in segment["text"]
+
+
+def test_too_many_segments_are_rejected():
+    segments = [{"start": 0.0, "end": 0.0, "text": ""}] * 0x10000
+    with pytest.raises(ValueError):
+        encode_segments_frame(0, 0.0, segments)
+
+
+def test_invalid_audio_frames_are_rejected():
+    frame = encode_audio_frame(1, 0.0, b"audio")
+    assert is_binary_frame(frame)
+    assert not is_binary_frame(b"XX" + frame[2:])
+    assert not is_binary_frame(frame[:HEADER.size - 1])
+    with pytest.raises(ValueError):
+        decode_audio_frame(b"XX" + frame[2:])
+    with pytest.raises(ValueError):
+        decode_audio_frame(frame[:HEADER.size - 1])
+    with pytest.raises(ValueError):
+        decode_audio_frame(HEADER.pack(MAGIC, VERSION + 1, FORMAT_WEBM, 1, 0) + b"audio")
+    with pytest.raises(ValueError):
+        decode_audio_frame(HEADER.pack(MAGIC, VERSION, 9, 1, 0) + b"audio")
+
+
+def test_error_frame():
+    data = encode_error_frame(None, "Transcription failed: ü")
+    _, version, kind, sequence, _ = HEADER.unpack_from(data)
+    assert (version, kind, sequence) == (VERSION, MSG_ERROR, 0)
+    assert data[HEADER.size:].decode("utf-8") == "Transcription failed: ü"
+    with pytest.raises(ValueError):
+        decode_segments_frame(data)
@@ -0,0 +1,111 @@
+"""Writing and memory-mapped reading of archived live sessions."""
+
+import asyncio
+
+import pytest
+
+from app.services.session_archive import (
+    INDEX_DTYPE,
+    KIND_AUDIO,
+    KIND_SEGMENTS,
+    SessionArchive,
+    SessionArchiveReader
+)
+
+
+def write_session(archive: SessionArchive, session_id: str, chunks: int = 3):
+    async def main():
+        writer = archive.open_writer(session_id)
+        for i in range(chunks):
+            writer.append_audio(i * 5.0, "pcm16" if i % 2 else "webm", bytes([i]) * (100 + i))
+            writer.append_segments(i * 5.0, [{"start": i * 5.0, "end": i * 5.0 + 2, "text": f"chunk {i}"}])
+            await writer.maybe_flush()
+        await writer.close()
+    asyncio.run(main())
+
+
+def test_write_and_read_back(tmp_path):
+    archive = SessionArchive(str(tmp_path), flush_bytes=150)
+    write_session(archive, "s1")
+
+    reader = archive.open_reader("s1")
+    try:
+        assert len(reader) == 6
+        assert reader.count(KIND_AUDIO) == 3
+        assert reader.duration_seconds == 10.0
+        audio = list(reader.records(KIND_AUDIO))
+        assert [r.audio_format for r in audio] == ["webm", "pcm16", "webm"]
+        assert [r.data for r in audio] == [bytes([i]) * (100 + i) for i in range(3)]
+        assert [s["text"] for s in reader.segments()] == ["chunk 0", "chunk 1", "chunk 2"]
+        assert [s["text"] for s in reader.segments(start=5.0, end=10.0)] == ["chunk 1"]
+    finally:
+        reader.close()
+
+    (session,) = archive.list_sessions()
+    assert session["session_id"] == "s1"
+    assert session["audio_chunks"] == 3
+    assert session["segment_batches"] == 3
+
+
+def test_reopened_writer_appends(tmp_path):
+    archive = SessionArchive(str(tmp_path))
+    write_session(archive, "s1", chunks=1)
+    write_session(archive, "s1", chunks=2)
+    reader = archive.open_reader("s1")
+    try:
+        assert reader.count(KIND_AUDIO) == 3
+        assert [r.data for r in reader.records(KIND_AUDIO)] == [bytes([0]) * 100, bytes([0]) * 100, bytes([1]) * 101]
+    finally:
+        reader.close()
+
+
+def test_unindexed_data_is_ignored(tmp_path):
+    # A flush between mapping the index and the data only adds bytes nothing points to
+    archive = SessionArchive(str(tmp_path))
+    write_session(archive, "s1", chunks=1)
+    with open(tmp_path / "s1" / "data.bin", "ab") as f:
+        f.write(b"unindexed")
+    reader = archive.open_reader("s1")
+    try:
+        assert len(reader) == 2
+        assert [s["text"] for s in reader.segments()] == ["chunk 0"]
+    finally:
+        reader.close()
+
+
+def test_truncated_files(tmp_path):
+    archive = SessionArchive(str(tmp_path))
+    write_session(archive, "s1")
+    path = tmp_path / "s1"
+
+    # Partial trailing index entry (crash mid-write)
+    index = (path / "index.bin").read_bytes()
+    (path / "index.bin").write_bytes(index[:-INDEX_DTYPE.itemsize // 2])
+    reader = SessionArchiveReader(path)
+    assert len(reader) == 5
+    reader.close()
+
+    # Data cut short: entries pointing past it are dropped
+    data = (path / "data.bin").read_bytes()
+    (path / "data.bin").write_bytes(data[:110])
+    reader = SessionArchiveReader(path)
+    try:
+        assert len(reader) == 1
+        assert reader.record(0).kind == KIND_AUDIO
+        assert reader.segments() == []
+    finally:
+        reader.close()
+
+    (path / "data.bin").write_bytes(b"")
+    reader = SessionArchiveReader(path)
+    assert len(reader) == 0
+    assert reader.duration_seconds == 0.0
+    reader.close()
+
+
+def test_invalid_and_missing_sessions(tmp_path):
+    archive = SessionArchive(str(tmp_path / "archive"))
+    with pytest.raises(ValueError):
+        archive.open_reader("missing")
+    with pytest.raises(ValueError):
+        archive.open_writer("../outside")
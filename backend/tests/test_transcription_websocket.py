@@ -0,0 +1,80 @@
+"""JSON protocol of /ws/transcribe: metadata, control_ack and audio ordering."""
+
+import pytest
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+from app.services.chunk_controller import ChunkDurationController
+from app.websockets import transcription
+
+
+class FakeRegistry:
+    """Transcribes any chunk into one segment naming its size"""
+
+    current_size = "fake"
+
+    async def transcribe(self, audio, language, time_offset, audio_format, timing):
+        timing.update(queue_seconds=0.0, inference_seconds=0.5)
+        return [{"start": time_offset, "end": time_offset + 1.0, "text": f"{len(audio)} bytes"}]
+
+
+class RecordingController(ChunkDurationController):
+    observed = []
+
+    def observe(self, audio_seconds, queue_wait, inference_seconds):
+        self.observed.append(audio_seconds)
+        return super().observe(audio_seconds, queue_wait, inference_seconds)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(transcription, "get_model_registry", FakeRegistry)
+    monkeypatch.setattr(transcription, "ChunkDurationController", RecordingController)
+    monkeypatch.setattr(transcription.settings, "whisper_adaptive_chunks", True)
+    monkeypatch.setattr(transcription.settings, "session_archive_dir", "")
+    RecordingController.observed = []
+
+    app = FastAPI()
+
+    @app.websocket("/ws/transcribe")
+    async def endpoint(websocket: WebSocket):
+        await transcription.handle_transcription_websocket(websocket)
+
+    with TestClient(app) as client:
+        yield client
+
+
+def test_control_ack_between_metadata_and_audio(client):
+    with client.websocket_connect("/ws/transcribe") as ws:
+        assert ws.receive_json()["type"] == "control"
+        # An ack sent while the previous chunk's audio was still being read
+        ws.send_json({"type": "metadata", "timeOffsetSeconds": 3.0})
+        ws.send_json({"type": "control_ack", "chunk_duration_ms": 4000})
+        ws.send_bytes(b"x" * 10)
+        assert ws.receive_json() == {"type": "segment", "start": 3.0, "end": 4.0, "text": "10 bytes"}
+
+        # Anything else in between is ignored; the audio still pairs with its metadata
+        ws.send_json({"type": "metadata", "timeOffsetSeconds": 7.0})
+        ws.send_text("not json")
+        ws.send_json({"type": "control_ack", "chunk_duration_ms": "soon"})
+        ws.send_bytes(b"x" * 20)
+        assert ws.receive_json() == {"type": "segment", "start": 7.0, "end": 8.0, "text": "20 bytes"}
+    assert RecordingController.observed == [4.0, 4.0]
+
+
+def test_control_ack_is_clamped(client):
+    settings = transcription.settings
+    with client.websocket_connect("/ws/transcribe") as ws:
+        ws.receive_json()
+        for duration_ms in [50, 10 ** 12, None, 2500]:
+            ws.send_json({"type": "control_ack", "chunk_duration_ms": duration_ms})
+            ws.send_json({"type": "metadata", "timeOffsetSeconds": 0.0})
+            ws.send_bytes(b"audio")
+            ws.receive_json()
+    # An invalid ack keeps the last valid one
+    assert RecordingController.observed == [
+        settings.whisper_chunk_min_ms / 1000,
+        settings.whisper_chunk_max_ms / 1000,
+        settings.whisper_chunk_max_ms / 1000,
+        2.5,
+    ]
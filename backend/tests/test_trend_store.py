@@ -0,0 +1,118 @@
+"""Trend table columns and incremental refresh."""
+
+import asyncio
+
+import numpy as np
+
+from app.models.records import EarningsRecord, PriceSeriesRecord
+from app.services.trend_store import TrendStore, compute_derived, empty_table, price_reactions
+
+
+def table_for(quarters, eps):
+    table = empty_table(len(quarters))
+    table["year"][:] = [year for year, _ in quarters]
+    table["quarter"][:] = [quarter for _, quarter in quarters]
+    table["reported_eps"][:] = eps
+    return table
+
+
+def test_changes_join_by_fiscal_period_across_gaps():
+    # 2023 Q2 is missing; rows are deliberately out of order
+    table = table_for(
+        [(2023, 1), (2023, 3), (2023, 4), (2024, 1), (2024, 3), (2022, 4)],
+        [1.0, 1.5, 2.0, 2.5, 3.0, 0.5]
+    )
+    compute_derived(table)
+    qoq, yoy = table["eps_qoq_pct"], table["eps_yoy_pct"]
+    np.testing.assert_allclose(qoq, [100.0, np.nan, (2.0 - 1.5) / 1.5 * 100, 25.0, np.nan, np.nan])
+    np.testing.assert_allclose(yoy, [np.nan, np.nan, 300.0, 150.0, 100.0, np.nan])
+
+
+def test_changes_against_zero_or_negative_eps():
+    table = table_for([(2024, 1), (2024, 2), (2024, 3)], [0.0, -1.0, 0.5])
+    compute_derived(table)
+    # Change from zero is undefined; from a negative base it is relative to its size
+    np.testing.assert_allclose(table["eps_qoq_pct"], [np.nan, np.nan, 150.0])
+
+
+def test_price_reactions_around_report_dates():
+    # Fri 2024-05-03, Mon 05-06, Tue 05-07, Wed 05-08
+    prices = PriceSeriesRecord("ACME", "compact", ["2024-05-03", "2024-05-06", "2024-05-07", "2024-05-08"],
+                               [100.0, 110.0, 121.0, 99.0])
+    report_dates = np.array(["2024-05-06", "2024-05-04", "2024-05-08", "2024-05-01", "NaT"], dtype="datetime64[D]")
+    before, after, reaction = price_reactions(report_dates, prices)
+    # A Monday report (pre-market or after the close): Friday's close to Tuesday's
+    assert (before[0], after[0]) == (100.0, 121.0)
+    # Reported on a Saturday: Friday to Monday
+    assert (before[1], after[1]) == (100.0, 110.0)
+    np.testing.assert_allclose(reaction[:2], [21.0, 10.0])
+    # No trading day after the last one, none before the first, nothing for NaT
+    assert np.isnan(after[2]) and before[2] == 121.0 and np.isnan(reaction[2])
+    assert np.isnan(before[3]) and after[3] == 100.0
+    assert np.isnan(before[4]) and np.isnan(after[4])
+
+    before, after, reaction = price_reactions(report_dates, None)
+    assert np.isnan(reaction).all()
+
+
+def call(year: int, quarter: int, fiscal: str, reported: str, eps: str) -> EarningsRecord:
+    return EarningsRecord(f"ACME-Q{quarter}-{year}", "ACME", f"Q{quarter}", year, reported,
+                          fiscal_date_ending=fiscal, reported_eps=eps)
+
+
+class FakeService:
+    def __init__(self, earnings):
+        self.earnings = earnings
+        self.prices_fail = False
+        self.transcripts = []
+        self.price_requests = 0
+
+    async def get_earnings(self, ticker):
+        return self.earnings
+
+    async def get_price_series(self, ticker, since=None):
+        self.price_requests += 1
+        if self.prices_fail:
+            raise ValueError("rate limited")
+        return PriceSeriesRecord(ticker, "full",
+                                 ["2024-04-19", "2024-04-22", "2024-07-19", "2024-07-22", "2024-10-18", "2024-10-21"],
+                                 [10.0, 11.0, 20.0, 22.0, 30.0, 27.0])
+
+    async def get_earnings_call_transcript(self, ticker, quarter, year):
+        self.transcripts.append((quarter, year))
+        raise ValueError("No transcript")
+
+
+def test_refresh_is_incremental_and_retries_missing_prices(tmp_path):
+    async def main():
+        service = FakeService([
+            call(2024, 2, "2024-06-30", "2024-07-20", "2.0"),
+            call(2024, 1, "2024-03-31", "2024-04-20", "1.0"),
+        ])
+        store = TrendStore(str(tmp_path))
+        service.prices_fail = True
+        table = await store.refresh("ACME", service)
+        assert table["quarter"].tolist() == [1, 2]
+        np.testing.assert_allclose(table["eps_qoq_pct"], [np.nan, 100.0])
+        assert np.isnan(table["price_reaction_pct"]).all()
+
+        # A new quarter: the price fetch is retried for the rows it missed last time
+        service.earnings = [call(2024, 3, "2024-09-30", "2024-10-19", "1.5")] + service.earnings
+        service.prices_fail = False
+        table = await store.refresh("ACME", service)
+        assert table["quarter"].tolist() == [1, 2, 3]
+        np.testing.assert_allclose(table["price_reaction_pct"], [10.0, 10.0, -10.0])
+        np.testing.assert_allclose(table["eps_qoq_pct"], [np.nan, 100.0, -25.0])
+
+        # Nothing new or missing: no price request, and the table reloads from disk
+        requests = service.price_requests
+        await store.refresh("ACME", service)
+        assert service.price_requests == requests
+        # Transcripts were fetched once per quarter (these are too old to re-check)
+        assert sorted(service.transcripts) == [("Q1", 2024), ("Q2", 2024), ("Q3", 2024)]
+        reloaded = await TrendStore(str(tmp_path)).load("ACME")
+        np.testing.assert_allclose(reloaded["price_reaction_pct"], [10.0, 10.0, -10.0])
+
+        trends = await TrendStore(str(tmp_path)).get_trends("ACME", service)
+        assert [q.price_reaction for q in trends.quarters] == [10.0, 10.0, -10.0]
+    asyncio.run(main())
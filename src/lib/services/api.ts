@@ -97,6 +97,33 @@ interface TranscriptData {
     entries: TranscriptEntry[];
 }
 
+// Convert to frontend EarningsCall type
+function toEarningsCall(e: BackendEarningsCall): EarningsCall {
+    return {
+        id: e.id,
+        companyTicker: e.ticker,
+        date: e.date,
+        quarter: e.quarter,
+        year: e.year,
+        duration: 'N/A', // Not provided by backend yet
+        status: e.status as 'upcoming' | 'live' | 'recorded'
+    };
+}
+
+// Convert to frontend FinancialData type
+function toFinancialData(data: BackendFinancialData): FinancialData {
+    return {
+        revenue: data.revenue || 'N/A',
+        revenueChange: data.revenue_change,
+        eps: data.eps || 'N/A',
+        epsChange: data.eps_change,
+        pe: data.pe_ratio || null,
+        marketCap: data.market_cap || 'N/A',
+        yoyGrowth: data.yoy_growth || 'N/A',
+        guidanceVsActual: data.guidance_vs_actual || 'N/A'
+    };
+}
+
 /**
  * Search for companies by name or ticker
  */
@@ -129,16 +156,7 @@ export async function getEarningsHistory(ticker: string): Promise<EarningsCall[]
         `/api/companies/${ticker}/earnings`
     );
     
-    // Convert to frontend EarningsCall type
-    return earnings.map(e => ({
-        id: e.id,
-        companyTicker: e.ticker,
-        date: e.date,
-        quarter: e.quarter,
-        year: e.year,
-        duration: 'N/A', // Not provided by backend yet
-        status: e.status as 'upcoming' | 'live' | 'recorded'
-    }));
+    return earnings.map(toEarningsCall);
 }
 
 /**
@@ -159,19 +177,7 @@ export async function getFinancials(
         url += `?${params.toString()}`;
     }
     
-    const data = await fetchAPI<BackendFinancialData>(url);
-    
-    // Convert to frontend FinancialData type
-    return {
-        revenue: data.revenue || 'N/A',
-        revenueChange: data.revenue_change,
-        eps: data.eps || 'N/A',
-        epsChange: data.eps_change,
-        pe: data.pe_ratio || null,
-        marketCap: data.market_cap || 'N/A',
-        yoyGrowth: data.yoy_growth || 'N/A',
-        guidanceVsActual: data.guidance_vs_actual || 'N/A'
-    };
+    return toFinancialData(await fetchAPI<BackendFinancialData>(url));
 }
 
 /**
@@ -187,6 +193,69 @@ export async function getTranscript(
     );
 }
 
+/**
+ * Parts of an earnings call streamed by /api/calls, in the order they become ready
+ */
+export interface CallPartHandlers {
+    overview?: (overview: CompanyOverview) => void;
+    earnings?: (earnings: EarningsCall[]) => void;
+    financials?: (financials: FinancialData) => void;
+    transcript?: (transcript: TranscriptData) => void;
+    error?: (part: string, error: APIError) => void;
+}
+
+/**
+ * Load what is needed to open an earnings call in one request.
+ * Only the parts with a handler are fetched; each handler runs as soon as its
+ * part arrives. Resolves once all requested parts are in.
+ */
+export async function streamCall(
+    ticker: string,
+    quarter: string,
+    year: number,
+    handlers: CallPartHandlers
+): Promise<void> {
+    const parts = Object.keys(handlers).filter((part) => part !== 'error');
+    const response = await fetch(
+        `${API_BASE}/api/calls/${ticker}/${quarter}/${year}?parts=${parts.join(',')}`
+    );
+    if (!response.ok || !response.body) {
+        throw new APIError(`API request failed: ${response.status}`, response.status, response.statusText);
+    }
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += value;
+        // Server-Sent Events are separated by a blank line
+        let end: number;
+        while ((end = buffer.indexOf('\n\n')) >= 0) {
+            const block = buffer.slice(0, end);
+            buffer = buffer.slice(end + 2);
+            let event = 'message';
+            let data = '';
+            for (const line of block.split('\n')) {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            }
+            if (!data) continue;
+            const payload = JSON.parse(data);
+            if (event === 'overview') handlers.overview?.(payload);
+            else if (event === 'earnings') handlers.earnings?.(payload.map(toEarningsCall));
+            else if (event === 'financials') handlers.financials?.(toFinancialData(payload));
+            else if (event === 'transcript') handlers.transcript?.(payload);
+            else if (event === 'error') {
+                handlers.error?.(
+                    payload.part,
+                    new APIError(`API request failed: ${payload.status}`, payload.status, payload.detail)
+                );
+            }
+        }
+    }
+}
+
 /**
  * Get upcoming earnings calendar
  */
@@ -4,24 +4,86 @@
  */
 
 export interface TranscriptionSegment {
-  type: 'segment' | 'error';
+  type: 'segment' | 'error' | 'session' | 'room' | 'snapshot' | 'room_closed' | 'control';
   start?: number;
   end?: number;
   text?: string;
   message?: string;
+  session_id?: string; // 'session' messages: id of the archived session
+  room_id?: string; // 'room', 'snapshot' and 'room_closed' messages
+  segments?: TranscriptionSegment[]; // 'snapshot': everything transcribed before joining
+  reason?: string; // 'room_closed'
+  chunk_duration_ms?: number; // 'control': record chunks of this length from now on
+  expected_latency_ms?: number; // 'control': server's estimate of end-to-end latency
 }
 
 export type TranscriptionState = 'disconnected' | 'connecting' | 'connected' | 'error';
 
+/**
+ * 'binary': one frame per chunk with a 12-byte header, compact binary results.
+ * 'json': JSON metadata frame + audio frame, one JSON message per segment.
+ */
+export type TranscriptionProtocol = 'binary' | 'json';
+
+// Binary framing (see backend/app/websockets/protocol.py)
+const FRAME_HEADER_SIZE = 12;
+const FRAME_VERSION = 1;
+const FORMAT_WEBM = 0;
+const FORMAT_PCM16 = 1;
+const MSG_SEGMENTS = 1;
+const MSG_ERROR = 2;
+
+function encodeAudioFrame(sequence: number, timeOffsetSeconds: number, format: number, audio: ArrayBuffer): ArrayBuffer {
+  const frame = new Uint8Array(FRAME_HEADER_SIZE + audio.byteLength);
+  const view = new DataView(frame.buffer);
+  frame[0] = 0x45; // 'E'
+  frame[1] = 0x54; // 'T'
+  view.setUint8(2, FRAME_VERSION);
+  view.setUint8(3, format);
+  view.setUint32(4, sequence, true);
+  view.setUint32(8, Math.round(timeOffsetSeconds * 1000), true);
+  frame.set(new Uint8Array(audio), FRAME_HEADER_SIZE);
+  return frame.buffer;
+}
+
+const textDecoder = new TextDecoder();
+
+function decodeResultFrame(buffer: ArrayBuffer): TranscriptionSegment[] {
+  const view = new DataView(buffer);
+  const type = view.getUint8(3);
+  if (type === MSG_ERROR) {
+    return [{ type: 'error', message: textDecoder.decode(new Uint8Array(buffer, FRAME_HEADER_SIZE)) }];
+  }
+  if (type !== MSG_SEGMENTS) {
+    return [];
+  }
+  const segments: TranscriptionSegment[] = [];
+  const count = view.getUint16(FRAME_HEADER_SIZE, true);
+  let position = FRAME_HEADER_SIZE + 2;
+  for (let i = 0; i < count; i++) {
+    const start = view.getUint32(position, true) / 1000;
+    const end = view.getUint32(position + 4, true) / 1000;
+    const length = view.getUint16(position + 8, true);
+    position += 10;
+    const text = textDecoder.decode(new Uint8Array(buffer, position, length));
+    position += length;
+    segments.push({ type: 'segment', start, end, text });
+  }
+  return segments;
+}
+
 export class TranscriptionWebSocketService {
   private ws: WebSocket | null = null;
   private url: string;
   private onSegmentCallback?: (segment: TranscriptionSegment) => void;
   private onStateChangeCallback?: (state: TranscriptionState) => void;
   private state: TranscriptionState = 'disconnected';
+  private protocol: TranscriptionProtocol;
+  private sequence = 0;
 
-  constructor(url: string) {
+  constructor(url: string, protocol: TranscriptionProtocol = 'binary') {
     this.url = url;
+    this.protocol = protocol;
   }
 
   /**
@@ -32,6 +94,7 @@ export class TranscriptionWebSocketService {
       try {
         this.setState('connecting');
         this.ws = new WebSocket(this.url);
+        this.ws.binaryType = 'arraybuffer';
 
         this.ws.onopen = () => {
           console.log('[TranscriptionWS] Connected');
@@ -52,6 +115,12 @@ export class TranscriptionWebSocketService {
 
         this.ws.onmessage = (event) => {
           try {
+            if (event.data instanceof ArrayBuffer) {
+              for (const segment of decodeResultFrame(event.data)) {
+                this.onSegmentCallback?.(segment);
+              }
+              return;
+            }
             const segment: TranscriptionSegment = JSON.parse(event.data);
             console.log('[TranscriptionWS] Received segment:', segment);
             this.onSegmentCallback?.(segment);
@@ -80,6 +149,12 @@ export class TranscriptionWebSocketService {
     const size = audioData instanceof Blob ? audioData.size : audioData.byteLength;
     console.log(`[TranscriptionWS] Sending audio: ${(size / 1024).toFixed(2)} KB with offset ${timeOffsetSeconds}s`);
 
+    if (this.protocol === 'binary') {
+      const buffer = audioData instanceof Blob ? await audioData.arrayBuffer() : audioData;
+      this.ws.send(encodeAudioFrame(this.sequence++, timeOffsetSeconds, FORMAT_WEBM, buffer));
+      return;
+    }
+
     // Send metadata first
     const metadata = {
       type: 'metadata',
@@ -97,6 +172,32 @@ export class TranscriptionWebSocketService {
     }
   }
 
+  /**
+   * Send raw PCM16 audio (16 kHz mono) so the server can skip container decoding.
+   * Always uses the binary protocol.
+   * @param samples 16-bit signed PCM samples
+   * @param timeOffsetSeconds Cumulative time offset in seconds for timestamp adjustment
+   */
+  sendPcm(samples: Int16Array, timeOffsetSeconds: number = 0): void {
+    if (!this.ws || this.ws.readyState !== WebSocket.OPEN) {
+      console.error('[TranscriptionWS] Cannot send audio - not connected. State:', this.ws?.readyState);
+      return;
+    }
+    const audio = samples.buffer.slice(samples.byteOffset, samples.byteOffset + samples.byteLength) as ArrayBuffer;
+    this.ws.send(encodeAudioFrame(this.sequence++, timeOffsetSeconds, FORMAT_PCM16, audio));
+  }
+
+  /**
+   * Tell the server the chunk duration recording continues with, after a
+   * 'control' message. Audio sent after this is assumed to be chunks of this length.
+   */
+  acknowledgeChunkDuration(chunkDurationMs: number): void {
+    if (!this.ws || this.ws.readyState !== WebSocket.OPEN) {
+      return;
+    }
+    this.ws.send(JSON.stringify({ type: 'control_ack', chunk_duration_ms: chunkDurationMs }));
+  }
+
   /**
    * Disconnect from the WebSocket server.
    */
@@ -145,9 +246,29 @@ export class TranscriptionWebSocketService {
 /**
  * Create a transcription WebSocket instance.
  * @param backendUrl Base URL of the backend (e.g., 'http://localhost:8000')
+ * @param protocol Wire protocol, binary framing by default
+ * @param roomId Also broadcast this session's segments to listeners of this room
  */
-export function createTranscriptionWebSocket(backendUrl: string): TranscriptionWebSocketService {
+export function createTranscriptionWebSocket(
+  backendUrl: string,
+  protocol: TranscriptionProtocol = 'binary',
+  roomId?: string
+): TranscriptionWebSocketService {
   // Convert http(s) to ws(s)
-  const wsUrl = backendUrl.replace(/^http/, 'ws') + '/ws/transcribe';
-  return new TranscriptionWebSocketService(wsUrl);
+  let wsUrl = backendUrl.replace(/^http/, 'ws') + '/ws/transcribe';
+  if (roomId) {
+    wsUrl += `?room=${encodeURIComponent(roomId)}`;
+  }
+  return new TranscriptionWebSocketService(wsUrl, protocol);
+}
+
+/**
+ * Listen to a live call another session is transcribing. Receives a 'snapshot'
+ * first, then 'segment' messages, and 'room_closed' when the call ends.
+ * @param backendUrl Base URL of the backend (e.g., 'http://localhost:8000')
+ * @param roomId Room the producing session joined with
+ */
+export function createRoomListenerWebSocket(backendUrl: string, roomId: string): TranscriptionWebSocketService {
+  const wsUrl = backendUrl.replace(/^http/, 'ws') + `/ws/rooms/${encodeURIComponent(roomId)}`;
+  return new TranscriptionWebSocketService(wsUrl, 'json');
 }
@@ -1,5 +1,5 @@
 // WebSocket Service Stub for Python Backend Connection
-import type { WSMessage, WSMessageType } from '$lib/types';
+import type { AnalysisStatusPayload, WSMessage, WSMessageType } from '$lib/types';
 import { analysisStore } from '$lib/stores/analysis.svelte';
 
 export interface WebSocketConfig {
@@ -113,6 +113,9 @@ class WebSocketService {
                 case 'sentiment_update':
                     // Handle sentiment updates
                     break;
+                case 'analysis_status':
+                    analysisStore.setAnalysisProgress((message.payload as AnalysisStatusPayload).progress * 100);
+                    break;
                 case 'analysis_complete':
                     analysisStore.stopAnalysis();
                     break;
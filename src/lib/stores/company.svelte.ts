@@ -186,44 +186,40 @@ export async function selectEarningsCall(callId: string | null) {
         return;
     }
     
-    // Fetch quarter-specific financial data and transcript from API
+    // Fetch quarter-specific financial data and transcript in one streamed request
+    // (overview and earnings are already loaded with the company); each part is
+    // shown as soon as it arrives
+    const ticker = selectedCompany.ticker;
+    let financials: FinancialData | null = null;
+    let hasTranscript = false;
     try {
         isLoadingFinancials = true;
         loadingError = null;
         
-        // Load financials and transcript in parallel
-        const [financials, transcript] = await Promise.all([
-            api.getFinancials(
-                selectedCompany.ticker,
-                call.quarter,
-                call.year
-            ).catch((err) => {
-                console.warn(`No financial data for ${selectedCompany.ticker} ${call.quarter} ${call.year}:`, err);
-                return null;
-            }),
-            api.getTranscript(
-                selectedCompany.ticker,
-                call.quarter,
-                call.year
-            ).catch((err) => {
-                console.warn(`No transcript for ${selectedCompany.ticker} ${call.quarter} ${call.year}:`, err);
-                return null;
-            })
-        ]);
-        
-        financialsData = financials;
-        
-        // Update analysis store with transcript if available
-        if (transcript && transcript.entries) {
-            const { analysisStore } = await import('./analysis.svelte');
-            analysisStore.setTranscript(transcript.entries);
-            console.log(`Loaded ${transcript.entries.length} transcript entries`);
-        }
+        await api.streamCall(ticker, call.quarter, call.year, {
+            financials: (data) => {
+                financials = data;
+                financialsData = data;
+                isLoadingFinancials = false;
+            },
+            transcript: async (transcript) => {
+                if (transcript.entries) {
+                    hasTranscript = true;
+                    const { analysisStore } = await import('./analysis.svelte');
+                    analysisStore.setTranscript(transcript.entries);
+                    console.log(`Loaded ${transcript.entries.length} transcript entries`);
+                }
+            },
+            error: (part, err) => {
+                console.warn(`No ${part} for ${ticker} ${call.quarter} ${call.year}:`, err);
+            }
+        });
         
         if (!financials) {
+            financialsData = null;
             loadingError = `Financial data not available for ${call.quarter} ${call.year}`;
         }
-        if (!transcript) {
+        if (!hasTranscript) {
             if (loadingError) {
                 loadingError += ` and transcript not available`;
             } else {
@@ -6,6 +6,7 @@ export interface TranscriptEntry {
     text: string;
     speaker?: string;
     confidence?: number;
+    boilerplate?: boolean;
 }
 
 export interface Insight {
@@ -109,6 +110,7 @@ export type WSMessageType =
     | 'transcript_update'
     | 'insight_update'
     | 'sentiment_update'
+    | 'analysis_status'
     | 'analysis_complete'
     | 'error'
     | 'connection_status';
@@ -127,6 +129,13 @@ export interface SentimentUpdatePayload {
     dataPoint: SentimentDataPoint;
 }
 
+export interface AnalysisStatusPayload {
+    session_id: string;
+    status: 'pending' | 'processing' | 'completed' | 'error';
+    progress: number; // 0.0 to 1.0
+    message: string | null;
+}
+
 // Mock data helper types
 export interface MockDataConfig {
     companies: Company[];